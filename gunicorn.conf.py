@@ -0,0 +1,32 @@
+"""
+Gunicorn settings picked up automatically from the working directory.
+
+Set WARM_CACHE_ON_START=True to run ``manage.py warm_cache`` before the
+master starts listening, so the first requests after a deploy hit a warm
+cache. It runs in a subprocess: the master then forks workers without
+inheriting open Redis or HTTP connections. A failed or slow warm-up is
+logged and never blocks the start.
+"""
+import os
+import subprocess
+import sys
+
+from travel_recommender.utils import str_to_bool
+
+WARM_CACHE_ON_START = str_to_bool(os.getenv("WARM_CACHE_ON_START", "False"))
+WARM_CACHE_TIMEOUT = float(os.getenv("WARM_CACHE_TIMEOUT_IN_SECONDS", "120"))
+
+
+def on_starting(server):
+    if not WARM_CACHE_ON_START:
+        return
+
+    manage_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "manage.py")
+    try:
+        result = subprocess.run([sys.executable, manage_py, "warm_cache"], timeout=WARM_CACHE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        server.log.warning("Cache warm-up timed out after %.0fs; starting cold", WARM_CACHE_TIMEOUT)
+        return
+
+    if result.returncode != 0:
+        server.log.warning("Cache warm-up exited with status %s; starting cold", result.returncode)
@@ -0,0 +1,105 @@
+import pickle
+import random
+import time
+from datetime import date, timedelta
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from travel_recommender.services.cache_serializer import PayloadCodec, lz4_frame
+
+
+def _hourly_payload(variables, days: int = 7, seed: int = 0):
+    """An Open-Meteo-shaped hourly response (metadata, units, 24 samples per day)."""
+    rng = random.Random(seed)
+    start = date.today()
+    times = [
+        f"{(start + timedelta(days=day)).isoformat()}T{hour:02d}:00"
+        for day in range(days)
+        for hour in range(24)
+    ]
+
+    return {
+        "latitude": 23.75,
+        "longitude": 90.375,
+        "generationtime_ms": 0.0457763671875,
+        "utc_offset_seconds": 21600,
+        "timezone": "Asia/Dhaka",
+        "timezone_abbreviation": "GMT+6",
+        "elevation": 9.0,
+        "hourly_units": {"time": "iso8601", **{name: unit for name, unit in variables}},
+        "hourly": {
+            "time": times,
+            **{name: [round(rng.uniform(10, 150), 1) for _ in times] for name, _ in variables},
+        },
+    }
+
+
+def sample_payloads():
+    weather_entry = {
+        "district_name": "Dhaka",
+        "forecast": _hourly_payload([("temperature_2m", "°C")], seed=1),
+        "air_quality": _hourly_payload([("pm2_5", "μg/m³"), ("pm10", "μg/m³")], seed=2),
+        "fetched_at": time.time(),
+    }
+    districts = {
+        "districts": {
+            f"district{i}": {
+                "id": str(i),
+                "division_id": str(i % 8),
+                "name": f"District{i}",
+                "bn_name": f"জেলা{i}",
+                "lat": str(22 + i / 20),
+                "long": str(89 + i / 30),
+            }
+            for i in range(64)
+        },
+        "fetched_at": time.time(),
+        "etag": '"5f2b-1a2b3c"',
+        "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    return {"weather:<district>": weather_entry, "districts": districts}
+
+
+class Command(BaseCommand):
+    help = "Compare encode/decode time and stored size of the cache payload codecs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+
+    @staticmethod
+    def _time_per_call(func, iterations: int) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) / iterations * 1_000_000
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+
+        compressions = ["none", "zlib"] + (["lz4"] if lz4_frame is not None else [])
+        candidates = [("pickle (django-redis default)", None)] + [
+            (f"{serializer}+{compression}", PayloadCodec(serializer=serializer, compression=compression))
+            for serializer in ("json", "msgpack")
+            for compression in compressions
+        ]
+
+        for name, payload in sample_payloads().items():
+            self.stdout.write(f"\n{name}")
+            self.stdout.write(f"{'codec':<32}{'bytes':>10}{'encode µs':>12}{'decode µs':>12}")
+
+            for label, codec in candidates:
+                if codec is None:
+                    encode = partial(pickle.dumps, payload, protocol=pickle.DEFAULT_PROTOCOL)
+                    decode = pickle.loads
+                else:
+                    encode = partial(codec.encode, payload)
+                    decode = codec.decode
+
+                encoded = encode()
+                assert decode(encoded) == payload, label
+
+                encode_us = self._time_per_call(encode, iterations)
+                decode_us = self._time_per_call(partial(decode, encoded), iterations)
+
+                self.stdout.write(f"{label:<32}{len(encoded):>10}{encode_us:>12.1f}{decode_us:>12.1f}")
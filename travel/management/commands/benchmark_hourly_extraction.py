@@ -0,0 +1,72 @@
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from travel.services.hourly_samples import daily_means
+
+
+def _loop_daily_averages(series):
+    """The per-timestamp string scan the services used before the vectorized engine."""
+    averages = []
+    for times, values in series:
+        collected = []
+        for i, t in enumerate(times):
+            if t.endswith("T14:00") and i < len(values):
+                value = values[i]
+                if value is not None:
+                    collected.append(value)
+        averages.append(sum(collected) / len(collected) if collected else None)
+    return averages
+
+
+def sample_series(locations: int, days: int = 7, seed: int = 0):
+    """Open-Meteo-shaped hourly series; every location shares the time axis like one refresh does."""
+    rng = random.Random(seed)
+    start = date.today()
+    times = [f"{(start + timedelta(days=day)).isoformat()}T{hour:02d}:00" for day in range(days) for hour in range(24)]
+
+    encoded_times = json.dumps(times)
+
+    series = []
+    for _ in range(locations):
+        # Each location decodes its own copy of the time strings, as parsing every response does
+        values = [None if rng.random() < 0.02 else round(rng.uniform(10, 40), 1) for _ in times]
+        series.append((json.loads(encoded_times), values))
+    return series
+
+
+class Command(BaseCommand):
+    help = "Compare the 14:00-sample loop with the vectorized extraction engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--locations", default="64,500,5000", help="Comma-separated location counts")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    @staticmethod
+    def _best_of(func, series, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func(series)
+            timings.append(time.perf_counter() - started)
+        return min(timings) * 1000
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'locations':>10}{'loop ms':>12}{'vectorized ms':>16}{'speedup':>10}")
+
+        for locations in (int(n) for n in options["locations"].split(",")):
+            series = sample_series(locations)
+
+            expected = _loop_daily_averages(series)
+            actual = daily_means(series)
+            assert all(
+                (e is None and a is None) or abs(e - a) < 1e-9 for e, a in zip(expected, actual)
+            ), "engines disagree"
+
+            loop_ms = self._best_of(_loop_daily_averages, series, options["repeat"])
+            vectorized_ms = self._best_of(daily_means, series, options["repeat"])
+
+            self.stdout.write(f"{locations:>10}{loop_ms:>12.2f}{vectorized_ms:>16.2f}{loop_ms / vectorized_ms:>9.1f}x")
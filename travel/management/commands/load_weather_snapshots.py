@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from travel.services.weather_service import WeatherService
+from travel.services.weather_snapshots import weather_snapshots
+
+
+class Command(BaseCommand):
+    help = "Load fresh weather snapshots from the database into the cache (run at deploy time)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--overwrite", action="store_true", help="Replace keys that are already cached")
+        parser.add_argument("--prune", action="store_true", help="Delete snapshots older than WEATHER_SNAPSHOT_MAX_AGE")
+
+    def handle(self, *args, **options):
+        service = WeatherService()
+        started = time.perf_counter()
+
+        counts = service.restore_snapshots(overwrite=options["overwrite"])
+
+        if options["prune"]:
+            counts["pruned"] = weather_snapshots.prune(service.snapshot_max_age)
+
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{name}={count}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Weather snapshots loaded in {elapsed:.2f}s: {summary}"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from travel.services.cache_warmer import CacheWarmer
+
+
+class Command(BaseCommand):
+    help = "Fill the district index, weather and best-districts ranking; skips whatever is already fresh"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-workers", type=int, default=8, help="Concurrent district weather fetches")
+
+    @staticmethod
+    def _status(stage):
+        return "fresh" if stage["hit"] else "rebuilt"
+
+    def handle(self, *args, **options):
+        report = CacheWarmer(max_workers=options["max_workers"]).warm()
+
+        districts, weather, ranking = report["districts"], report["weather"], report["ranking"]
+        self.stdout.write(f"districts: {self._status(districts)}, {districts['count']} indexed ({districts['seconds']:.2f}s)")
+        self.stdout.write(
+            f"weather:   {weather['hits']} hits, {weather['restored']} restored, "
+            f"{weather['fetched']} fetched, {weather['failed']} failed, "
+            f"generation {weather['generation']} ({weather['seconds']:.2f}s)"
+        )
+        self.stdout.write(f"ranking:   {self._status(ranking)}, {ranking['count']} ranked ({ranking['seconds']:.2f}s)")
+
+        if not districts["count"]:
+            raise CommandError("District index unavailable; nothing was warmed")
+
+        self.stdout.write(self.style.SUCCESS(f"Cache warmed in {report['seconds']:.2f}s"))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=255, unique=True)),
+                ('district_name', models.CharField(max_length=255)),
+                ('payload', models.JSONField()),
+                ('fetched_at', models.FloatField(db_index=True)),
+            ],
+        ),
+    ]
@@ -1,3 +1,18 @@
 from django.db import models
 
-# Create your models here.
+
+class WeatherSnapshot(models.Model):
+    """
+    The latest successful upstream fetch for one weather cache key.
+
+    A durable copy of what ``WeatherService`` writes to Redis, used to refill
+    the cache after a Redis restart or eviction without calling Open-Meteo.
+    """
+
+    cache_key = models.CharField(max_length=255, unique=True)
+    district_name = models.CharField(max_length=255)
+    payload = models.JSONField()
+    fetched_at = models.FloatField(db_index=True)
+
+    def __str__(self):
+        return self.cache_key
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 
+from travel.serializers.recommend_serializer import validate_forecast_date
+from travel.services.ranking_engine import LEXICOGRAPHIC, ORDERS, WEIGHTED
+
 
 class BestDistrictsSerializer(serializers.Serializer):
     limit = serializers.IntegerField(
@@ -8,4 +11,56 @@ class BestDistrictsSerializer(serializers.Serializer):
         max_value=64,
         required=False,
         help_text="Number of top districts to return"
-    )
\ No newline at end of file
+    )
+    order = serializers.ChoiceField(
+        choices=ORDERS,
+        required=False,
+        help_text=(
+            f"'{LEXICOGRAPHIC}' (temperature, then PM2.5) or "
+            f"'{WEIGHTED}' (temp_weight * temperature + pm25_weight * PM2.5)"
+        )
+    )
+    temp_weight = serializers.FloatField(
+        min_value=0,
+        required=False,
+        help_text="Weight of the average temperature in a weighted score"
+    )
+    pm25_weight = serializers.FloatField(
+        min_value=0,
+        required=False,
+        help_text="Weight of the average PM2.5 in a weighted score"
+    )
+    max_temp = serializers.FloatField(
+        required=False,
+        help_text="Only districts with an average temperature below this"
+    )
+    max_pm25 = serializers.FloatField(
+        min_value=0,
+        required=False,
+        help_text="Only districts with an average PM2.5 below this"
+    )
+    start_date = serializers.DateField(
+        required=False,
+        help_text="First day averaged (default: the first forecast day)"
+    )
+    end_date = serializers.DateField(
+        required=False,
+        help_text="Last day averaged (default: the last forecast day)"
+    )
+
+    def validate_start_date(self, value):
+        return validate_forecast_date(value, "Start date")
+
+    def validate_end_date(self, value):
+        return validate_forecast_date(value, "End date")
+
+    def validate(self, attrs):
+        start_date, end_date = attrs.get("start_date"), attrs.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError({"end_date": "End date cannot be before the start date."})
+
+        weighted_only = [name for name in ("temp_weight", "pm25_weight") if name in attrs]
+        if weighted_only and attrs.get("order") != WEIGHTED:
+            raise serializers.ValidationError({name: "Only used with order=weighted." for name in weighted_only})
+
+        return attrs
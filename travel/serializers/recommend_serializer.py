@@ -1,5 +1,17 @@
 from rest_framework import serializers
-from datetime import date
+from datetime import date, timedelta
+
+
+def validate_forecast_date(value, label="Travel date"):
+    today = date.today()
+    max_date = today + timedelta(days=7)
+
+    if value < today:
+        raise serializers.ValidationError(f"{label} cannot be in the past.")
+    if value > max_date:
+        raise serializers.ValidationError(f"{label} must be within the next 7 days.")
+
+    return value
 
 
 class RecommendSerializer(serializers.Serializer):
@@ -9,13 +21,51 @@ class RecommendSerializer(serializers.Serializer):
     travel_date = serializers.DateField()
 
     def validate_travel_date(self, value):
-        from datetime import timedelta
-        today = date.today()
-        max_date = today + timedelta(days=7)
+        return validate_forecast_date(value)
+
+
+class BestTravelDaySerializer(serializers.Serializer):
+    current_lat = serializers.FloatField(min_value=-90, max_value=90)
+    current_lon = serializers.FloatField(min_value=-180, max_value=180)
+    destination_name = serializers.CharField(max_length=255, trim_whitespace=True)
+
+
+class BatchRecommendSerializer(serializers.Serializer):
+    ALL_DESTINATIONS = "all"
+    MAX_DESTINATIONS = 64
+
+    current_lat = serializers.FloatField(min_value=-90, max_value=90)
+    current_lon = serializers.FloatField(min_value=-180, max_value=180)
+    destinations = serializers.CharField(
+        trim_whitespace=True,
+        help_text="Comma-separated destination district names, or 'all'"
+    )
+    start_date = serializers.DateField(help_text="First travel date")
+    end_date = serializers.DateField(required=False, help_text="Last travel date (default: start_date)")
+
+    def validate_destinations(self, value):
+        if value.lower() == self.ALL_DESTINATIONS:
+            return None
+
+        names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+        if not names:
+            raise serializers.ValidationError("At least one destination is required.")
+        if len(names) > self.MAX_DESTINATIONS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_DESTINATIONS} destinations are allowed; use 'all' for every district."
+            )
+
+        return names
+
+    def validate_start_date(self, value):
+        return validate_forecast_date(value, "Start date")
+
+    def validate_end_date(self, value):
+        return validate_forecast_date(value, "End date")
 
-        if value < today:
-            raise serializers.ValidationError("Travel date cannot be in the past.")
-        if value > max_date:
-            raise serializers.ValidationError("Travel date must be within the next 7 days.")
+    def validate(self, attrs):
+        attrs.setdefault("end_date", attrs["start_date"])
+        if attrs["end_date"] < attrs["start_date"]:
+            raise serializers.ValidationError({"end_date": "End date cannot be before the start date."})
 
-        return value
\ No newline at end of file
+        return attrs
@@ -1,34 +1,39 @@
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
 from structlog import get_logger
 
 from travel.services.district_service import DistrictService
-from travel.services.weather_service import WeatherService
+from travel.services.district_metrics import DistrictMetrics
+from travel.services.hourly_samples import daily_means
+from travel.services.ranking_engine import RankingQuery, ranking_engine
+from travel.services.weather_matrix import DistrictWeatherMatrix, district_weather_matrix
+from travel.services.weather_service import WeatherService, WEATHER_DATA_VERSION_KEY
+from travel_recommender.services.background_refresh import background_refresher
+from travel_recommender.services.freshness import record_freshness
+from travel_recommender.services.single_flight import single_flight
 
 logger = get_logger(__name__)
 
 
 class BestDistrictsService:
     DEFAULT_LIMIT = 10
+    RANKING_KEY = "best_districts:ranking"
 
     def __init__(self):
         self.district_service = DistrictService()
         self.weather_service = WeatherService()
 
     def _avg_at_2pm(self, times: List[str], values: List[Optional[float]]) -> Optional[float]:
-        collected = []
-
-        for i, time in enumerate(times):
-            if time.endswith("T14:00") and i < len(values):
-                value = values[i]
-                if value is not None:
-                    collected.append(value)
-
-        if not collected:
-            return None
-
-        return sum(collected) / len(collected)
+        return daily_means([(times, values)])[0]
 
     def _extract_metrics(self, weather: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        record = weather.get("metrics")
+        if record is not None:
+            return self._record_metrics(record)
+
         forecast = weather.get("forecast")
         air = weather.get("air_quality")
 
@@ -57,13 +62,57 @@ class BestDistrictsService:
             "avg_pm25": avg_pm25,
         }
 
-    def get_best_districts(self, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _record_metrics(record: DistrictMetrics) -> Optional[Dict[str, Any]]:
+        avg_temp = record.average_temperature()
+        avg_pm25 = record.average_pm25()
+
+        if avg_temp is None or avg_pm25 is None:
+            return None
+
+        return {
+            "avg_temp": avg_temp,
+            "avg_pm25": avg_pm25,
+        }
+
+    def _build_matrix(self) -> Tuple[DistrictWeatherMatrix, List[Dict[str, Any]]]:
+        """Read (or fetch) every district's weather and lay the records out as the worker's matrix."""
         districts = self.district_service.get_all_districts()
-        weather_data = self.weather_service.batch_get_weather(districts)
+        weather_data = self.weather_service.batch_get_metrics(districts)
+
+        # Read the version only now: fetching the misses writes them back and bumps it,
+        # and a matrix stamped with the older version would be outdated on arrival
+        weather_version = cache.get(WEATHER_DATA_VERSION_KEY)
+
+        records = {
+            weather["district_name"]: weather["metrics"] for weather in weather_data if weather.get("metrics") is not None
+        }
+        return district_weather_matrix.update(weather_version, records), weather_data
+
+    def _compute_ranking(self) -> Dict[str, Any]:
+        matrix, weather_data = self._build_matrix()
+        averages = matrix.averages()
 
         results = []
+        fetched_at = []
 
+        for name, row in matrix.rows.items():
+            avg_temp, avg_pm25 = averages[row, matrix.TEMPERATURE], averages[row, matrix.PM25]
+            if np.isnan(avg_temp) or np.isnan(avg_pm25):
+                continue
+
+            results.append({
+                "district": name,
+                "avg_temp": round(float(avg_temp), 2),
+                "avg_pm25": round(float(avg_pm25), 2),
+            })
+            fetched_at.append(float(matrix.fetched_at[row]))
+
+        # Districts fetched without a usable record are scored from their raw payloads
         for weather in weather_data:
+            if weather.get("metrics") is not None:
+                continue
+
             metrics = self._extract_metrics(weather)
             if not metrics:
                 continue
@@ -74,9 +123,103 @@ class BestDistrictsService:
                 "avg_pm25": round(metrics["avg_pm25"], 2),
             })
 
+            if weather.get("fetched_at") is not None:
+                fetched_at.append(weather["fetched_at"])
+
         # 🔥 CORE REQUIREMENT SORT
         results.sort(key=lambda x: (x["avg_temp"], x["avg_pm25"]))
 
         logger.info("best_districts_computed", total=len(results))
 
-        return results[:limit]
+        return {
+            "weather_version": matrix.version or 0,
+            "computed_at": time.time(),
+            "data_fetched_at": min(fetched_at) if fetched_at else None,
+            "districts": results,
+        }
+
+    def rebuild_ranking(self) -> Dict[str, Any]:
+        """Recompute the full ordered ranking and store it as one value."""
+        ranking = self._compute_ranking()
+
+        if ranking["districts"]:
+            cache.set(self.RANKING_KEY, ranking, timeout=settings.WEATHER_CACHE_TTL + settings.WEATHER_CACHE_STALE_TTL)
+            logger.info("best_districts_ranking_materialized", total=len(ranking["districts"]))
+        else:
+            # The upstream is down: publish briefly so workers waiting on this rebuild get an answer,
+            # but don't pin the outage for a whole TTL
+            cache.set(self.RANKING_KEY, ranking, timeout=settings.WEATHER_PARTIAL_CACHE_TTL)
+
+        return ranking
+
+    def _read_ranking(self) -> Optional[Dict[str, Any]]:
+        found = cache.get_many([self.RANKING_KEY, WEATHER_DATA_VERSION_KEY])
+
+        ranking = found.get(self.RANKING_KEY)
+        if ranking is None:
+            return None
+
+        weather_version = found.get(WEATHER_DATA_VERSION_KEY)
+        if weather_version is not None and weather_version > ranking["weather_version"]:
+            logger.info("best_districts_ranking_outdated", weather_version=weather_version)
+            return None
+
+        return ranking
+
+    def _refresh_if_stale(self, data_fetched_at: Optional[float]):
+        # Without a Celery beat the ranking would sit on stale data until it expires;
+        # rebuilding revalidates each district, which bumps the weather version
+        if data_fetched_at is not None and time.time() - data_fetched_at > settings.WEATHER_CACHE_TTL:
+            background_refresher.schedule(self.RANKING_KEY, self.rebuild_ranking)
+
+    def ensure_ranking(self) -> Tuple[Dict[str, Any], bool]:
+        """
+        The materialized ranking, rebuilt first unless it is current.
+
+        Returns:
+            (ranking, True if the stored ranking was already current)
+        """
+        ranking = self._read_ranking()
+        if ranking is not None and ranking["districts"]:
+            data_fetched_at = ranking["data_fetched_at"]
+            if data_fetched_at is None or time.time() - data_fetched_at <= settings.WEATHER_CACHE_TTL:
+                return ranking, True
+
+        return self.rebuild_ranking(), False
+
+    def _query_districts(self, query: RankingQuery, limit: int) -> List[Dict[str, Any]]:
+        matrix = district_weather_matrix.current(cache.get(WEATHER_DATA_VERSION_KEY))
+        if matrix is None:
+            matrix, _ = self._build_matrix()
+
+        if len(matrix.names):
+            data_fetched_at = float(matrix.fetched_at.min())
+            self._refresh_if_stale(data_fetched_at)
+            record_freshness(data_fetched_at, settings.WEATHER_CACHE_TTL)
+
+        return ranking_engine.rank(matrix, query, limit)
+
+    def get_best_districts(self, limit: int = DEFAULT_LIMIT, **options: Any) -> List[Dict[str, Any]]:
+        """
+        The top ``limit`` districts.
+
+        Without ``options`` this is a slice of the materialized ranking.
+        ``options`` are ``RankingQuery`` fields (scoring order, weights,
+        thresholds, date window); such queries are answered from the
+        worker's weather matrix and memoized per weather data version.
+        """
+        query = RankingQuery.from_options(options)
+        if not query.is_default:
+            return self._query_districts(query, limit)
+
+        ranking = self._read_ranking()
+
+        if ranking is None:
+            ranking = single_flight.fetch(self.RANKING_KEY, load=self.rebuild_ranking, read_cached=self._read_ranking)
+        else:
+            logger.info("best_districts_ranking_hit", total=len(ranking["districts"]))
+            self._refresh_if_stale(ranking["data_fetched_at"])
+
+        record_freshness(ranking["data_fetched_at"], settings.WEATHER_CACHE_TTL)
+
+        return ranking["districts"][:limit]
@@ -0,0 +1,59 @@
+import time
+from typing import Any, Dict
+
+from structlog import get_logger
+
+from travel.services.best_districts_service import BestDistrictsService
+from travel.services.district_service import DistrictService
+from travel.services.weather_projection import MIDDAY_PROJECTION
+from travel.services.weather_service import WeatherService
+
+logger = get_logger(__name__)
+
+
+class CacheWarmer:
+    """
+    Fill the district index, every district's weather and the best-districts
+    ranking before traffic arrives.
+
+    Each stage only does work for what is missing or stale, so running it on
+    every deploy against a warm cache costs a few cache reads. Weather for
+    the missing districts is fetched concurrently by ``batch_get_weather``'s
+    usual fetch path.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.district_service = DistrictService()
+        self.weather_service = WeatherService()
+        self.best_districts_service = BestDistrictsService()
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _timed(stage: Dict[str, Any], started: float) -> Dict[str, Any]:
+        stage["seconds"] = round(time.perf_counter() - started, 3)
+        return stage
+
+    def warm(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {}
+        started = time.perf_counter()
+
+        stage_started = time.perf_counter()
+        indexed, fresh = self.district_service.ensure_fresh()
+        report["districts"] = self._timed({"hit": fresh, "count": len(indexed)}, stage_started)
+
+        stage_started = time.perf_counter()
+        report["weather"] = self._timed(
+            self.weather_service.warm(list(indexed.values()), max_workers=self.max_workers, projection=MIDDAY_PROJECTION),
+            stage_started,
+        )
+
+        stage_started = time.perf_counter()
+        if indexed:
+            ranking, current = self.best_districts_service.ensure_ranking()
+            report["ranking"] = self._timed({"hit": current, "count": len(ranking["districts"])}, stage_started)
+        else:
+            report["ranking"] = self._timed({"hit": False, "count": 0}, stage_started)
+
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        logger.info("cache_warmed", **report)
+        return report
@@ -0,0 +1,167 @@
+import math
+import struct
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from travel.services.hourly_samples import daily_samples
+
+
+@dataclass(frozen=True)
+class DistrictMetrics:
+    """
+    Daily 14:00 temperature, PM2.5 and PM10 of one location, precomputed at fetch time.
+
+    Day ``i`` of every array is ``start_date + i``; a missing sample is None.
+    ``pack`` produces a fixed-width binary record (about 185 bytes for a
+    7-day forecast) that replaces rescanning the raw hourly JSON on reads.
+    """
+
+    start_date: date
+    temperatures: Tuple[Optional[float], ...]
+    pm25: Tuple[Optional[float], ...]
+    fetched_at: float
+    pm10: Tuple[Optional[float], ...] = ()
+
+    # Version 2 added PM10; version 1 records are still read
+    FORMAT_VERSION = 2
+    _ARRAYS_BY_VERSION = {1: 2, 2: 3}
+    # version, start date ordinal, fetched_at, number of days
+    _HEADER = struct.Struct("<BIdB")
+
+    def __post_init__(self):
+        if not self.pm10:
+            object.__setattr__(self, "pm10", (None,) * len(self.temperatures))
+
+    @classmethod
+    def from_payloads(
+            cls,
+            forecast: Optional[Dict[str, Any]],
+            air_quality: Optional[Dict[str, Any]],
+            fetched_at: float
+    ) -> Optional["DistrictMetrics"]:
+        return cls.from_payloads_batch([(forecast, air_quality, fetched_at)])[0]
+
+    @classmethod
+    def from_payloads_batch(
+            cls,
+            payloads: Sequence[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], float]]
+    ) -> List[Optional["DistrictMetrics"]]:
+        """Build records for many ``(forecast, air_quality, fetched_at)`` payloads with one vectorized pass per metric."""
+        temperatures = daily_samples([cls._series(forecast, "temperature_2m") for forecast, _, _ in payloads])
+        pm25 = daily_samples([cls._series(air_quality, "pm2_5") for _, air_quality, _ in payloads])
+        pm10 = daily_samples([cls._series(air_quality, "pm10") for _, air_quality, _ in payloads])
+
+        return [
+            cls._from_samples(samples, fetched_at)
+            for *samples, (_, _, fetched_at) in zip(temperatures, pm25, pm10, payloads)
+        ]
+
+    @staticmethod
+    def _series(payload: Optional[Dict[str, Any]], variable: str):
+        hourly = (payload or {}).get("hourly", {})
+        return hourly.get("time"), hourly.get(variable)
+
+    @staticmethod
+    def _valid_days(samples: Tuple[Optional[date], np.ndarray]) -> Optional[Tuple[date, date]]:
+        first_day, values = samples
+        valid = np.flatnonzero(~np.isnan(values))
+        if first_day is None or not len(valid):
+            return None
+        return first_day + timedelta(days=int(valid[0])), first_day + timedelta(days=int(valid[-1]))
+
+    @classmethod
+    def _from_samples(
+            cls,
+            samples: List[Tuple[Optional[date], np.ndarray]],
+            fetched_at: float
+    ) -> Optional["DistrictMetrics"]:
+        temperatures, pm25, pm10 = samples
+        # The window is set by the metrics the record exists for; PM10 is carried along
+        spans = [span for span in (cls._valid_days(temperatures), cls._valid_days(pm25)) if span is not None]
+        if not spans:
+            return None
+
+        start_date = min(first for first, _ in spans)
+        count = (max(last for _, last in spans) - start_date).days + 1
+
+        return cls(
+            start_date=start_date,
+            temperatures=cls._window(temperatures, start_date, count),
+            pm25=cls._window(pm25, start_date, count),
+            fetched_at=fetched_at,
+            pm10=cls._window(pm10, start_date, count),
+        )
+
+    @staticmethod
+    def _window(samples: Tuple[Optional[date], np.ndarray], start_date: date, count: int) -> Tuple[Optional[float], ...]:
+        first_day, values = samples
+        window: List[Optional[float]] = [None] * count
+        if first_day is None:
+            return tuple(window)
+
+        shift = (first_day - start_date).days
+        for day, value in enumerate(values.tolist()):
+            if 0 <= day + shift < count and not math.isnan(value):
+                window[day + shift] = value
+        return tuple(window)
+
+    def _index(self, day: date) -> Optional[int]:
+        index = (day - self.start_date).days
+        if 0 <= index < len(self.temperatures):
+            return index
+        return None
+
+    def temperature_on(self, day: date) -> Optional[float]:
+        index = self._index(day)
+        return None if index is None else self.temperatures[index]
+
+    def pm25_on(self, day: date) -> Optional[float]:
+        index = self._index(day)
+        return None if index is None else self.pm25[index]
+
+    def pm10_on(self, day: date) -> Optional[float]:
+        index = self._index(day)
+        return None if index is None else self.pm10[index]
+
+    @staticmethod
+    def _average(values: Tuple[Optional[float], ...]) -> Optional[float]:
+        collected = [v for v in values if v is not None]
+        if not collected:
+            return None
+        return sum(collected) / len(collected)
+
+    def average_temperature(self) -> Optional[float]:
+        return self._average(self.temperatures)
+
+    def average_pm25(self) -> Optional[float]:
+        return self._average(self.pm25)
+
+    def pack(self) -> bytes:
+        count = len(self.temperatures)
+        header = self._HEADER.pack(self.FORMAT_VERSION, self.start_date.toordinal(), self.fetched_at, count)
+        values = [math.nan if v is None else v for v in (*self.temperatures, *self.pm25, *self.pm10)]
+        return header + struct.pack(f"<{3 * count}d", *values)
+
+    @classmethod
+    def unpack(cls, packed: bytes) -> Optional["DistrictMetrics"]:
+        """Decode a record written by ``pack``; None for an unknown format version."""
+        if len(packed) < cls._HEADER.size or packed[0] not in cls._ARRAYS_BY_VERSION:
+            return None
+
+        version, ordinal, fetched_at, count = cls._HEADER.unpack_from(packed)
+        arrays = cls._ARRAYS_BY_VERSION[version]
+        values: List[Optional[float]] = [
+            None if math.isnan(v) else v
+            for v in struct.unpack_from(f"<{arrays * count}d", packed, cls._HEADER.size)
+        ]
+
+        return cls(
+            start_date=date.fromordinal(ordinal),
+            temperatures=tuple(values[:count]),
+            pm25=tuple(values[count:2 * count]),
+            fetched_at=fetched_at,
+            pm10=tuple(values[2 * count:]),
+        )
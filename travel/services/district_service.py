@@ -1,10 +1,15 @@
+import time
 from rest_framework import status
 from structlog import get_logger
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from django.core.cache import cache
 from django.conf import settings
 
+from travel.services.spatial_index import DistrictSpatialIndex
+from travel_recommender.services.background_refresh import background_refresher
 from travel_recommender.services.external_api_request_response import ExternalApiService
+from travel_recommender.services.single_flight import single_flight
+from travel_recommender.services.two_tier_cache import two_tier_cache
 
 logger = get_logger(__name__)
 
@@ -15,6 +20,7 @@ class DistrictService:
         self.api_service = ExternalApiService()
         self.base_url = settings.DISTRICTS_JSON_URL
         self.cache_ttl = settings.DISTRICTS_CACHE_TTL
+        self.stale_ttl = settings.DISTRICTS_CACHE_STALE_TTL
 
     @staticmethod
     def _is_valid_response(response) -> bool:
@@ -36,15 +42,85 @@ class DistrictService:
 
         return indexed
 
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the cached districts entry.
+
+        Returns:
+            {"districts": indexed, "fetched_at": float | None, "etag": str | None,
+            "last_modified": str | None, "spatial": buckets}, or None on a miss.
+            Entries written before fetched_at was tracked are bare indexed dicts.
+        """
+        # The in-process tier skips the Redis read and unpickle while the dataset's generation is unchanged
+        cached = two_tier_cache.get(self.CACHE_KEY, lambda: cache.get(self.CACHE_KEY))
+        if cached is None:
+            return None
+
+        if "districts" in cached and "fetched_at" in cached:
+            return cached
+
+        return {"districts": cached, "fetched_at": None, "etag": None, "last_modified": None}
+
     def _get_indexed_districts(self) -> Dict[str, Dict[str, Any]]:
-        cached = cache.get(self.CACHE_KEY)
+        cached = self._read_cache()
 
         if cached is not None:
             logger.info("districts_cache_hit", key=self.CACHE_KEY)
-            return cached
 
-        logger.info("fetching_districts_from_api", url=self.base_url)
-        response = self.api_service.handle_get(url=self.base_url)
+            fetched_at = cached["fetched_at"]
+            if fetched_at is not None and time.time() - fetched_at > self.cache_ttl:
+                logger.info("districts_cache_stale", key=self.CACHE_KEY, fetched_at=fetched_at)
+                background_refresher.schedule(self.CACHE_KEY, lambda: self._fetch_and_cache_districts(previous=cached))
+
+            return cached["districts"]
+
+        return single_flight.fetch(
+            self.CACHE_KEY,
+            load=self._fetch_and_cache_districts,
+            read_cached=lambda: (self._read_cache() or {}).get("districts"),
+        )
+
+    @staticmethod
+    def _conditional_headers(previous: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if previous and previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous and previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+        return headers
+
+    def _store(self, indexed: Dict[str, Dict[str, Any]], etag: Optional[str], last_modified: Optional[str]):
+        cache.set(
+            self.CACHE_KEY,
+            {
+                "districts": indexed,
+                "fetched_at": time.time(),
+                "etag": etag,
+                "last_modified": last_modified,
+                # Built once per rebuild so lookups never re-bucket the districts
+                "spatial": DistrictSpatialIndex.build(indexed).buckets,
+            },
+            timeout=self.cache_ttl + self.stale_ttl,
+        )
+        two_tier_cache.invalidate(self.CACHE_KEY)
+
+    def _fetch_and_cache_districts(self, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch and index the districts dataset.
+
+        When ``previous`` carries validators the request is conditional, and a
+        304 only re-stamps the cached entry instead of re-downloading and
+        re-indexing the file.
+        """
+        headers = self._conditional_headers(previous)
+
+        logger.info("fetching_districts_from_api", url=self.base_url, conditional=bool(headers))
+        response = self.api_service.handle_get(url=self.base_url, headers=headers or None)
+
+        if previous and response.status_code == status.HTTP_304_NOT_MODIFIED:
+            self._store(previous["districts"], previous.get("etag"), previous.get("last_modified"))
+            logger.info("districts_not_modified", key=self.CACHE_KEY, count=len(previous["districts"]))
+            return previous["districts"]
 
         if not self._is_valid_response(response):
             logger.error(
@@ -56,7 +132,7 @@ class DistrictService:
             return {}
 
         indexed = self.__index_districts(response.data.get("districts", []))
-        cache.set(self.CACHE_KEY, indexed, timeout=self.cache_ttl)
+        self._store(indexed, response.headers.get("ETag"), response.headers.get("Last-Modified"))
 
         logger.info(
             "districts_cached_indexed",
@@ -65,6 +141,25 @@ class DistrictService:
         )
         return indexed
 
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Revalidate the dataset now and bump its generation for every worker."""
+        return self._fetch_and_cache_districts(previous=self._read_cache())
+
+    def ensure_fresh(self) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        """
+        The district index, revalidated first unless a fresh copy is cached.
+
+        Returns:
+            (indexed districts, True if the cached copy was fresh)
+        """
+        cached = self._read_cache()
+        fetched_at = cached["fetched_at"] if cached is not None else None
+
+        if fetched_at is not None and time.time() - fetched_at <= self.cache_ttl:
+            return cached["districts"], True
+
+        return self._fetch_and_cache_districts(previous=cached), False
+
     def get_all_districts(self) -> List[Dict[str, Any]]:
         return list(self._get_indexed_districts().values())
 
@@ -78,4 +173,23 @@ class DistrictService:
             return district
 
         logger.warning("district_not_found", name=normalized_name)
-        return None
\ No newline at end of file
+        return None
+
+    def get_nearest_district(self, lat: float, lon: float, radius_km: float) -> Dict[str, Any] | None:
+        """Return the district closest to ``lat``/``lon`` if one lies within ``radius_km``."""
+        cached = self._read_cache()
+
+        if cached is not None and cached.get("spatial") is not None:
+            index = DistrictSpatialIndex(cached["spatial"], cached["districts"])
+        else:
+            # Entries written before the spatial index existed
+            index = DistrictSpatialIndex.build(self._get_indexed_districts())
+
+        nearest = index.nearest(lat, lon, radius_km)
+        if nearest is None:
+            logger.info("nearest_district_not_found", radius_km=radius_km)
+            return None
+
+        district, distance = nearest
+        logger.info("nearest_district_found", name=district.get("name"), distance_km=round(distance, 2))
+        return district
@@ -0,0 +1,133 @@
+from datetime import date
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+SAMPLE_HOUR = 14
+
+HourlySeries = Tuple[Optional[Sequence[str]], Optional[Sequence[Optional[float]]]]
+
+
+class HourlyAxis:
+    """
+    An Open-Meteo hourly ``time`` array parsed once into integer offsets.
+
+    Timestamps ("2024-01-15T14:00", local time) become a day offset from the
+    first day and a minute of the day, so picking one hour of every day is an
+    integer comparison instead of a string scan. An empty or malformed array
+    gives an empty axis (no first day, no columns).
+    """
+
+    def __init__(self, times: Sequence[str]):
+        try:
+            stamps = np.array(times, dtype="datetime64[m]")
+            if np.isnat(stamps).any():
+                raise ValueError("missing timestamp")
+        except (TypeError, ValueError) as e:
+            logger.warning("hourly_axis_unparseable", samples=len(times), error=str(e))
+            stamps = np.array([], dtype="datetime64[m]")
+
+        if not len(stamps):
+            self.first_day: Optional[date] = None
+            self.day_offsets = self.minute_of_day = np.empty(0, dtype=np.int64)
+            self.days = 0
+            return
+
+        first_day = stamps[0].astype("datetime64[D]")
+        minutes = (stamps - first_day).astype(np.int64)
+
+        self.first_day = first_day.item()
+        self.day_offsets = minutes // MINUTES_PER_DAY
+        self.minute_of_day = minutes % MINUTES_PER_DAY
+        self.days = int(self.day_offsets[-1]) + 1
+
+    def columns_at(self, hour: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(day offsets, positions in the hourly arrays) of every sample at ``hour``:00."""
+        columns = np.flatnonzero(self.minute_of_day == hour * 60)
+        return self.day_offsets[columns], columns
+
+
+def _picker(columns: List[int]) -> Callable[[Sequence[Optional[float]]], Sequence[Optional[float]]]:
+    if not columns:
+        return lambda values: ()
+
+    fast = itemgetter(*columns)
+    last = columns[-1]
+
+    def pick(values):
+        # itemgetter does the gather in C; value arrays shorter than their time axis take the slow path
+        if len(values) > last:
+            picked = fast(values)
+            return picked if len(columns) > 1 else (picked,)
+        return [values[c] if c < len(values) else None for c in columns]
+
+    return pick
+
+
+def _axis_key(times: Sequence[str]) -> Tuple[int, str, str]:
+    # Open-Meteo time axes are evenly spaced, so the ends and the length identify one
+    return len(times), times[0], times[-1]
+
+
+def _grouped_samples(series: Sequence[HourlySeries], hour: int) -> Iterator[Tuple[date, List[int], np.ndarray]]:
+    """Yield (first day, series positions, ``len(positions) x days`` samples) per distinct time axis."""
+    groups: Dict[Tuple[int, str, str], List[int]] = {}
+    for position, (times, values) in enumerate(series):
+        if times and values is not None:
+            groups.setdefault(_axis_key(times), []).append(position)
+
+    for positions in groups.values():
+        axis = HourlyAxis(series[positions[0]][0])
+        if axis.first_day is None:
+            # Unusable timestamps: these series are left as if they had none
+            continue
+
+        day_offsets, columns = axis.columns_at(hour)
+        pick = _picker(columns.tolist())
+
+        picked = np.array([pick(series[p][1]) for p in positions], dtype=float).reshape(len(positions), -1)
+        samples = np.full((len(positions), axis.days), np.nan)
+        samples[:, day_offsets] = picked
+
+        yield axis.first_day, positions, samples
+
+
+def daily_samples(series: Sequence[HourlySeries], hour: int = SAMPLE_HOUR) -> List[Tuple[Optional[date], np.ndarray]]:
+    """
+    The value at ``hour``:00 of every day, for many hourly series at once.
+
+    Series sharing a time axis (every district of one refresh does) parse it
+    once; only the selected hours are pulled out of each value list, into one
+    ``series x days`` matrix where None becomes NaN.
+
+    Returns:
+        (first day, float array with one entry per day) per series, or
+        (None, empty array) for a series without timestamps
+    """
+    results: List[Tuple[Optional[date], np.ndarray]] = [(None, np.empty(0))] * len(series)
+
+    for first_day, positions, samples in _grouped_samples(series, hour):
+        for row, position in enumerate(positions):
+            results[position] = (first_day, samples[row])
+
+    return results
+
+
+def daily_means(series: Sequence[HourlySeries], hour: int = SAMPLE_HOUR) -> List[Optional[float]]:
+    """Mean of the ``hour``:00 samples of each series (None if it has none), one matrix op per time axis."""
+    results: List[Optional[float]] = [None] * len(series)
+
+    for _, positions, samples in _grouped_samples(series, hour):
+        counts = np.count_nonzero(~np.isnan(samples), axis=1)
+        sums = np.nansum(samples, axis=1)
+        means = np.divide(sums, counts, out=np.full(len(positions), np.nan), where=counts > 0)
+
+        for position, mean in zip(positions, means.tolist()):
+            results[position] = None if mean != mean else mean
+
+    return results
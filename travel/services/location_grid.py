@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """
+    A cell of a regular latitude/longitude grid, identified by its centre.
+
+    Arbitrary user coordinates are snapped to the nearest cell so that every
+    location inside one cell shares a cache entry and a single upstream fetch.
+    Open-Meteo answers a query from the model grid point closest to it anyway,
+    so a resolution at or below the model's (about 0.1° for the forecast
+    models it blends) costs no accuracy.
+    """
+
+    lat: float
+    lon: float
+
+    NAME_PREFIX = "cell:"
+
+    @classmethod
+    def snap(cls, lat: float, lon: float, resolution: float) -> "GridCell":
+        if resolution <= 0:
+            return cls(lat=lat, lon=lon)
+
+        snapped_lat = min(max(round(lat / resolution) * resolution, -90.0), 90.0)
+        snapped_lon = (round(lon / resolution) * resolution + 180.0) % 360.0 - 180.0
+        # Round away float noise so equal cells always format to the same name
+        return cls(lat=round(snapped_lat, 6), lon=round(snapped_lon, 6))
+
+    @property
+    def name(self) -> str:
+        return f"{self.NAME_PREFIX}{self.lat:.4f},{self.lon:.4f}"
+
+    @classmethod
+    def is_cell_name(cls, name: str) -> bool:
+        return name.startswith(cls.NAME_PREFIX)
+
+    def as_district(self) -> Dict[str, Any]:
+        return {"name": self.name, "lat": self.lat, "long": self.lon}
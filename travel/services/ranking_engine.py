@@ -0,0 +1,143 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from structlog import get_logger
+
+from travel.services.weather_matrix import DistrictWeatherMatrix
+
+logger = get_logger(__name__)
+
+LEXICOGRAPHIC = "lexicographic"
+WEIGHTED = "weighted"
+ORDERS = (LEXICOGRAPHIC, WEIGHTED)
+
+
+@dataclass(frozen=True)
+class RankingQuery:
+    """
+    How districts are scored, filtered and averaged for one best-districts query.
+
+    ``lexicographic`` orders by (average temperature, average PM2.5), the
+    original ranking; ``weighted`` orders by
+    ``temp_weight * temperature + pm25_weight * PM2.5`` and breaks ties the
+    lexicographic way. ``max_temp``/``max_pm25`` drop districts whose
+    averages reach the bound, and ``start_date``/``end_date`` restrict the
+    averages to a window of the forecast (inclusive).
+    """
+
+    order: str = LEXICOGRAPHIC
+    temp_weight: float = 1.0
+    pm25_weight: float = 1.0
+    max_temp: Optional[float] = None
+    max_pm25: Optional[float] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> "RankingQuery":
+        names = {field.name for field in fields(cls)}
+        return cls(**{name: value for name, value in options.items() if name in names and value is not None})
+
+    @property
+    def is_default(self) -> bool:
+        return self == RankingQuery()
+
+
+class RankingEngine:
+    """
+    Top-k selection over a ``DistrictWeatherMatrix``.
+
+    Only the districts that can make the top ``limit`` are sorted: the
+    ``limit``-th smallest primary key is found with ``np.argpartition`` and
+    every district at or below it (ties included) is ordered with one
+    ``np.lexsort``. Results are memoized per (query, limit) for the weather
+    data version the matrix was built from; a new version drops them all.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Any = None
+        self._results: "OrderedDict[Tuple[RankingQuery, int], List[Dict[str, Any]]]" = OrderedDict()
+
+    def rank(self, matrix: DistrictWeatherMatrix, query: RankingQuery, limit: int) -> List[Dict[str, Any]]:
+        key = (query, limit)
+
+        with self._lock:
+            if matrix.version is not None and matrix.version == self._version and key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        results = self._select(matrix, query, limit)
+        logger.info("ranking_query_computed", order=query.order, limit=limit, total=len(results))
+
+        if matrix.version is not None:
+            self._remember(matrix.version, key, results)
+
+        return results
+
+    def _remember(self, version: Any, key: Tuple[RankingQuery, int], results: List[Dict[str, Any]]):
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._results = OrderedDict()
+
+            self._results[key] = results
+            while len(self._results) > settings.LOCAL_CACHE_MAX_ENTRIES:
+                self._results.popitem(last=False)
+
+    @staticmethod
+    def _select(matrix: DistrictWeatherMatrix, query: RankingQuery, limit: int) -> List[Dict[str, Any]]:
+        averages = matrix.averages(query.start_date, query.end_date)
+        temps, pm25 = averages[:, matrix.TEMPERATURE], averages[:, matrix.PM25]
+
+        eligible = ~(np.isnan(temps) | np.isnan(pm25))
+        if query.max_temp is not None:
+            eligible &= temps < query.max_temp
+        if query.max_pm25 is not None:
+            eligible &= pm25 < query.max_pm25
+
+        rows = np.flatnonzero(eligible)
+        if not len(rows):
+            return []
+
+        # Rounded like the materialized ranking, so both agree on order and ties
+        temps, pm25 = np.round(temps[rows], 2), np.round(pm25[rows], 2)
+        scores = np.round(query.temp_weight * temps + query.pm25_weight * pm25, 4) if query.order == WEIGHTED else None
+        primary = temps if scores is None else scores
+
+        if limit < len(rows):
+            kth = primary[np.argpartition(primary, limit - 1)[limit - 1]]
+            candidates = np.flatnonzero(primary <= kth)
+        else:
+            candidates = np.arange(len(rows))
+
+        # np.lexsort sorts by its last key first
+        keys = (pm25[candidates], temps[candidates])
+        if scores is not None:
+            keys += (scores[candidates],)
+        ordered = candidates[np.lexsort(keys)][:limit]
+
+        results = []
+        for index in ordered.tolist():
+            result = {
+                "district": matrix.names[rows[index]],
+                "avg_temp": float(temps[index]),
+                "avg_pm25": float(pm25[index]),
+            }
+            if scores is not None:
+                result["score"] = float(scores[index])
+            results.append(result)
+        return results
+
+    def reset(self):
+        with self._lock:
+            self._version = None
+            self._results = OrderedDict()
+
+
+ranking_engine = RankingEngine()
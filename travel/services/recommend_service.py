@@ -1,17 +1,39 @@
-from typing import Dict, Any
-from datetime import date
+import math
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.cache import cache
 from structlog import get_logger
 
+from travel.services.district_metrics import DistrictMetrics
 from travel.services.district_service import DistrictService
-from travel.services.weather_service import WeatherService
+from travel.services.hourly_samples import daily_samples
+from travel.services.location_grid import GridCell
+from travel.services.weather_matrix import DistrictWeatherMatrix, district_weather_matrix
+from travel.services.weather_projection import MIDDAY_PROJECTION
+from travel.services.weather_service import WeatherService, WEATHER_DATA_VERSION_KEY
+from travel_recommender.services.concurrent_calls import run_concurrently
+from travel_recommender.services.freshness import record_freshness
 
 logger = get_logger(__name__)
 
 
 class RecommendService:
+    DAY_VERDICTS_KEY_TEMPLATE = "recommend:days:{origin}:{destination}"
+
     def __init__(self):
         self.district_service = DistrictService()
         self.weather_service = WeatherService()
+        self.concurrent_fetch = settings.CONCURRENT_UPSTREAM_FETCH
+        self.upstream_deadline = settings.UPSTREAM_DEADLINE
+        self.grid_resolution = settings.CURRENT_LOCATION_GRID_RESOLUTION
+        self.use_nearest_district = settings.CURRENT_LOCATION_NEAREST_DISTRICT
+        self.nearest_district_radius = settings.NEAREST_DISTRICT_RADIUS_KM
+        self._matrix: Optional[DistrictWeatherMatrix] = None
+        self._matrix_resolved = False
+        self._weather_version: Any = None
+        self._weather_version_read = False
 
     def _get_value_at_2pm_on_date(self, times: list, values: list, target_date: date) -> float | None:
         """
@@ -25,16 +47,47 @@ class RecommendService:
         Returns:
             Value at 2 PM on target date, or None if not found
         """
-        # Format: "YYYY-MM-DDTHH:MM"
-        target_datetime = f"{target_date.isoformat()}T14:00"
+        first_day, samples = daily_samples([(times, values)])[0]
 
-        for t, v in zip(times, values):
-            if t == target_datetime and v is not None:
-                return v
+        if first_day is not None:
+            day = (target_date - first_day).days
+            if 0 <= day < len(samples) and not math.isnan(samples[day]):
+                return float(samples[day])
 
-        logger.warning("value_not_found_for_date", target=target_datetime)
+        logger.warning("value_not_found_for_date", target=f"{target_date.isoformat()}T14:00")
         return None
 
+    def _weather_matrix(self) -> Optional[DistrictWeatherMatrix]:
+        """The worker's weather matrix, resolved once per service instance (i.e. per request)."""
+        if not self._matrix_resolved:
+            if not self._weather_version_read:
+                self._weather_version = cache.get(WEATHER_DATA_VERSION_KEY)
+                self._weather_version_read = True
+
+            self._matrix = district_weather_matrix.get(
+                self._weather_version,
+                load=lambda: self.weather_service.read_metrics(self.district_service.get_all_districts()),
+            )
+            self._matrix_resolved = True
+        return self._matrix
+
+    def _matrix_metrics(self, district_name: str, travel_date: date) -> dict | None:
+        matrix = self._weather_matrix()
+        # Stale rows fall through to the cache path, which schedules their refresh
+        if matrix is None or not matrix.is_fresh(district_name, self.weather_service.cache_ttl):
+            return None
+
+        temp = matrix.value(district_name, travel_date, matrix.TEMPERATURE)
+        pm25 = matrix.value(district_name, travel_date, matrix.PM25)
+        if temp is None or pm25 is None:
+            return None
+
+        record_freshness(float(matrix.fetched_at[matrix.rows[district_name]]), self.weather_service.cache_ttl)
+        return {
+            "temp": round(temp, 1),
+            "pm25": round(pm25, 1)
+        }
+
     def _fetch_metrics_for_date(
             self,
             district_name: str,
@@ -42,8 +95,24 @@ class RecommendService:
             lon: float,
             travel_date: date
     ) -> dict | None:
+        metrics = self._matrix_metrics(district_name, travel_date)
+        if metrics is not None:
+            return metrics
+
+        district = {"name": district_name, "lat": lat, "long": lon}
+
+        record = self.weather_service.get_district_metrics(district=district)
+        if record is not None:
+            temp, pm25 = record.temperature_on(travel_date), record.pm25_on(travel_date)
+            if temp is not None and pm25 is not None:
+                return {
+                    "temp": round(temp, 1),
+                    "pm25": round(pm25, 1)
+                }
+
         weather = self.weather_service.get_weather_for_district(
-            district={"name": district_name, "lat": lat, "long": lon}
+            district=district,
+            projection=MIDDAY_PROJECTION.for_day(travel_date)
         )
 
         if not weather:
@@ -79,6 +148,52 @@ class RecommendService:
             "pm25": round(pm25, 1)
         }
 
+    def _resolve_current_location(self, lat: float, lon: float) -> Dict[str, Any]:
+        if self.use_nearest_district:
+            # Inside a district's radius its cached weather stands in for the user's own
+            district = self.district_service.get_nearest_district(lat, lon, self.nearest_district_radius)
+            if district is not None:
+                return district
+
+        # Users in the same grid cell share one cache entry per date
+        return GridCell.snap(lat, lon, self.grid_resolution).as_district()
+
+    def _fetch_location_metrics(
+            self,
+            current_lat: float,
+            current_lon: float,
+            destination: Dict[str, Any],
+            travel_date: date,
+            current: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, dict | None]:
+        current = current or self._resolve_current_location(current_lat, current_lon)
+
+        calls = {
+            "current": lambda: self._fetch_metrics_for_date(
+                current["name"],
+                float(current["lat"]),
+                float(current["long"]),
+                travel_date
+            ),
+            "destination": lambda: self._fetch_metrics_for_date(
+                destination["name"],
+                float(destination["lat"]),
+                float(destination["long"]),
+                travel_date
+            ),
+        }
+
+        if self.concurrent_fetch:
+            return run_concurrently(calls, timeout=self.upstream_deadline)
+
+        metrics = {}
+        for name, call in calls.items():
+            metrics[name] = call()
+            if not metrics[name]:
+                break
+
+        return metrics
+
     def recommend(
             self,
             current_lat: float,
@@ -100,32 +215,40 @@ class RecommendService:
                 "reason": f"Destination '{destination_name}' not found in our database."
             }
 
-        current_metrics = self._fetch_metrics_for_date(
-            "Current Location",
-            current_lat,
-            current_lon,
-            travel_date
-        )
+        current = self._resolve_current_location(current_lat, current_lon)
+
+        day = self._cached_day_verdict(current, destination, travel_date)
+        if day is not None:
+            logger.info(
+                "recommendation_served_from_day_verdicts",
+                destination=destination_name,
+                recommendation=day["recommendation"]
+            )
+            return {
+                "recommendation": day["recommendation"],
+                "reason": day["reason"],
+                "travel_date": day["travel_date"],
+                "current_location": day["current_location"],
+                "destination": {"name": destination["name"], **day["destination"]},
+            }
+
+        metrics = self._fetch_location_metrics(current_lat, current_lon, destination, travel_date, current=current)
+
+        current_metrics = metrics.get("current")
         if not current_metrics:
             return {
                 "recommendation": "Not Recommended",
                 "reason": f"Weather data unavailable for your current location on {travel_date.strftime('%B %d, %Y')}."
             }
 
-        dest_metrics = self._fetch_metrics_for_date(
-            destination["name"],
-            float(destination["lat"]),
-            float(destination["long"]),
-            travel_date
-        )
+        dest_metrics = metrics.get("destination")
         if not dest_metrics:
             return {
                 "recommendation": "Not Recommended",
                 "reason": f"Weather data unavailable for {destination_name} on {travel_date.strftime('%B %d, %Y')}."
             }
 
-        temp_diff = dest_metrics["temp"] - current_metrics["temp"]
-        pm25_diff = dest_metrics["pm25"] - current_metrics["pm25"]
+        recommendation, reason, temp_diff, pm25_diff = self._verdict(current_metrics, dest_metrics)
 
         logger.info(
             "recommendation_metrics_computed",
@@ -134,6 +257,38 @@ class RecommendService:
             pm25_diff=pm25_diff
         )
 
+        logger.info(
+            "recommendation_completed",
+            destination=destination_name,
+            recommendation=recommendation
+        )
+
+        return {
+            "recommendation": recommendation,
+            "reason": reason,
+            "travel_date": travel_date.isoformat(),
+            "current_location": {
+                "temperature": current_metrics["temp"],
+                "pm25": current_metrics["pm25"]
+            },
+            "destination": {
+                "name": destination["name"],
+                "temperature": dest_metrics["temp"],
+                "pm25": dest_metrics["pm25"]
+            }
+        }
+
+    @staticmethod
+    def _verdict(current_metrics: dict, dest_metrics: dict) -> Tuple[str, str, float, float]:
+        """
+        Compare one destination against the current location on one day.
+
+        Returns:
+            (recommendation, reason, temperature difference, PM2.5 difference)
+        """
+        temp_diff = dest_metrics["temp"] - current_metrics["temp"]
+        pm25_diff = dest_metrics["pm25"] - current_metrics["pm25"]
+
         is_cooler = temp_diff < 0
         is_cleaner = pm25_diff < 0
 
@@ -168,23 +323,289 @@ class RecommendService:
             )
             recommendation = "Recommended" if is_cleaner else "Not Recommended"
 
+        return recommendation, reason, temp_diff, pm25_diff
+
+    @staticmethod
+    def _benefit(verdict: Dict[str, Any]) -> Tuple[bool, float, float]:
+        """Sort key putting the most worthwhile trip first: recommended, then the largest PM2.5 and temperature drops."""
+        return verdict["recommendation"] != "Recommended", verdict["pm25_diff"], verdict["temp_diff"]
+
+    def _location_record(self, location: Dict[str, Any]) -> Optional[DistrictMetrics]:
+        """Every forecast day of one location: its cached record, else one whole-window fetch."""
+        record = self.weather_service.get_district_metrics(district=location)
+        if record is not None:
+            return record
+
+        weather = self.weather_service.get_weather_for_district(district=location, projection=MIDDAY_PROJECTION)
+        if not weather:
+            logger.warning("weather_data_unavailable", location=location["name"])
+            return None
+
+        return DistrictMetrics.from_payloads(weather.get("forecast"), weather.get("air_quality"), weather.get("fetched_at"))
+
+    def _destination_matrix(self, destinations: List[Dict[str, Any]]) -> DistrictWeatherMatrix:
+        matrix = self._weather_matrix()
+        if matrix is not None and all(matrix.is_fresh(d["name"], self.weather_service.cache_ttl) for d in destinations):
+            return matrix
+
+        # One batch cache read; misses are fetched together and stale records refreshed in the background
+        records = {
+            weather["district_name"]: weather["metrics"]
+            for weather in self.weather_service.batch_get_metrics(destinations)
+            if weather.get("metrics") is not None
+        }
+        return DistrictWeatherMatrix.build(records, version=None)
+
+    def _resolve_destinations(self, destination_names: Optional[List[str]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """(districts found, names not found); None means every district."""
+        if destination_names is None:
+            return self.district_service.get_all_districts(), []
+
+        destinations, not_found = [], []
+        for name in destination_names:
+            district = self.district_service.get_district_by_name(name)
+            if district:
+                destinations.append(district)
+            else:
+                not_found.append(name)
+        return destinations, not_found
+
+    def _origin_metrics(self, current_lat: float, current_lon: float, travel_dates: List[date]) -> Dict[date, dict]:
+        """The current location's metrics on each of ``travel_dates`` it has readings for."""
+        origin = self._location_record(self._resolve_current_location(current_lat, current_lon))
+        if origin is None:
+            return {}
+
+        current = {}
+        for day in travel_dates:
+            temp, pm25 = origin.temperature_on(day), origin.pm25_on(day)
+            if temp is not None and pm25 is not None:
+                current[day] = {"temp": round(temp, 1), "pm25": round(pm25, 1)}
+        return current
+
+    def _destination_verdicts(
+            self,
+            destinations: List[Dict[str, Any]],
+            current: Dict[date, dict]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        One verdict per destination and day with readings on both sides.
+
+        Returns:
+            (verdicts, names of destinations without a reading on any day)
+        """
+        matrix = self._destination_matrix(destinations)
+
+        results, unavailable = [], []
+        for district in destinations:
+            name = district["name"]
+            found = False
+            for day, current_metrics in current.items():
+                temp = matrix.value(name, day, matrix.TEMPERATURE)
+                pm25 = matrix.value(name, day, matrix.PM25)
+                if temp is None or pm25 is None:
+                    continue
+
+                dest_metrics = {"temp": round(temp, 1), "pm25": round(pm25, 1)}
+                recommendation, reason, temp_diff, pm25_diff = self._verdict(current_metrics, dest_metrics)
+                results.append({
+                    "destination": name,
+                    "travel_date": day.isoformat(),
+                    "recommendation": recommendation,
+                    "reason": reason,
+                    "temperature": dest_metrics["temp"],
+                    "pm25": dest_metrics["pm25"],
+                    "temp_diff": round(temp_diff, 1),
+                    "pm25_diff": round(pm25_diff, 1),
+                })
+                found = True
+
+            if found:
+                record_freshness(float(matrix.fetched_at[matrix.rows[name]]), self.weather_service.cache_ttl)
+            else:
+                unavailable.append(name)
+
+        return results, unavailable
+
+    def recommend_batch(
+            self,
+            current_lat: float,
+            current_lon: float,
+            destination_names: Optional[List[str]],
+            start_date: date,
+            end_date: date
+    ) -> Dict[str, Any]:
+        """
+        Verdicts for many destinations on every day of ``start_date..end_date``.
+
+        ``destination_names`` of None means every district. The origin costs
+        at most one fetch and the destinations one batch cache read; results
+        are sorted by benefit: recommended first, then the largest PM2.5 and
+        temperature drops.
+        """
+        travel_dates = [start_date + timedelta(days=day) for day in range((end_date - start_date).days + 1)]
+        destinations, not_found = self._resolve_destinations(destination_names)
+
         logger.info(
-            "recommendation_completed",
-            destination=destination_name,
-            recommendation=recommendation
+            "batch_recommendation_request_started",
+            destinations=len(destinations),
+            not_found=len(not_found),
+            days=len(travel_dates)
         )
 
-        return {
-            "recommendation": recommendation,
-            "reason": reason,
-            "travel_date": travel_date.isoformat(),
+        current = self._origin_metrics(current_lat, current_lon, travel_dates)
+        response = {
+            "travel_dates": [day.isoformat() for day in travel_dates],
             "current_location": {
-                "temperature": current_metrics["temp"],
-                "pm25": current_metrics["pm25"]
+                day.isoformat(): {"temperature": metrics["temp"], "pm25": metrics["pm25"]} for day, metrics in current.items()
             },
-            "destination": {
-                "name": destination["name"],
-                "temperature": dest_metrics["temp"],
-                "pm25": dest_metrics["pm25"]
+            "count": 0,
+            "results": [],
+            "not_found": not_found,
+            "unavailable": [],
+        }
+
+        if not current:
+            response["reason"] = "Weather data unavailable for your current location on the requested dates."
+            response["unavailable"] = [d["name"] for d in destinations]
+            return response
+
+        results, unavailable = self._destination_verdicts(destinations, current) if destinations else ([], [])
+        results.sort(key=lambda r: (*self._benefit(r), r["destination"], r["travel_date"]))
+
+        logger.info("batch_recommendation_completed", results=len(results), unavailable=len(unavailable))
+
+        response["count"] = len(results)
+        response["results"] = results
+        response["unavailable"] = unavailable
+        return response
+
+    def _day_verdicts_key(self, current: Dict[str, Any], destination: Dict[str, Any]) -> str:
+        return self.DAY_VERDICTS_KEY_TEMPLATE.format(origin=current["name"], destination=destination["name"])
+
+    def _compute_day_verdicts(self, current: Dict[str, Any], destination: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        calls = {
+            "current": lambda: self._location_record(current),
+            "destination": lambda: self._location_record(destination),
+        }
+        if self.concurrent_fetch:
+            records = run_concurrently(calls, timeout=self.upstream_deadline)
+        else:
+            records = {name: call() for name, call in calls.items()}
+
+        origin, target = records.get("current"), records.get("destination")
+        if origin is None or target is None:
+            return None
+
+        today = date.today()
+        days = []
+        for offset in range(len(origin.temperatures)):
+            day = origin.start_date + timedelta(days=offset)
+            readings = origin.temperature_on(day), origin.pm25_on(day), target.temperature_on(day), target.pm25_on(day)
+            if day < today or any(value is None for value in readings):
+                continue
+
+            current_metrics = {"temp": round(readings[0], 1), "pm25": round(readings[1], 1)}
+            dest_metrics = {"temp": round(readings[2], 1), "pm25": round(readings[3], 1)}
+            recommendation, reason, temp_diff, pm25_diff = self._verdict(current_metrics, dest_metrics)
+            days.append({
+                "travel_date": day.isoformat(),
+                "recommendation": recommendation,
+                "reason": reason,
+                "temp_diff": round(temp_diff, 1),
+                "pm25_diff": round(pm25_diff, 1),
+                "current_location": {"temperature": current_metrics["temp"], "pm25": current_metrics["pm25"]},
+                "destination": {"temperature": dest_metrics["temp"], "pm25": dest_metrics["pm25"]},
+            })
+
+        verdicts = {"fetched_at": min(origin.fetched_at, target.fetched_at), "days": days}
+
+        # Kept only while both inputs are fresh, so a stale pair is recomputed (and refreshed) on the next ask
+        timeout = int(self.weather_service.cache_ttl - (time.time() - verdicts["fetched_at"]))
+        if days and timeout > 0:
+            cache.set(self._day_verdicts_key(current, destination), verdicts, timeout=timeout)
+
+        logger.info("day_verdicts_computed", origin=current["name"], destination=destination["name"], days=len(days))
+        return verdicts
+
+    def _day_verdicts(self, current: Dict[str, Any], destination: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        key = self._day_verdicts_key(current, destination)
+
+        # No single-flight: a pair with stale inputs or no common day is never cached, so followers
+        # would wait for a value that never comes; the upstream fetches behind it are coalesced already
+        verdicts = cache.get(key)
+        if verdicts is None:
+            verdicts = self._compute_day_verdicts(current, destination)
+        else:
+            logger.info("day_verdicts_cache_hit", origin=current["name"], destination=destination["name"])
+
+        if verdicts is not None:
+            record_freshness(verdicts["fetched_at"], self.weather_service.cache_ttl)
+        return verdicts
+
+    def _cached_day_verdict(
+            self,
+            current: Dict[str, Any],
+            destination: Dict[str, Any],
+            travel_date: date
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ``travel_date``'s entry of a stored day list for the pair, if fresh.
+
+        Read together with the weather data version the matrix lookup needs
+        anyway, so a single-date request pays no extra round trip for it.
+        """
+        found = cache.get_many([WEATHER_DATA_VERSION_KEY, self._day_verdicts_key(current, destination)])
+        self._weather_version = found.get(WEATHER_DATA_VERSION_KEY)
+        self._weather_version_read = True
+
+        verdicts = found.get(self._day_verdicts_key(current, destination))
+        if verdicts is None or time.time() - verdicts["fetched_at"] > self.weather_service.cache_ttl:
+            return None
+
+        for day in verdicts["days"]:
+            if day["travel_date"] == travel_date.isoformat():
+                record_freshness(verdicts["fetched_at"], self.weather_service.cache_ttl)
+                return day
+        return None
+
+    def best_travel_day(self, current_lat: float, current_lon: float, destination_name: str) -> Dict[str, Any]:
+        """
+        Verdicts for every forecast day from one pair of records, and the best of them.
+
+        The day list is cached per (origin, destination) while both records
+        are fresh; single-date ``recommend`` calls for the same pair answer
+        from it instead of fetching again.
+        """
+        logger.info("best_travel_day_request_started", destination=destination_name)
+
+        destination = self.district_service.get_district_by_name(destination_name)
+        if not destination:
+            logger.warning("destination_not_found", name=destination_name)
+            return {
+                "recommendation": "Not Recommended",
+                "reason": f"Destination '{destination_name}' not found in our database."
             }
-        }
\ No newline at end of file
+
+        current = self._resolve_current_location(current_lat, current_lon)
+        verdicts = self._day_verdicts(current, destination)
+        if not verdicts or not verdicts["days"]:
+            return {
+                "recommendation": "Not Recommended",
+                "reason": f"Weather data unavailable for your current location or {destination_name} in the forecast window."
+            }
+
+        best_day = min(verdicts["days"], key=lambda day: (*self._benefit(day), day["travel_date"]))
+
+        logger.info(
+            "best_travel_day_completed",
+            destination=destination_name,
+            travel_date=best_day["travel_date"],
+            recommendation=best_day["recommendation"]
+        )
+
+        return {
+            "destination": destination["name"],
+            "best_day": best_day,
+            "days": verdicts["days"],
+        }
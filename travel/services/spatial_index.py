@@ -0,0 +1,82 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class DistrictSpatialIndex:
+    """
+    Bucket map over district coordinates for nearest-district lookups.
+
+    Districts are hashed into square lat/lon buckets; a query only measures
+    haversine distance to districts in the buckets its search radius can
+    reach. ``buckets`` maps "row:col" to normalized district names and is
+    plain data, so it is built once with the district index and cached
+    alongside it.
+    """
+
+    BUCKET_DEGREES = 0.5
+
+    def __init__(self, buckets: Dict[str, List[str]], districts: Dict[str, Dict[str, Any]]):
+        self.buckets = buckets
+        self.districts = districts
+
+    @staticmethod
+    def _coordinates(district: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+        try:
+            return float(district["lat"]), float(district["long"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def _cell(cls, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / cls.BUCKET_DEGREES), math.floor(lon / cls.BUCKET_DEGREES)
+
+    @classmethod
+    def build(cls, districts: Dict[str, Dict[str, Any]]) -> "DistrictSpatialIndex":
+        buckets: Dict[str, List[str]] = {}
+
+        for name, district in districts.items():
+            coordinates = cls._coordinates(district)
+            if coordinates is None:
+                continue
+            row, col = cls._cell(*coordinates)
+            buckets.setdefault(f"{row}:{col}", []).append(name)
+
+        return cls(buckets, districts)
+
+    def _candidates(self, lat: float, lon: float, radius_km: float):
+        row, col = self._cell(lat, lon)
+        row_span = math.ceil(radius_km / (self.BUCKET_DEGREES * KM_PER_DEGREE))
+        # A degree of longitude shrinks with latitude; floor the cosine to keep the span finite near the poles
+        col_span = math.ceil(radius_km / (self.BUCKET_DEGREES * KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01)))
+
+        for r in range(row - row_span, row + row_span + 1):
+            for c in range(col - col_span, col + col_span + 1):
+                yield from self.buckets.get(f"{r}:{c}", ())
+
+    def nearest(self, lat: float, lon: float, radius_km: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return the closest district within ``radius_km`` and its distance in km, or None."""
+        best = None
+
+        for name in self._candidates(lat, lon, radius_km):
+            district = self.districts.get(name)
+            coordinates = self._coordinates(district) if district else None
+            if coordinates is None:
+                continue
+
+            distance = haversine_km(lat, lon, *coordinates)
+            if distance <= radius_km and (best is None or distance < best[1]):
+                best = (district, distance)
+
+        return best
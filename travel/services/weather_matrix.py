@@ -0,0 +1,195 @@
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+from structlog import get_logger
+
+from travel.services.district_metrics import DistrictMetrics
+
+logger = get_logger(__name__)
+
+
+class DistrictWeatherMatrix:
+    """
+    Districts × days × metrics array of daily 14:00 readings.
+
+    ``values[row, day, metric]`` is the reading of district ``names[row]`` on
+    ``start_date + day`` for ``METRICS[metric]``; a missing sample is NaN.
+    ``rows`` maps a district name to its row, so a point lookup is two dict
+    hits and one array index, and column reductions over every district are
+    single numpy calls. A matrix is never modified after it is built: it is
+    shared read-only between the threads of a worker, and updates build a
+    new one.
+    """
+
+    METRICS = ("temperature", "pm25", "pm10")
+    TEMPERATURE, PM25, PM10 = range(len(METRICS))
+
+    def __init__(self, start_date: date, names: List[str], values: np.ndarray, fetched_at: np.ndarray, version: Any):
+        self.start_date = start_date
+        self.names = names
+        self.rows = {name: row for row, name in enumerate(names)}
+        self.values = values
+        self.fetched_at = fetched_at
+        self.version = version
+        self.built_at = time.monotonic()
+
+        self.values.setflags(write=False)
+        self.fetched_at.setflags(write=False)
+
+    @property
+    def days(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def dates(self) -> List[date]:
+        return [self.start_date + timedelta(days=day) for day in range(self.days)]
+
+    @classmethod
+    def build(
+            cls,
+            records: Dict[str, DistrictMetrics],
+            version: Any,
+            previous: Optional["DistrictWeatherMatrix"] = None
+    ) -> "DistrictWeatherMatrix":
+        """
+        Lay ``records`` out as a matrix.
+
+        Rows of ``previous`` whose record has the same ``fetched_at`` and
+        still fits the new day axis are copied over as a block instead of
+        being rebuilt from the record.
+        """
+        names = sorted(records)
+        if not names:
+            return cls(date.today(), [], np.full((0, 0, len(cls.METRICS)), np.nan), np.zeros(0), version)
+
+        start_date = min(record.start_date for record in records.values())
+        days = max((record.start_date - start_date).days + len(record.temperatures) for record in records.values())
+
+        values = np.full((len(names), days, len(cls.METRICS)), np.nan)
+        fetched_at = np.array([records[name].fetched_at for name in names], dtype=np.float64)
+
+        reused = 0
+        for row, name in enumerate(names):
+            if previous is not None and previous._copy_row(name, fetched_at[row], start_date, values[row]):
+                reused += 1
+                continue
+
+            record = records[name]
+            offset = (record.start_date - start_date).days
+            series = np.array([record.temperatures, record.pm25, record.pm10], dtype=np.float64).T
+            values[row, offset:offset + len(series)] = series
+
+        logger.info("weather_matrix_built", districts=len(names), days=days, reused_rows=reused)
+        return cls(start_date, names, values, fetched_at, version)
+
+    def _copy_row(self, name: str, fetched_at: float, start_date: date, target: np.ndarray) -> bool:
+        row = self.rows.get(name)
+        if row is None or self.fetched_at[row] != fetched_at:
+            return False
+
+        offset = (self.start_date - start_date).days
+        if offset < 0 or offset + self.days > len(target):
+            return False
+
+        target[offset:offset + self.days] = self.values[row]
+        return True
+
+    def day_index(self, day: date) -> Optional[int]:
+        index = (day - self.start_date).days
+        if 0 <= index < self.days:
+            return index
+        return None
+
+    def value(self, name: str, day: date, metric: int) -> Optional[float]:
+        row = self.rows.get(name)
+        index = self.day_index(day)
+        if row is None or index is None:
+            return None
+
+        value = self.values[row, index, metric]
+        return None if np.isnan(value) else float(value)
+
+    def is_fresh(self, name: str, max_age: float) -> bool:
+        row = self.rows.get(name)
+        return row is not None and time.time() - self.fetched_at[row] <= max_age
+
+    def averages(self, first_day: Optional[date] = None, last_day: Optional[date] = None) -> np.ndarray:
+        """
+        Per-district mean of every metric over ``first_day..last_day``
+        (default: every day), skipping missing samples.
+
+        Returns:
+            An array of shape (districts, metrics); NaN where a district has
+            no sample of a metric in the window
+        """
+        start = 0 if first_day is None else max((first_day - self.start_date).days, 0)
+        stop = self.days if last_day is None else min((last_day - self.start_date).days + 1, self.days)
+
+        window = self.values[:, start:max(start, stop)]
+        present = ~np.isnan(window)
+        counts = present.sum(axis=1)
+        totals = np.where(present, window, 0.0).sum(axis=1)
+
+        means = np.full(counts.shape, np.nan)
+        np.divide(totals, counts, out=means, where=counts > 0)
+        return means
+
+
+class SharedWeatherMatrix:
+    """
+    The worker's current ``DistrictWeatherMatrix``.
+
+    A matrix is served only for the weather data version it was built from
+    and for at most LOCAL_CACHE_TTL, the same bounds as the two-tier cache.
+    Without a version (nothing written yet, or the key was flushed) nothing
+    is kept, and callers read Redis as before.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matrix: Optional[DistrictWeatherMatrix] = None
+
+    def current(self, version: Any) -> Optional[DistrictWeatherMatrix]:
+        matrix = self._matrix
+        if (
+            matrix is None
+            or version is None
+            or matrix.version != version
+            or time.monotonic() - matrix.built_at > settings.LOCAL_CACHE_TTL
+        ):
+            return None
+        return matrix
+
+    def update(self, version: Any, records: Dict[str, DistrictMetrics]) -> DistrictWeatherMatrix:
+        """Build a matrix for ``version`` from ``records``, reusing unchanged rows of the current one."""
+        matrix = DistrictWeatherMatrix.build(records, version, previous=self._matrix)
+
+        if version is not None and records:
+            with self._lock:
+                # Two threads may race to rebuild; keep whichever is for the newer version
+                if self._matrix is None or self._matrix.version is None or self._matrix.version <= version:
+                    self._matrix = matrix
+
+        return matrix
+
+    def get(self, version: Any, load: Callable[[], Dict[str, DistrictMetrics]]) -> Optional[DistrictWeatherMatrix]:
+        """The matrix for ``version``, rebuilt from ``load()`` when the current one is outdated."""
+        if version is None:
+            return None
+
+        matrix = self.current(version)
+        if matrix is not None:
+            return matrix
+
+        return self.update(version, load())
+
+    def reset(self):
+        with self._lock:
+            self._matrix = None
+
+
+district_weather_matrix = SharedWeatherMatrix()
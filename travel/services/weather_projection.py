@@ -0,0 +1,102 @@
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class WeatherProjection:
+    """
+    The slice of Open-Meteo data a caller actually reads.
+
+    A projection turns into the smallest upstream query that can answer it:
+    only the listed variables, and ``start_hour``/``end_hour`` when a single
+    day is asked for. Open-Meteo can't pick one hour out of every day, so a
+    multi-day projection with ``hours`` sends the same query as one without
+    and only the cached payload shrinks once the answer is trimmed to those
+    hours. Each projection is cached under its own key, so reduced payloads
+    never shadow the full one.
+    """
+
+    forecast_variables: Tuple[str, ...]
+    air_quality_variables: Tuple[str, ...]
+    hours: Optional[Tuple[int, ...]] = None
+    day: Optional[date] = None
+
+    @property
+    def forecast_hourly(self) -> str:
+        return ",".join(self.forecast_variables)
+
+    @property
+    def air_quality_hourly(self) -> str:
+        return ",".join(self.air_quality_variables)
+
+    @property
+    def cache_suffix(self) -> str:
+        if self == FULL_PROJECTION:
+            # The full payload keeps the original, unsuffixed key
+            return ""
+
+        parts = [self.forecast_hourly, self.air_quality_hourly]
+        if self.hours is not None:
+            parts.append("h" + "+".join(str(hour) for hour in self.hours))
+        if self.day is not None:
+            parts.append(self.day.isoformat())
+        return ":" + ":".join(parts)
+
+    def for_day(self, day: date) -> "WeatherProjection":
+        return replace(self, day=day)
+
+    def window_params(self, forecast_days: int) -> Dict[str, Any]:
+        if self.day is None:
+            return {"forecast_days": forecast_days}
+
+        first_hour = min(self.hours) if self.hours else 0
+        last_hour = max(self.hours) if self.hours else 23
+        return {
+            "start_hour": f"{self.day.isoformat()}T{first_hour:02d}:00",
+            "end_hour": f"{self.day.isoformat()}T{last_hour:02d}:00",
+        }
+
+    def covers(self, other: "WeatherProjection") -> bool:
+        """True when data cached for this projection can answer ``other``."""
+        return (
+            set(other.forecast_variables) <= set(self.forecast_variables)
+            and set(other.air_quality_variables) <= set(self.air_quality_variables)
+            and (self.hours is None or (other.hours is not None and set(other.hours) <= set(self.hours)))
+            and (self.day is None or self.day == other.day)
+        )
+
+    def trim(self, payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Drop hourly samples outside ``hours`` from an Open-Meteo payload."""
+        if payload is None or self.hours is None:
+            return payload
+
+        hourly = payload.get("hourly")
+        if not isinstance(hourly, dict):
+            return payload
+
+        times = hourly.get("time", [])
+        # Open-Meteo hourly timestamps look like "2024-01-15T14:00"
+        keep = [i for i, t in enumerate(times) if int(t[11:13]) in self.hours]
+
+        trimmed_hourly = {
+            name: [values[i] for i in keep if i < len(values)] if isinstance(values, list) else values
+            for name, values in hourly.items()
+        }
+        return {**payload, "hourly": trimmed_hourly}
+
+
+FULL_PROJECTION = WeatherProjection(
+    forecast_variables=("temperature_2m",),
+    air_quality_variables=("pm2_5", "pm10"),
+)
+
+# Everything the rankings, recommendations and weather matrix read: 14:00 temperature, PM2.5 and PM10.
+# Its upstream query matches FULL_PROJECTION's; the saving is the cached payload, about 1/24 of the full one.
+MIDDAY_PROJECTION = WeatherProjection(
+    forecast_variables=("temperature_2m",),
+    air_quality_variables=("pm2_5", "pm10"),
+    hours=(14,),
+)
+
+SHARED_PROJECTIONS = (MIDDAY_PROJECTION, FULL_PROJECTION)
@@ -1,113 +1,957 @@
+import asyncio
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
+import httpx
+from asgiref.sync import async_to_sync, sync_to_async
 from rest_framework import status
 from structlog import get_logger
 from django.core.cache import cache
 from django.conf import settings
 
+from travel.services.district_metrics import DistrictMetrics
+from travel.services.location_grid import GridCell
+from travel.services.weather_snapshots import weather_snapshots
+from travel.services.weather_projection import WeatherProjection, FULL_PROJECTION, MIDDAY_PROJECTION, SHARED_PROJECTIONS
+from travel_recommender.services.background_refresh import background_refresher
+from travel_recommender.services.concurrent_calls import run_concurrently
 from travel_recommender.services.external_api_request_response import ExternalApiService
-from travel_recommender.utils import multi_urljoin
+from travel_recommender.services.freshness import record_freshness
+from travel_recommender.services.single_flight import single_flight
+from travel_recommender.utils import multi_urljoin, chunked
 
 logger = get_logger(__name__)
 
+# Bumped whenever whole-window weather is written; derived data compares against it
+WEATHER_DATA_VERSION_KEY = "weather_data_version"
+# Points at the last complete set of metric records published by a refresh
+WEATHER_GENERATION_KEY = "weather_generation"
+WEATHER_GENERATION_SEQUENCE_KEY = "weather_generation:sequence"
+
 
 class WeatherService:
     CACHE_KEY_TEMPLATE = "weather:{district_name}"
+    METRICS_KEY_TEMPLATE = "metrics:{district_name}"
+    GENERATION_METRICS_KEY_TEMPLATE = "metrics:g{generation}:{district_name}"
+    TIMEZONE = "Asia/Dhaka"
+    FORECAST_DAYS = 7
+    FORECAST_HOURLY = "temperature_2m"
+    AIR_QUALITY_HOURLY = "pm2_5,pm10"
 
     def __init__(self):
         self.api_service = ExternalApiService()
         self.forecast_base_url = settings.OPEN_METEO_BASE_URL
         self.air_quality_base_url = settings.OPEN_METEO_AIR_QUALITY_BASE_URL
         self.cache_ttl = settings.WEATHER_CACHE_TTL
+        self.stale_ttl = settings.WEATHER_CACHE_STALE_TTL
+        self.batch_size = settings.WEATHER_BATCH_SIZE
+        self.async_fetch = settings.WEATHER_ASYNC_FETCH
+        self.async_concurrency = settings.WEATHER_ASYNC_CONCURRENCY
+        self.concurrent_fetch = settings.CONCURRENT_UPSTREAM_FETCH
+        self.upstream_deadline = settings.UPSTREAM_DEADLINE
+        self.partial_ttl = settings.WEATHER_PARTIAL_CACHE_TTL
+        self.snapshots_enabled = settings.WEATHER_SNAPSHOTS_ENABLED
+        self.snapshot_max_age = settings.WEATHER_SNAPSHOT_MAX_AGE
+        self.generation_min_completeness = settings.WEATHER_GENERATION_MIN_COMPLETENESS
+        self._generation: Optional[int] = None
+        self._generation_resolved = False
 
-    def get_forecast(self, *, district_name: str, lat: float, lon: float) -> Optional[Dict[str, Any]]:
-        url = multi_urljoin(self.forecast_base_url, "forecast")
-        params = {
+    def _build_params(
+            self,
+            *,
+            lat: Any,
+            lon: Any,
+            hourly: str,
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> Dict[str, Any]:
+        return {
             "latitude": lat,
             "longitude": lon,
-            "hourly": "temperature_2m",
-            "timezone": "Asia/Dhaka",
-            "forecast_days": 7,
+            "hourly": hourly,
+            "timezone": self.TIMEZONE,
+            **projection.window_params(self.FORECAST_DAYS),
         }
 
+    def get_forecast(
+            self,
+            *,
+            district_name: str,
+            lat: float,
+            lon: float,
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> Optional[Dict[str, Any]]:
+        url = multi_urljoin(self.forecast_base_url, "forecast")
+        params = self._build_params(lat=lat, lon=lon, hourly=projection.forecast_hourly, projection=projection)
+
         logger.info("fetching_forecast_from_api", district=district_name)
         response = self.api_service.handle_get(url=url, params=params)
 
+        return projection.trim(self._payload_or_none(response, event="failed_fetching_forecast", district_name=district_name))
+
+    def get_air_quality(
+            self,
+            *,
+            district_name: str,
+            lat: float,
+            lon: float,
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> Dict[str, Any] | None:
+        url = multi_urljoin(self.air_quality_base_url, "air-quality")
+        params = self._build_params(lat=lat, lon=lon, hourly=projection.air_quality_hourly, projection=projection)
+
+        logger.info("fetching_air_quality_from_api", district=district_name)
+        response = self.api_service.handle_get(url=url, params=params)
+
+        return projection.trim(
+            self._payload_or_none(response, event="failed_fetching_air_quality", district_name=district_name)
+        )
+
+    async def async_get_forecast(
+            self,
+            *,
+            district_name: str,
+            lat: float,
+            lon: float,
+            client: Optional[httpx.AsyncClient] = None,
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> Optional[Dict[str, Any]]:
+        url = multi_urljoin(self.forecast_base_url, "forecast")
+        params = self._build_params(lat=lat, lon=lon, hourly=projection.forecast_hourly, projection=projection)
+
+        logger.info("fetching_forecast_from_api", district=district_name, is_async=True)
+        response = await self.api_service.async_handle_get(url=url, params=params, client=client)
+
+        return projection.trim(self._payload_or_none(response, event="failed_fetching_forecast", district_name=district_name))
+
+    async def async_get_air_quality(
+            self,
+            *,
+            district_name: str,
+            lat: float,
+            lon: float,
+            client: Optional[httpx.AsyncClient] = None,
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> Dict[str, Any] | None:
+        url = multi_urljoin(self.air_quality_base_url, "air-quality")
+        params = self._build_params(lat=lat, lon=lon, hourly=projection.air_quality_hourly, projection=projection)
+
+        logger.info("fetching_air_quality_from_api", district=district_name, is_async=True)
+        response = await self.api_service.async_handle_get(url=url, params=params, client=client)
+
+        return projection.trim(
+            self._payload_or_none(response, event="failed_fetching_air_quality", district_name=district_name)
+        )
+
+    @staticmethod
+    def _payload_or_none(response, *, event: str, district_name: str) -> Dict[str, Any] | None:
         if response.status_code != status.HTTP_200_OK or not isinstance(response.data, dict):
-            logger.error("failed_fetching_forecast", district=district_name, status=response.status_code)
+            logger.error(event, district=district_name, status=response.status_code)
             return None
 
         return response.data
 
-    def get_air_quality(self, *, district_name: str, lat: float, lon: float) -> Dict[str, Any] | None:
+    def _get_multi_location(
+            self,
+            *,
+            url: str,
+            hourly: str,
+            districts: List[Dict[str, Any]],
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> List[Dict[str, Any] | None]:
+        """
+        Fetch one Open-Meteo endpoint for several locations in a single call.
+
+        Open-Meteo accepts comma-separated coordinate lists and answers with a
+        list of per-location results in request order (a single location is
+        answered with a plain object).
+
+        Returns:
+            One payload (or None) per district, aligned with ``districts``
+        """
+        names = [d["name"] for d in districts]
+        params = self._build_params(
+            lat=",".join(str(float(d["lat"])) for d in districts),
+            lon=",".join(str(float(d["long"])) for d in districts),
+            hourly=hourly,
+            projection=projection,
+        )
+
+        logger.info("fetching_multi_location_from_api", url=url, count=len(districts))
+        response = self.api_service.handle_get(url=url, params=params)
+
+        data = response.data
+        if response.status_code == status.HTTP_200_OK and isinstance(data, dict):
+            data = [data]
+
+        if response.status_code != status.HTTP_200_OK or not isinstance(data, list) or len(data) != len(districts):
+            logger.error(
+                "failed_fetching_multi_location",
+                url=url,
+                districts=names,
+                status=response.status_code,
+            )
+            return [None] * len(districts)
+
+        return [projection.trim(item) if isinstance(item, dict) else None for item in data]
+
+    def get_forecast_batch(
+            self,
+            *,
+            districts: List[Dict[str, Any]],
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> List[Dict[str, Any] | None]:
+        url = multi_urljoin(self.forecast_base_url, "forecast")
+        return self._get_multi_location(url=url, hourly=projection.forecast_hourly, districts=districts, projection=projection)
+
+    def get_air_quality_batch(
+            self,
+            *,
+            districts: List[Dict[str, Any]],
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> List[Dict[str, Any] | None]:
         url = multi_urljoin(self.air_quality_base_url, "air-quality")
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "hourly": "pm2_5,pm10",
-            "timezone": "Asia/Dhaka",
-            "forecast_days": 7,
+        return self._get_multi_location(
+            url=url,
+            hourly=projection.air_quality_hourly,
+            districts=districts,
+            projection=projection
+        )
+
+    @staticmethod
+    def _build_entry(
+            district_name: str,
+            forecast: Dict[str, Any] | None,
+            air_quality: Dict[str, Any] | None
+    ) -> Dict[str, Any] | None:
+        if forecast is None and air_quality is None:
+            logger.warning("no_weather_data_fetched", district=district_name)
+            return None
+
+        return {
+            "district_name": district_name,
+            "forecast": forecast,
+            "air_quality": air_quality,
+            "fetched_at": time.time(),
         }
 
-        logger.info("fetching_air_quality_from_api", district=district_name)
-        response = self.api_service.handle_get(url=url, params=params)
+    def _cache_key(self, district_name: str, projection: WeatherProjection) -> str:
+        return self.CACHE_KEY_TEMPLATE.format(district_name=district_name) + projection.cache_suffix
 
-        if response.status_code != status.HTTP_200_OK or not isinstance(response.data, dict):
-            logger.error("failed_fetching_air_quality", district=district_name, status=response.status_code)
+    def _candidate_keys(self, district_name: str, projection: WeatherProjection) -> Dict[str, WeatherProjection]:
+        # The projection's own key first, then any shared (wider) entry that can also answer it
+        candidates = {self._cache_key(district_name, projection): projection}
+        for shared in SHARED_PROJECTIONS:
+            if shared != projection and shared.covers(projection):
+                candidates.setdefault(self._cache_key(district_name, shared), shared)
+        return candidates
+
+    def _read_cached(
+            self,
+            district_name: str,
+            projection: WeatherProjection
+    ) -> Tuple[Dict[str, Any] | None, WeatherProjection]:
+        candidates = self._candidate_keys(district_name, projection)
+        if len(candidates) == 1:
+            return cache.get(next(iter(candidates))), projection
+
+        found = cache.get_many(list(candidates))
+        return self._first_found(found, candidates, projection)
+
+    async def _async_read_cached(
+            self,
+            district_name: str,
+            projection: WeatherProjection
+    ) -> Tuple[Dict[str, Any] | None, WeatherProjection]:
+        candidates = self._candidate_keys(district_name, projection)
+        if len(candidates) == 1:
+            return await cache.aget(next(iter(candidates))), projection
+
+        found = await cache.aget_many(list(candidates))
+        return self._first_found(found, candidates, projection)
+
+    @staticmethod
+    def _first_found(
+            found: Dict[str, Any],
+            candidates: Dict[str, WeatherProjection],
+            projection: WeatherProjection
+    ) -> Tuple[Dict[str, Any] | None, WeatherProjection]:
+        for key, candidate in candidates.items():
+            if found.get(key) is not None:
+                return found[key], candidate
+        return None, projection
+
+    def _cache_timeout(self) -> int:
+        # Entries are fresh for cache_ttl, then served stale while a refresh runs until the hard expiry
+        return self.cache_ttl + self.stale_ttl
+
+    @staticmethod
+    def _is_partial(data: Dict[str, Any]) -> bool:
+        return data["forecast"] is None or data["air_quality"] is None
+
+    def _entry_timeout(self, data: Dict[str, Any]) -> int:
+        # A half that failed or missed the upstream deadline is retried soon rather than served for hours
+        return self.partial_ttl if self._is_partial(data) else self._cache_timeout()
+
+    def _is_stale(self, fetched_at: Optional[float]) -> bool:
+        return fetched_at is not None and time.time() - fetched_at > self.cache_ttl
+
+    def _refresh_if_stale(self, fetched_at: Optional[float], district: Dict[str, Any], projection: WeatherProjection):
+        district_name = district["name"]
+
+        if self._is_stale(fetched_at):
+            logger.info("weather_cache_stale", district=district_name, fetched_at=fetched_at)
+            background_refresher.schedule(
+                self._cache_key(district_name, projection),
+                lambda: self._fetch_and_cache_weather(
+                    district_name, float(district["lat"]), float(district["long"]), projection
+                ),
+            )
+
+        record_freshness(fetched_at, self.cache_ttl)
+
+    def _accept_cached(
+            self,
+            cached: Dict[str, Any],
+            district: Dict[str, Any],
+            projection: WeatherProjection
+    ) -> Dict[str, Any]:
+        self._refresh_if_stale(cached.get("fetched_at"), district, projection)
+        return cached
+
+    def _entries_to_store(
+            self,
+            district_name: str,
+            projection: WeatherProjection,
+            data: Dict[str, Any],
+            bump_version: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Cache entries for one district's payload. Batch writers pass
+        ``bump_version`` so the weather data version moves once per write,
+        not once per district refreshed in the background. A partial entry
+        gets no metric record.
+        """
+        entries = {self._cache_key(district_name, projection): data}
+
+        # Only a whole-window entry holds every daily 14:00 sample a metric record needs
+        if projection.day is None and projection.covers(MIDDAY_PROJECTION) and not self._is_partial(data):
+            metrics = DistrictMetrics.from_payloads(data["forecast"], data["air_quality"], data["fetched_at"])
+            if metrics is not None:
+                entries[self.METRICS_KEY_TEMPLATE.format(district_name=district_name)] = metrics.pack()
+                # Rankings and the weather matrix only cover districts; a user's grid cell doesn't outdate them
+                if bump_version and not GridCell.is_cell_name(district_name):
+                    entries[WEATHER_DATA_VERSION_KEY] = time.time()
+
+        return entries
+
+    def _store(self, district_name: str, projection: WeatherProjection, data: Dict[str, Any]):
+        cache.set_many(self._entries_to_store(district_name, projection, data), timeout=self._entry_timeout(data))
+        if self.snapshots_enabled and not self._is_partial(data):
+            weather_snapshots.record({self._cache_key(district_name, projection): data})
+
+    def _rehydrate(
+            self,
+            districts: List[Dict[str, Any]],
+            projection: WeatherProjection,
+            refresh_stale: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Refill cache misses from durable snapshots no older than
+        WEATHER_SNAPSHOT_MAX_AGE: one query and one pipelined write.
+        ``refresh_stale`` leaves stale snapshots to the upstream fetch.
+
+        Returns:
+            (restored entries, districts still to fetch from upstream)
+        """
+        if not self.snapshots_enabled or not districts:
+            return [], districts
+
+        candidates = {d["name"]: self._candidate_keys(d["name"], projection) for d in districts}
+        found = weather_snapshots.load([key for keys in candidates.values() for key in keys], self.snapshot_max_age)
+
+        restored, misses, to_store = [], [], {}
+        for district in districts:
+            data, snapshot_projection = self._first_found(found, candidates[district["name"]], projection)
+            if data is None or (refresh_stale and self._is_stale(data.get("fetched_at"))):
+                misses.append(district)
+                continue
+
+            to_store.update(self._entries_to_store(district["name"], snapshot_projection, data, bump_version=True))
+            # Old snapshots come back stale and are refreshed in the background
+            restored.append(self._accept_cached(data, district, snapshot_projection))
+
+        if to_store:
+            cache.set_many(to_store, timeout=self._cache_timeout())
+            logger.info("weather_rehydrated_from_snapshots", restored=len(restored), missing=len(misses))
+
+        return restored, misses
+
+    def _shared_projection_for_key(self, district_name: str, key: str) -> Optional[WeatherProjection]:
+        for shared in SHARED_PROJECTIONS:
+            if key == self._cache_key(district_name, shared):
+                return shared
+        return None
+
+    def restore_snapshots(self, *, overwrite: bool = False) -> Dict[str, int]:
+        """
+        Bulk-load every fresh-enough snapshot into the cache, e.g. at deploy time.
+
+        Keys already cached are left alone unless ``overwrite`` is set.
+        """
+        counts = {"restored": 0, "skipped": 0}
+
+        for chunk in weather_snapshots.iter_fresh(self.snapshot_max_age):
+            existing = set() if overwrite else set(cache.get_many([s.cache_key for s in chunk]))
+
+            to_store = {}
+            for snapshot in chunk:
+                if snapshot.cache_key in existing:
+                    counts["skipped"] += 1
+                    continue
+
+                projection = self._shared_projection_for_key(snapshot.district_name, snapshot.cache_key)
+                if projection is None:
+                    to_store[snapshot.cache_key] = snapshot.payload
+                else:
+                    to_store.update(
+                        self._entries_to_store(snapshot.district_name, projection, snapshot.payload, bump_version=True)
+                    )
+                counts["restored"] += 1
+
+            if to_store:
+                cache.set_many(to_store, timeout=self._cache_timeout())
+
+        logger.info("weather_snapshots_restored", **counts)
+        return counts
+
+    @classmethod
+    def _unpack_metrics(cls, packed: Any) -> Optional[DistrictMetrics]:
+        if not isinstance(packed, bytes):
             return None
+        return DistrictMetrics.unpack(packed)
 
-        return response.data
+    @staticmethod
+    def _records_for(entries: List[Dict[str, Any]]) -> List[Optional[DistrictMetrics]]:
+        missing = [data for data in entries if data.get("metrics") is None]
+        built = iter(DistrictMetrics.from_payloads_batch(
+            [(data.get("forecast"), data.get("air_quality"), data.get("fetched_at")) for data in missing]
+        ))
+        return [data["metrics"] if data.get("metrics") is not None else next(built) for data in entries]
+
+    def current_generation(self) -> Optional[int]:
+        """The published generation, resolved once per service instance (i.e. per request)."""
+        if not self._generation_resolved:
+            self._generation = cache.get(WEATHER_GENERATION_KEY)
+            self._generation_resolved = True
+        return self._generation
+
+    def _metrics_keys(self, district_name: str) -> List[str]:
+        # The published generation's record first, then the live one written by every fetch
+        live_key = self.METRICS_KEY_TEMPLATE.format(district_name=district_name)
+
+        generation = self.current_generation()
+        if generation is None:
+            return [live_key]
+        return [self.GENERATION_METRICS_KEY_TEMPLATE.format(generation=generation, district_name=district_name), live_key]
+
+    def _pick_metrics(self, found: Dict[str, Any], keys: List[str]) -> Optional[DistrictMetrics]:
+        records = [self._unpack_metrics(found.get(key)) for key in keys]
+        if len(records) == 1:
+            return records[0]
+
+        generational, live = records
+        if generational is None:
+            # Districts missing from the generation (failed in that refresh) use the live record
+            return live
+
+        # A newer live record only replaces the consistent view once the generation has gone stale
+        if live is not None and live.fetched_at > generational.fetched_at and self._is_stale(generational.fetched_at):
+            return live
+        return generational
+
+    def publish_generation(self, entries: List[Dict[str, Any]], expected: int) -> Optional[int]:
+        """
+        Write metric records for ``entries`` as a new generation, then flip
+        the pointer to it.
+
+        Readers see either the previous generation or the new one in full,
+        never a mix. A refresh that produced fewer than
+        WEATHER_GENERATION_MIN_COMPLETENESS of ``expected`` districts is not
+        published. Superseded generations are never deleted; they expire with
+        the weather TTL.
+        """
+        records = {
+            data["district_name"]: metrics.pack()
+            for data, metrics in zip(entries, self._records_for(entries))
+            if metrics is not None
+        }
+
+        if not records or len(records) < expected * self.generation_min_completeness:
+            logger.warning("weather_generation_incomplete", records=len(records), expected=expected)
+            return None
+
+        cache.add(WEATHER_GENERATION_SEQUENCE_KEY, 0, timeout=None)
+        generation = cache.incr(WEATHER_GENERATION_SEQUENCE_KEY)
+
+        cache.set_many(
+            {
+                self.GENERATION_METRICS_KEY_TEMPLATE.format(generation=generation, district_name=name): packed
+                for name, packed in records.items()
+            },
+            timeout=self._cache_timeout(),
+        )
+        # The flip is a single SET, so every reader switches at once
+        cache.set(WEATHER_GENERATION_KEY, generation, timeout=None)
+        cache.set(WEATHER_DATA_VERSION_KEY, time.time(), timeout=self._cache_timeout())
+
+        self._generation, self._generation_resolved = generation, True
+        logger.info("weather_generation_published", generation=generation, records=len(records), expected=expected)
+        return generation
+
+    def get_district_metrics(self, *, district: Dict[str, Any]) -> Optional[DistrictMetrics]:
+        """
+        The district's compact metric record, or None when it is not cached.
 
-    def get_weather_for_district(self, *, district: Dict[str, Any]) -> Dict[str, Any] | None:
+        Never calls the upstream: callers fall back to ``get_weather_for_district``.
+        """
+        district_name = district.get("name")
+        if not district_name:
+            return None
+
+        keys = self._metrics_keys(district_name)
+        found = {keys[0]: cache.get(keys[0])} if len(keys) == 1 else cache.get_many(keys)
+        metrics = self._pick_metrics(found, keys)
+        if metrics is None:
+            return None
+
+        logger.info("weather_metrics_cache_hit", district=district_name)
+        self._refresh_if_stale(metrics.fetched_at, district, MIDDAY_PROJECTION)
+        return metrics
+
+    def read_metrics(self, districts: List[Dict[str, Any]]) -> Dict[str, DistrictMetrics]:
+        """
+        Cached metric records by district name, read with a single ``get_many``.
+
+        Never calls the upstream and never schedules refreshes; districts
+        without a record are left out.
+        """
+        keys = {d["name"]: self._metrics_keys(d["name"]) for d in districts if d.get("name")}
+        found = cache.get_many([key for district_keys in keys.values() for key in district_keys])
+
+        records = {}
+        for district_name, district_keys in keys.items():
+            metrics = self._pick_metrics(found, district_keys)
+            if metrics is not None:
+                records[district_name] = metrics
+        return records
+
+    def batch_get_metrics(self, districts: List[Dict[str, Any]], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Metric records for many districts, read with a single ``get_many``
+        from the published generation (falling back to live records).
+
+        Returns:
+            ``{"district_name", "metrics"}`` per district with a cached record,
+            plus raw ``batch_get_weather`` entries for the rest
+        """
+        records = self.read_metrics(districts)
+
+        results = []
+        misses = []
+        for district in districts:
+            metrics = records.get(district.get("name"))
+            if metrics is None:
+                if district.get("name"):
+                    misses.append(district)
+                continue
+
+            self._refresh_if_stale(metrics.fetched_at, district, MIDDAY_PROJECTION)
+            results.append({"district_name": district["name"], "metrics": metrics})
+
+        if misses:
+            fetched = self.batch_get_weather(misses, max_workers=max_workers, projection=MIDDAY_PROJECTION)
+            # Raw entries keep their payloads and gain a record built in one vectorized pass
+            for data, metrics in zip(fetched, self._records_for(fetched)):
+                results.append(data if metrics is None else {**data, "metrics": metrics})
+
+        logger.info("batch_metrics_fetch_completed", total=len(districts), from_records=len(districts) - len(misses))
+        return results
+
+    def get_weather_for_district(
+            self,
+            *,
+            district: Dict[str, Any],
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> Dict[str, Any] | None:
+        """
+        Weather for one district, reduced to ``projection``.
+
+        A cached entry of a wider shared projection answers a narrower one
+        directly; on a miss only the projected data is fetched and cached.
+        """
         district_name = district.get("name")
         lat, lon = district.get("lat"), district.get("long")
         if not district_name or lat is None or lon is None:
             logger.warning("district_missing_data", district=district_name)
             return None
 
-        cache_key = self.CACHE_KEY_TEMPLATE.format(district_name=district_name)
-
-        cached = cache.get(cache_key)
+        cached, cached_projection = self._read_cached(district_name, projection)
         if cached is not None:
             logger.info("weather_cache_hit", district=district_name)
-            return cached
+            return self._accept_cached(cached, district, cached_projection)
 
-        forecast = self.get_forecast(district_name=district_name, lat=float(lat), lon=float(lon))
-        air_quality = self.get_air_quality(district_name=district_name, lat=float(lat), lon=float(lon))
+        cache_key = self._cache_key(district_name, projection)
+        data = single_flight.fetch(
+            cache_key,
+            load=lambda: self._rehydrate_or_fetch(district, projection),
+            read_cached=lambda: cache.get(cache_key),
+        )
 
-        if forecast is None and air_quality is None:
-            logger.warning("no_weather_data_fetched", district=district_name)
+        if data is not None:
+            record_freshness(data.get("fetched_at"), self.cache_ttl)
+
+        return data
+
+    def _fetch_weather(
+            self,
+            district_name: str,
+            lat: float,
+            lon: float,
+            projection: WeatherProjection
+    ) -> Dict[str, Any] | None:
+        query = {"district_name": district_name, "lat": lat, "lon": lon, "projection": projection}
+
+        if self.concurrent_fetch:
+            fetched = run_concurrently(
+                {
+                    "forecast": lambda: self.get_forecast(**query),
+                    "air_quality": lambda: self.get_air_quality(**query),
+                },
+                timeout=self.upstream_deadline,
+            )
+            forecast, air_quality = fetched["forecast"], fetched["air_quality"]
+        else:
+            forecast = self.get_forecast(**query)
+            air_quality = self.get_air_quality(**query)
+
+        return self._build_entry(district_name, forecast, air_quality)
+
+    def _rehydrate_or_fetch(self, district: Dict[str, Any], projection: WeatherProjection) -> Dict[str, Any] | None:
+        restored, _ = self._rehydrate([district], projection)
+        if restored:
+            return restored[0]
+
+        return self._fetch_and_cache_weather(district["name"], float(district["lat"]), float(district["long"]), projection)
+
+    def _fetch_and_cache_weather(
+            self,
+            district_name: str,
+            lat: float,
+            lon: float,
+            projection: WeatherProjection
+    ) -> Dict[str, Any] | None:
+        data = self._fetch_weather(district_name, lat, lon, projection)
+        if data is None:
             return None
 
-        data = {
-            "district_name": district_name,
-            "forecast": forecast,
-            "air_quality": air_quality,
-        }
+        self._store(district_name, projection, data)
+        logger.info("weather_cached", district=district_name)
 
-        cache.set(cache_key, data, timeout=self.cache_ttl)
+        return data
+
+    async def _async_fetch_weather(
+            self,
+            district: Dict[str, Any],
+            client: Optional[httpx.AsyncClient],
+            projection: WeatherProjection
+    ) -> Dict[str, Any] | None:
+        district_name = district["name"]
+        lat, lon = float(district["lat"]), float(district["long"])
+
+        forecast, air_quality = await asyncio.gather(
+            self.async_get_forecast(district_name=district_name, lat=lat, lon=lon, client=client, projection=projection),
+            self.async_get_air_quality(district_name=district_name, lat=lat, lon=lon, client=client, projection=projection),
+        )
+
+        return self._build_entry(district_name, forecast, air_quality)
+
+    async def async_get_weather_for_district(
+            self,
+            *,
+            district: Dict[str, Any],
+            client: Optional[httpx.AsyncClient] = None,
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> Dict[str, Any] | None:
+        district_name = district.get("name")
+        lat, lon = district.get("lat"), district.get("long")
+        if not district_name or lat is None or lon is None:
+            logger.warning("district_missing_data", district=district_name)
+            return None
+
+        cached, cached_projection = await self._async_read_cached(district_name, projection)
+        if cached is not None:
+            logger.info("weather_cache_hit", district=district_name)
+            return self._accept_cached(cached, district, cached_projection)
+
+        if self.snapshots_enabled:
+            restored, _ = await sync_to_async(self._rehydrate)([district], projection)
+            if restored:
+                return restored[0]
+
+        data = await self._async_fetch_weather(district, client, projection)
+        if data is None:
+            return None
+
+        await cache.aset_many(self._entries_to_store(district_name, projection, data), timeout=self._entry_timeout(data))
+        if self.snapshots_enabled and not self._is_partial(data):
+            await sync_to_async(weather_snapshots.record)({self._cache_key(district_name, projection): data})
         logger.info("weather_cached", district=district_name)
 
         return data
 
-    def batch_get_weather(self, districts: List[Dict[str, Any]], max_workers: int = 8) -> List[Dict[str, Any]]:
-        results = []
+    def _bulk_read(
+            self,
+            districts: List[Dict[str, Any]],
+            projection: WeatherProjection,
+            refresh_stale: bool
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Look up every district's entry with a single ``get_many`` round trip.
+
+        Returns:
+            (cached entries, districts to fetch from upstream)
+        """
+        candidates = {d["name"]: self._candidate_keys(d["name"], projection) for d in districts}
+        found = cache.get_many([key for keys in candidates.values() for key in keys])
+
+        hits, misses = [], []
+        for district in districts:
+            cached, cached_projection = self._first_found(found, candidates[district["name"]], projection)
+
+            if cached is None or (refresh_stale and self._is_stale(cached.get("fetched_at"))):
+                misses.append(district)
+            else:
+                hits.append(self._accept_cached(cached, district, cached_projection))
+
+        return hits, misses
+
+    def _store_many(self, projection: WeatherProjection, entries: List[Dict[str, Any]]):
+        # django-redis writes set_many through one pipeline
+        complete = [data for data in entries if not self._is_partial(data)]
+        partial = [data for data in entries if self._is_partial(data)]
+
+        to_store = {}
+        for data in complete:
+            to_store.update(self._entries_to_store(data["district_name"], projection, data, bump_version=True))
+
+        if to_store:
+            cache.set_many(to_store, timeout=self._cache_timeout())
+        if partial:
+            cache.set_many(
+                {self._cache_key(data["district_name"], projection): data for data in partial},
+                timeout=self.partial_ttl
+            )
+
+        if self.snapshots_enabled:
+            weather_snapshots.record({self._cache_key(data["district_name"], projection): data for data in complete})
+
+    def batch_get_weather(
+            self,
+            districts: List[Dict[str, Any]],
+            max_workers: int = 8,
+            projection: WeatherProjection = FULL_PROJECTION,
+            refresh_stale: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Weather for many districts: one bulk cache read, upstream calls for
+        the misses only, and one pipelined write of everything fetched.
+
+        ``refresh_stale`` treats stale entries as misses, for the refresh task.
+        """
+        results, _ = self._batch_get_weather(districts, max_workers, projection, refresh_stale)
+        return results
+
+    def warm(
+            self,
+            districts: List[Dict[str, Any]],
+            max_workers: int = 8,
+            projection: WeatherProjection = MIDDAY_PROJECTION
+    ) -> Dict[str, int]:
+        """
+        Make sure every district has a fresh entry, fetching only what is
+        missing or stale.
+
+        Returns:
+            counts of ``hits`` (already fresh), ``restored`` (from snapshots),
+            ``fetched`` and ``failed`` districts, and the published ``generation``
+        """
+        results, stats = self._batch_get_weather(districts, max_workers, projection, refresh_stale=True)
+
+        if stats["fetched"] or stats["restored"] or self.current_generation() is None:
+            stats["generation"] = self.publish_generation(results, expected=len(districts))
+        else:
+            stats["generation"] = self.current_generation()
+        return stats
+
+    def _batch_get_weather(
+            self,
+            districts: List[Dict[str, Any]],
+            max_workers: int,
+            projection: WeatherProjection,
+            refresh_stale: bool
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        valid = []
+        for district in districts:
+            if not district.get("name") or district.get("lat") is None or district.get("long") is None:
+                logger.warning("district_missing_data", district=district.get("name"))
+                continue
+            valid.append(district)
+
+        results, misses = self._bulk_read(valid, projection, refresh_stale)
+        hits = len(results)
+
+        restored, misses = self._rehydrate(misses, projection, refresh_stale)
+        results.extend(restored)
 
+        fetched = []
+        if misses:
+            if self.batch_size > 0:
+                fetched = self._fetch_multi_location(misses, max_workers=max_workers, projection=projection)
+            elif self.async_fetch:
+                fetched = async_to_sync(self._async_fetch_many)(misses, projection=projection)
+            else:
+                fetched = self._fetch_many_threaded(misses, max_workers=max_workers, projection=projection)
+
+            self._store_many(projection, fetched)
+            for data in fetched:
+                record_freshness(data["fetched_at"], self.cache_ttl)
+
+        results.extend(fetched)
+
+        logger.info(
+            "batch_weather_fetch_completed",
+            total=len(districts),
+            successful=len(results),
+            cache_hits=len(valid) - len(misses),
+            fetched=len(fetched),
+        )
+        return results, {
+            "hits": hits,
+            "restored": len(restored),
+            "fetched": len(fetched),
+            "failed": len(districts) - len(valid) + len(misses) - len(fetched),
+        }
+
+    def _fetch_many_threaded(
+            self,
+            districts: List[Dict[str, Any]],
+            max_workers: int,
+            projection: WeatherProjection
+    ) -> List[Dict[str, Any]]:
+        # No single-flight here: entries are only written by _store_many after the whole batch,
+        # so a follower would have nothing to read until then
         def fetch_single(d):
             try:
-                return self.get_weather_for_district(district=d)
+                return self._fetch_weather(d["name"], float(d["lat"]), float(d["long"]), projection)
             except Exception as e:
-                logger.error("weather_fetch_exception", district=d.get("name"), error=str(e))
+                logger.error("weather_fetch_exception", district=d["name"], error=str(e))
                 return None
 
+        results = []
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_district = {executor.submit(fetch_single, d): d for d in districts}
+            futures = [executor.submit(fetch_single, d) for d in districts]
 
-            for future in as_completed(future_to_district):
+            for future in as_completed(futures):
                 res = future.result()
                 if res:
                     results.append(res)
 
-        logger.info("batch_weather_fetch_completed", total=len(districts), successful=len(results))
+        return results
+
+    def _fetch_multi_location(
+            self,
+            districts: List[Dict[str, Any]],
+            max_workers: int,
+            projection: WeatherProjection
+    ) -> List[Dict[str, Any]]:
+        results = []
+        chunks = chunked(districts, self.batch_size)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            forecast_futures = [
+                executor.submit(self.get_forecast_batch, districts=chunk, projection=projection) for chunk in chunks
+            ]
+            air_quality_futures = [
+                executor.submit(self.get_air_quality_batch, districts=chunk, projection=projection) for chunk in chunks
+            ]
+
+            for chunk, forecast_future, air_quality_future in zip(chunks, forecast_futures, air_quality_futures):
+                for district, forecast, air_quality in zip(chunk, forecast_future.result(), air_quality_future.result()):
+                    data = self._build_entry(district["name"], forecast, air_quality)
+                    if data is not None:
+                        results.append(data)
+
+        logger.info(
+            "multi_location_fetch_completed",
+            total=len(districts),
+            successful=len(results),
+            upstream_calls=len(chunks) * 2
+        )
+        return results
+
+    async def _async_gather_bounded(
+            self,
+            districts: List[Dict[str, Any]],
+            fetch,
+            max_concurrency: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(max_concurrency or self.async_concurrency)
+
+        async with self.api_service.build_async_client() as client:
+            async def fetch_single(d):
+                async with semaphore:
+                    try:
+                        return await fetch(d, client)
+                    except Exception as e:
+                        logger.error("weather_fetch_exception", district=d.get("name"), error=str(e))
+                        return None
+
+            fetched = await asyncio.gather(*(fetch_single(d) for d in districts))
+
+        return [res for res in fetched if res]
+
+    async def _async_fetch_many(
+            self,
+            districts: List[Dict[str, Any]],
+            projection: WeatherProjection,
+            max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._async_gather_bounded(
+            districts,
+            lambda d, client: self._async_fetch_weather(d, client, projection),
+            max_concurrency,
+        )
+
+    async def async_batch_get_weather(
+            self,
+            districts: List[Dict[str, Any]],
+            max_concurrency: Optional[int] = None,
+            projection: WeatherProjection = FULL_PROJECTION
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch weather for all districts on one event loop.
+
+        A semaphore bounds how many districts are in flight at once and every
+        request shares one async connection pool.
+        """
+        results = await self._async_gather_bounded(
+            districts,
+            lambda d, client: self.async_get_weather_for_district(district=d, client=client, projection=projection),
+            max_concurrency,
+        )
+        for res in results:
+            record_freshness(res.get("fetched_at"), self.cache_ttl)
+
+        logger.info("batch_weather_fetch_completed", total=len(districts), successful=len(results), is_async=True)
         return results
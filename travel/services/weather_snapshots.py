@@ -0,0 +1,78 @@
+import time
+from typing import Any, Dict, Iterator, List
+
+from django.db import DatabaseError
+from structlog import get_logger
+
+from travel.models import WeatherSnapshot
+
+logger = get_logger(__name__)
+
+
+class WeatherSnapshotStore:
+    """
+    Durable copy of fetched weather entries in the Django database.
+
+    One row per cache key holds the newest fetch. Database errors are logged
+    and swallowed: snapshots speed up recovery but must never fail a request.
+    """
+
+    def record(self, entries: Dict[str, Dict[str, Any]]):
+        """Upsert ``{cache_key: weather entry}`` in one statement."""
+        if not entries:
+            return
+
+        snapshots = [
+            WeatherSnapshot(
+                cache_key=key,
+                district_name=data["district_name"],
+                payload=data,
+                fetched_at=data["fetched_at"],
+            )
+            for key, data in entries.items()
+        ]
+
+        try:
+            WeatherSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=["cache_key"],
+                update_fields=["district_name", "payload", "fetched_at"],
+            )
+        except DatabaseError as e:
+            logger.error("weather_snapshot_write_failed", count=len(snapshots), error=str(e))
+
+    def load(self, keys: List[str], max_age: float) -> Dict[str, Dict[str, Any]]:
+        """Entries for ``keys`` fetched within the last ``max_age`` seconds."""
+        if not keys:
+            return {}
+
+        try:
+            rows = WeatherSnapshot.objects.filter(
+                cache_key__in=keys,
+                fetched_at__gte=time.time() - max_age,
+            ).values_list("cache_key", "payload")
+            return dict(rows)
+        except DatabaseError as e:
+            logger.error("weather_snapshot_read_failed", count=len(keys), error=str(e))
+            return {}
+
+    def iter_fresh(self, max_age: float, chunk_size: int = 500) -> Iterator[List[WeatherSnapshot]]:
+        """Every snapshot fetched within ``max_age`` seconds, in chunks."""
+        queryset = WeatherSnapshot.objects.filter(fetched_at__gte=time.time() - max_age).order_by("pk")
+
+        chunk = []
+        for snapshot in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(snapshot)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def prune(self, max_age: float) -> int:
+        deleted, _ = WeatherSnapshot.objects.filter(fetched_at__lt=time.time() - max_age).delete()
+        return deleted
+
+
+weather_snapshots = WeatherSnapshotStore()
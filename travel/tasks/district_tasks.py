@@ -11,7 +11,7 @@ def update_districts_task():
 
     try:
         service = DistrictService()
-        districts = service.get_all_districts()
+        districts = service.refresh()
         logger.info("update_districts_task_completed", count=len(districts))
         return {"status": "success", "count": len(districts)}
     except Exception as e:
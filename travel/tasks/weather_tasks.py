@@ -1,7 +1,11 @@
 from celery import shared_task
 from structlog import get_logger
+from travel.services.weather_projection import MIDDAY_PROJECTION
 from travel.services.weather_service import WeatherService
+from travel.services.best_districts_service import BestDistrictsService
 from travel.services.district_service import DistrictService
+from travel_recommender.services.http_session import http_session_pool
+from travel_recommender.services.latency_tracker import latency_tracker
 
 logger = get_logger(__name__)
 
@@ -16,14 +20,25 @@ def update_weather_task():
         districts = district_service.get_all_districts()
         logger.info("weather_update_fetching_districts", total=len(districts))
 
-        updated_count = 0
-
-        for district in districts:
-            data = weather_service.get_weather_for_district(district=district)
-            if data:
-                updated_count += 1
-
-        logger.info("update_weather_task_completed", updated=updated_count, total=len(districts))
+        # One bulk read, upstream calls for missing or stale districts, one pipelined write
+        weather_data = weather_service.batch_get_weather(districts, projection=MIDDAY_PROJECTION, refresh_stale=True)
+        updated_count = len(weather_data)
+
+        # Readers switch to the refreshed set in one step, or keep the last complete one
+        generation = weather_service.publish_generation(weather_data, expected=len(districts))
+
+        # Materialize the ranking while the freshly written records are hot
+        ranking = BestDistrictsService().rebuild_ranking()
+
+        logger.info(
+            "update_weather_task_completed",
+            updated=updated_count,
+            total=len(districts),
+            ranked=len(ranking["districts"]),
+            generation=generation,
+            connection_stats=http_session_pool.get_stats(),
+            latency_percentiles=latency_tracker.snapshot(),
+        )
 
         return {"status": "success", "updated": updated_count, "total": len(districts)}
     except Exception as e:
@@ -0,0 +1,78 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class StubHTTPServer:
+    """
+    Local keep-alive HTTP server for exercising the real client stack in tests.
+
+    ``routes`` maps a path to a callable taking the parsed query string and the
+    request headers and returning ``(status_code, body)`` or
+    ``(status_code, body, headers)``; ``delay`` adds latency to every response.
+    """
+
+    def __init__(self, routes, delay: float = 0.0):
+        stub = self
+        self.routes = routes
+        self.delay = delay
+        self.request_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+
+                    parsed = urlparse(self.path)
+                    route = stub.routes.get(parsed.path)
+                    result = route(parse_qs(parsed.query), self.headers) if route else (404, {"error": "not found"})
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+                status_code, body, *extra_headers = result
+                payload = json.dumps(body).encode() if body is not None else b""
+
+                self.send_response(status_code)
+                for name, value in (extra_headers[0] if extra_headers else {}).items():
+                    self.send_header(name, value)
+                if status_code != 304:
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        # Clients that time out on purpose close the socket mid-response
+        self.server.handle_error = lambda request, client_address: None
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
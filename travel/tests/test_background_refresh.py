@@ -0,0 +1,47 @@
+import threading
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from travel_recommender.services.background_refresh import BackgroundRefresher
+
+
+class BackgroundRefresherTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.refresher = BackgroundRefresher(max_workers=2)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_one_refresh_per_key(self):
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(1)
+
+        self.assertTrue(self.refresher.schedule("key", refresh))
+        self.assertFalse(self.refresher.schedule("key", refresh))
+
+        release.set()
+        self.refresher._get_executor().shutdown(wait=True)
+
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(cache.get("refresh:key"))
+
+    def test_skips_when_another_worker_is_refreshing(self):
+        cache.add("refresh:key", "other-worker", timeout=30)
+
+        self.assertFalse(self.refresher.schedule("key", lambda: None))
+
+    def test_failed_refresh_releases_the_key(self):
+        def refresh():
+            raise ValueError("upstream down")
+
+        self.refresher.schedule("key", refresh)
+        self.refresher._get_executor().shutdown(wait=True)
+
+        self.assertIsNone(cache.get("refresh:key"))
+        self.assertNotIn("key", self.refresher._pending)
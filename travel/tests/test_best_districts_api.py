@@ -23,6 +23,7 @@ class BestDistrictsAPIViewTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 2)
         self.assertEqual(len(response.data["results"]), 2)
+        self.assertIn("data_age_seconds", response.data["freshness"])
 
     def test_get_best_districts_default_limit(self):
         with patch('travel.views.best_districts_view.BestDistrictsService') as mock_service:
@@ -40,4 +41,15 @@ class BestDistrictsAPIViewTest(TestCase):
     def test_get_best_districts_limit_too_high(self):
         response = self.client.get(self.url, {"limit": 100})
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_best_districts_passes_ranking_options(self):
+        with patch('travel.views.best_districts_view.BestDistrictsService') as mock_service:
+            mock_service.return_value.get_best_districts.return_value = []
+
+            response = self.client.get(self.url, {"limit": 3, "order": "weighted", "pm25_weight": 2, "max_pm25": 40})
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            mock_service.return_value.get_best_districts.assert_called_with(
+                limit=3, order="weighted", pm25_weight=2.0, max_pm25=40.0
+            )
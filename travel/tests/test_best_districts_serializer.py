@@ -1,3 +1,5 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
 
 from travel.serializers.best_districts_serializer import BestDistrictsSerializer
@@ -24,4 +26,41 @@ class BestDistrictsSerializerTest(TestCase):
     def test_limit_too_high(self):
         """Test limit above maximum"""
         serializer = BestDistrictsSerializer(data={"limit": 100})
-        self.assertFalse(serializer.is_valid())
\ No newline at end of file
+        self.assertFalse(serializer.is_valid())
+
+    def test_ranking_options_are_optional(self):
+        serializer = BestDistrictsSerializer(data={})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data, {"limit": 10})
+
+    def test_weighted_ranking_options(self):
+        serializer = BestDistrictsSerializer(data={"order": "weighted", "temp_weight": 1, "pm25_weight": 0.5, "max_pm25": 35})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data["pm25_weight"], 0.5)
+
+    def test_weights_require_weighted_order(self):
+        serializer = BestDistrictsSerializer(data={"temp_weight": 2})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("temp_weight", serializer.errors)
+
+    def test_unknown_order(self):
+        serializer = BestDistrictsSerializer(data={"order": "random"})
+        self.assertFalse(serializer.is_valid())
+
+    def test_date_window(self):
+        today = date.today()
+        serializer = BestDistrictsSerializer(data={
+            "start_date": today + timedelta(days=1),
+            "end_date": today + timedelta(days=3),
+        })
+        self.assertTrue(serializer.is_valid())
+
+        serializer = BestDistrictsSerializer(data={
+            "start_date": today + timedelta(days=3),
+            "end_date": today + timedelta(days=1),
+        })
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("end_date", serializer.errors)
+
+        serializer = BestDistrictsSerializer(data={"start_date": today - timedelta(days=1)})
+        self.assertFalse(serializer.is_valid())
@@ -1,11 +1,24 @@
+import threading
+import time
+from datetime import date
+
+from django.core.cache import cache
 from django.test import TestCase
 from unittest.mock import patch
 
 from travel.services.best_districts_service import BestDistrictsService
+from travel.services.district_metrics import DistrictMetrics
+from travel.services.ranking_engine import ranking_engine
+from travel.services.weather_matrix import district_weather_matrix
+from travel.services.weather_service import WEATHER_DATA_VERSION_KEY
+from travel_recommender.services.single_flight import single_flight
 
 
 class BestDistrictsServiceTest(TestCase):
     def setUp(self):
+        cache.clear()
+        district_weather_matrix.reset()
+        ranking_engine.reset()
         self.service = BestDistrictsService()
         self.mock_weather_data = [
             {
@@ -94,6 +107,18 @@ class BestDistrictsServiceTest(TestCase):
         self.assertIn("avg_pm25", metrics)
         self.assertEqual(metrics["avg_temp"], 20.0)
 
+    def test_extract_metrics_from_record(self):
+        record = DistrictMetrics(
+            start_date=date(2024, 1, 1),
+            temperatures=(20.0, None, 22.0),
+            pm25=(30.0, 32.0, 34.0),
+            fetched_at=0,
+        )
+
+        metrics = self.service._extract_metrics({"district_name": "Sylhet", "metrics": record})
+
+        self.assertEqual(metrics, {"avg_temp": 21.0, "avg_pm25": 32.0})
+
     def test_extract_metrics_missing_data(self):
         weather = {"district_name": "Test", "forecast": None, "air_quality": None}
 
@@ -109,7 +134,7 @@ class BestDistrictsServiceTest(TestCase):
             {"name": "Dhaka"}, {"name": "Sylhet"}
         ]
 
-        mock_weather_service.return_value.batch_get_weather.return_value = self.mock_weather_data
+        mock_weather_service.return_value.batch_get_metrics.return_value = self.mock_weather_data
 
         def extract_side_effect(weather):
             district_name = weather.get("district_name", "")
@@ -136,7 +161,7 @@ class BestDistrictsServiceTest(TestCase):
         mock_district_service.return_value.get_all_districts.return_value = [
             {"name": "District1"}, {"name": "District2"}
         ]
-        mock_weather_service.return_value.batch_get_weather.return_value = [
+        mock_weather_service.return_value.batch_get_metrics.return_value = [
             {"district_name": "District1"}, {"district_name": "District2"}
         ]
 
@@ -156,3 +181,118 @@ class BestDistrictsServiceTest(TestCase):
 
         results = service.get_best_districts(limit=2)
         self.assertEqual(results[0]["district"], "District1")
+
+    def _records(self, temps):
+        return [
+            {
+                "district_name": name,
+                "metrics": DistrictMetrics(
+                    start_date=date(2024, 1, 1), temperatures=(temp,), pm25=(40.0,), fetched_at=time.time()
+                ),
+            }
+            for name, temp in temps.items()
+        ]
+
+    @patch('travel.services.best_districts_service.WeatherService')
+    @patch('travel.services.best_districts_service.DistrictService')
+    def test_ranking_is_materialized_and_sliced(self, mock_district_service, mock_weather_service):
+        mock_weather_service.return_value.batch_get_metrics.return_value = self._records(
+            {"Dhaka": 30.0, "Sylhet": 20.0, "Khulna": 25.0}
+        )
+
+        first = BestDistrictsService().get_best_districts(limit=2)
+        second = BestDistrictsService().get_best_districts(limit=3)
+
+        self.assertEqual([r["district"] for r in first], ["Sylhet", "Khulna"])
+        self.assertEqual([r["district"] for r in second], ["Sylhet", "Khulna", "Dhaka"])
+        mock_weather_service.return_value.batch_get_metrics.assert_called_once()
+        self.assertEqual(len(cache.get(BestDistrictsService.RANKING_KEY)["districts"]), 3)
+
+    @patch('travel.services.best_districts_service.WeatherService')
+    @patch('travel.services.best_districts_service.DistrictService')
+    def test_ranking_older_than_weather_is_recomputed(self, mock_district_service, mock_weather_service):
+        mock_weather_service.return_value.batch_get_metrics.return_value = self._records({"Dhaka": 30.0})
+        BestDistrictsService().rebuild_ranking()
+
+        cache.set(WEATHER_DATA_VERSION_KEY, time.time() + 1)
+        mock_weather_service.return_value.batch_get_metrics.return_value = self._records({"Dhaka": 30.0, "Sylhet": 20.0})
+
+        results = BestDistrictsService().get_best_districts(limit=5)
+
+        self.assertEqual([r["district"] for r in results], ["Sylhet", "Dhaka"])
+        self.assertEqual(mock_weather_service.return_value.batch_get_metrics.call_count, 2)
+
+    @patch('travel.services.best_districts_service.WeatherService')
+    @patch('travel.services.best_districts_service.DistrictService')
+    def test_cold_ranking_is_current_after_its_own_fetch(self, mock_district_service, mock_weather_service):
+        records = self._records({"Dhaka": 30.0, "Sylhet": 20.0})
+
+        def fetch_misses(districts):
+            # Writing the fetched misses back bumps the weather version
+            cache.set(WEATHER_DATA_VERSION_KEY, time.time())
+            return records
+
+        mock_weather_service.return_value.batch_get_metrics.side_effect = fetch_misses
+
+        BestDistrictsService().get_best_districts(limit=2)
+        results = BestDistrictsService().get_best_districts(limit=2)
+
+        self.assertEqual([r["district"] for r in results], ["Sylhet", "Dhaka"])
+        mock_weather_service.return_value.batch_get_metrics.assert_called_once()
+
+    @patch('travel.services.best_districts_service.WeatherService')
+    @patch('travel.services.best_districts_service.DistrictService')
+    def test_empty_ranking_is_stored_briefly(self, mock_district_service, mock_weather_service):
+        mock_weather_service.return_value.batch_get_metrics.return_value = []
+
+        with self.settings(WEATHER_PARTIAL_CACHE_TTL=60):
+            self.assertEqual(BestDistrictsService().get_best_districts(), [])
+
+        self.assertEqual(cache.get(BestDistrictsService.RANKING_KEY)["districts"], [])
+        self.assertLessEqual(cache.ttl(BestDistrictsService.RANKING_KEY), 60)
+
+    @patch('travel.services.best_districts_service.WeatherService')
+    @patch('travel.services.best_districts_service.DistrictService')
+    def test_follower_during_empty_rebuild_reads_the_leaders_ranking(self, mock_district_service, mock_weather_service):
+        mock_weather_service.return_value.batch_get_metrics.return_value = []
+        # Another worker holds the lease and publishes an empty ranking shortly
+        cache.add(single_flight.LEASE_KEY_TEMPLATE.format(key=BestDistrictsService.RANKING_KEY), "other-worker")
+        leader = threading.Timer(0.2, BestDistrictsService().rebuild_ranking)
+
+        with self.settings(SINGLE_FLIGHT_WAIT=5):
+            leader.start()
+            started = time.monotonic()
+            results = BestDistrictsService().get_best_districts()
+            leader.join()
+
+        self.assertEqual(results, [])
+        self.assertLess(time.monotonic() - started, 2)
+        mock_weather_service.return_value.batch_get_metrics.assert_called_once()
+
+    @patch('travel.services.best_districts_service.WeatherService')
+    @patch('travel.services.best_districts_service.DistrictService')
+    def test_empty_ranking_is_rebuilt_by_ensure_ranking(self, mock_district_service, mock_weather_service):
+        mock_weather_service.return_value.batch_get_metrics.return_value = []
+        BestDistrictsService().rebuild_ranking()
+
+        _, current = BestDistrictsService().ensure_ranking()
+
+        self.assertFalse(current)
+        self.assertEqual(mock_weather_service.return_value.batch_get_metrics.call_count, 2)
+
+    @patch('travel.services.best_districts_service.WeatherService')
+    @patch('travel.services.best_districts_service.DistrictService')
+    def test_ranking_query_is_served_from_the_matrix(self, mock_district_service, mock_weather_service):
+        cache.set(WEATHER_DATA_VERSION_KEY, 1.0)
+        mock_weather_service.return_value.batch_get_metrics.return_value = self._records(
+            {"Dhaka": 30.0, "Sylhet": 20.0, "Khulna": 25.0}
+        )
+
+        first = BestDistrictsService().get_best_districts(limit=2, max_temp=26.0, order="weighted")
+        second = BestDistrictsService().get_best_districts(limit=2, max_temp=26.0, order="weighted")
+
+        self.assertEqual([r["district"] for r in first], ["Sylhet", "Khulna"])
+        self.assertEqual(first[0]["score"], 60.0)
+        self.assertIs(first, second)
+        mock_weather_service.return_value.batch_get_metrics.assert_called_once()
+        self.assertIsNone(cache.get(BestDistrictsService.RANKING_KEY))
@@ -0,0 +1,78 @@
+import pickle
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from travel_recommender.services.cache_serializer import PayloadCodec, lz4_frame
+
+PAYLOAD = {
+    "district_name": "Dhaka",
+    "forecast": {"hourly": {"time": ["2025-01-01T14:00"] * 200, "temperature_2m": [21.5] * 200}},
+    "air_quality": None,
+    "fetched_at": 1735732800.5,
+}
+
+
+class PayloadCodecTest(TestCase):
+    def _codecs(self):
+        compressions = ["none", "zlib"] + (["lz4"] if lz4_frame is not None else [])
+        for serializer in ("pickle", "json", "msgpack"):
+            for compression in compressions:
+                yield PayloadCodec(serializer=serializer, compression=compression, compress_min_bytes=64)
+
+    def test_round_trip(self):
+        for codec in self._codecs():
+            with self.subTest(serializer=codec.serializer, compression=codec.compression):
+                encoded = codec.encode(PAYLOAD)
+
+                self.assertEqual(encoded[0], PayloadCodec.FORMAT_VERSION)
+                self.assertEqual(codec.decode(encoded), PAYLOAD)
+
+    def test_small_values_are_not_compressed(self):
+        codec = PayloadCodec(serializer="msgpack", compression="zlib", compress_min_bytes=1024)
+
+        small = codec.encode({"open_until": 1.0})
+        large = codec.encode(PAYLOAD)
+
+        self.assertEqual(small[2], PayloadCodec.COMPRESSIONS["none"])
+        self.assertEqual(large[2], PayloadCodec.COMPRESSIONS["zlib"])
+
+    def test_entries_decode_regardless_of_reader_settings(self):
+        writer = PayloadCodec(serializer="json", compression="zlib", compress_min_bytes=0)
+        reader = PayloadCodec(serializer="msgpack", compression="none")
+
+        self.assertEqual(reader.decode(writer.encode(PAYLOAD)), PAYLOAD)
+
+    def test_legacy_pickle_entries_are_read(self):
+        codec = PayloadCodec()
+
+        self.assertEqual(codec.decode(pickle.dumps(PAYLOAD, protocol=pickle.DEFAULT_PROTOCOL)), PAYLOAD)
+
+    def test_unknown_format_version_is_a_miss(self):
+        codec = PayloadCodec()
+        encoded = codec.encode(PAYLOAD)
+
+        self.assertIsNone(codec.decode(bytes((PayloadCodec.FORMAT_VERSION + 1,)) + encoded[1:]))
+
+    def test_corrupt_entry_is_a_miss(self):
+        codec = PayloadCodec(serializer="msgpack", compression="zlib", compress_min_bytes=0)
+        encoded = codec.encode(PAYLOAD)
+
+        self.assertIsNone(codec.decode(encoded[:3] + b"not zlib"))
+
+    def test_unsupported_values_fall_back_to_pickle(self):
+        codec = PayloadCodec(serializer="json", compression="none")
+        value = {"raw": b"\x01\x02", "when": {1, 2}}
+
+        encoded = codec.encode(value)
+
+        self.assertEqual(encoded[1], PayloadCodec.SERIALIZERS["pickle"])
+        self.assertEqual(codec.decode(encoded), value)
+
+    def test_benchmark_command_runs(self):
+        out = StringIO()
+
+        call_command("benchmark_cache_codec", iterations=1, stdout=out)
+
+        self.assertIn("msgpack+zlib", out.getvalue())
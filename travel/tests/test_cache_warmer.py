@@ -0,0 +1,71 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+
+from travel.services.cache_warmer import CacheWarmer
+from travel.services.weather_service import WeatherService
+from travel.tests.weather_fixtures import weather_entry
+
+DISTRICTS = [
+    {"id": "1", "name": "Dhaka", "lat": "23.8103", "long": "90.4125"},
+    {"id": "2", "name": "Chittagong", "lat": "22.3569", "long": "91.7832"},
+    {"id": "3", "name": "Sylhet", "lat": "24.8949", "long": "91.8687"},
+]
+
+
+class CacheWarmerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        response = MagicMock()
+        response.status_code = status.HTTP_200_OK
+        response.data = {"districts": DISTRICTS}
+        response.headers = {}
+
+        api_patcher = patch('travel.services.district_service.ExternalApiService')
+        self.mock_api = api_patcher.start().return_value
+        self.mock_api.handle_get.return_value = response
+        self.addCleanup(api_patcher.stop)
+
+        fetch_patcher = patch.object(WeatherService, '_fetch_weather', side_effect=lambda name, *args: weather_entry(name))
+        self.mock_fetch = fetch_patcher.start()
+        self.addCleanup(fetch_patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_cold_cache_is_filled(self):
+        report = CacheWarmer().warm()
+
+        self.assertEqual(report["districts"]["hit"], False)
+        self.assertEqual(report["districts"]["count"], 3)
+        self.assertEqual(report["weather"]["fetched"], 3)
+        self.assertEqual(report["ranking"], {"hit": False, "count": 3, "seconds": report["ranking"]["seconds"]})
+
+    def test_second_run_skips_fresh_keys(self):
+        CacheWarmer().warm()
+        self.mock_api.handle_get.reset_mock()
+        self.mock_fetch.reset_mock()
+
+        report = CacheWarmer().warm()
+
+        self.assertTrue(report["districts"]["hit"])
+        self.assertEqual(report["weather"]["hits"], 3)
+        self.assertEqual(report["weather"]["fetched"], 0)
+        self.assertTrue(report["ranking"]["hit"])
+        self.mock_api.handle_get.assert_not_called()
+        self.mock_fetch.assert_not_called()
+
+    def test_command_reports_counts(self):
+        out = StringIO()
+
+        call_command("warm_cache", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("3 indexed", output)
+        self.assertIn("0 hits, 0 restored, 3 fetched, 0 failed", output)
+        self.assertIn("Cache warmed", output)
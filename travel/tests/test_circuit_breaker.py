@@ -0,0 +1,194 @@
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+from rest_framework import status
+
+from travel.tests.stub_http_server import StubHTTPServer
+from travel_recommender.services.circuit_breaker import circuit_breaker, CircuitPermit
+from travel_recommender.services.concurrency_limiter import AdaptiveConcurrencyLimiter, concurrency_limiters
+from travel_recommender.services.external_api_request_response import ExternalApiService
+
+
+@override_settings(
+    CIRCUIT_BREAKER_ENABLED=True,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD=3,
+    CIRCUIT_BREAKER_WINDOW=30,
+    CIRCUIT_BREAKER_OPEN_DURATION=30,
+)
+class CircuitBreakerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        concurrency_limiters.reset()
+        self.api_service = ExternalApiService()
+        self.healthy = False
+
+    def _route(self, query, headers):
+        if self.healthy:
+            return 200, {"ok": True}
+        return 500, {"error": "boom"}
+
+    def _expire_open_window(self, host):
+        key = circuit_breaker.STATE_KEY_TEMPLATE.format(host=host)
+        cache.set(key, {"open_until": time.time() - 1})
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        with StubHTTPServer({"/boom": self._route}) as server:
+            url = f"{server.base_url}/boom"
+            for _ in range(3):
+                self.assertEqual(self.api_service.handle_get(url=url).status_code, 500)
+
+            response = self.api_service.handle_get(url=url)
+
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertIn("Circuit open", response.error)
+            self.assertEqual(server.request_count, 3)
+
+    def test_successful_probe_closes_circuit(self):
+        with StubHTTPServer({"/boom": self._route}) as server:
+            url = f"{server.base_url}/boom"
+            host = url.split("/")[2]
+            for _ in range(3):
+                self.api_service.handle_get(url=url)
+
+            self._expire_open_window(host)
+            self.healthy = True
+
+            self.assertEqual(self.api_service.handle_get(url=url).status_code, 200)
+            self.assertEqual(self.api_service.handle_get(url=url).status_code, 200)
+            self.assertEqual(server.request_count, 5)
+
+    def test_failed_probe_reopens_circuit(self):
+        with StubHTTPServer({"/boom": self._route}) as server:
+            url = f"{server.base_url}/boom"
+            host = url.split("/")[2]
+            for _ in range(3):
+                self.api_service.handle_get(url=url)
+
+            self._expire_open_window(host)
+
+            self.assertEqual(self.api_service.handle_get(url=url).status_code, 500)
+            self.assertEqual(self.api_service.handle_get(url=url).status_code, 503)
+            self.assertEqual(server.request_count, 4)
+
+    def test_only_one_probe_while_half_open(self):
+        self._expire_open_window("upstream")
+
+        probe = circuit_breaker.acquire("upstream")
+
+        self.assertTrue(probe.is_probe)
+        self.assertIsNone(circuit_breaker.acquire("upstream"))
+
+        circuit_breaker.abandon(probe)
+        self.assertTrue(circuit_breaker.acquire("upstream").is_probe)
+
+    @override_settings(CONCURRENCY_LIMIT_INITIAL=1, CONCURRENCY_LIMIT_QUEUE_TIMEOUT=5)
+    def test_cancelled_async_request_gives_back_probe(self):
+        self._expire_open_window("upstream")
+        limiter = concurrency_limiters.get("upstream")
+        limiter.try_acquire()
+
+        async def cancel_while_queued():
+            task = asyncio.ensure_future(self.api_service.async_handle_get(url="http://upstream/forecast"))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            limiter.release(success=True, latency=0)
+            await asyncio.sleep(0.1)
+
+        async_to_sync(cancel_while_queued)()
+
+        self.assertTrue(circuit_breaker.acquire("upstream").is_probe)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_client_errors_do_not_count(self):
+        with StubHTTPServer({"/missing": lambda query, headers: (404, {"error": "nope"})}) as server:
+            url = f"{server.base_url}/missing"
+            for _ in range(5):
+                self.assertEqual(self.api_service.handle_get(url=url).status_code, 404)
+
+    @override_settings(CIRCUIT_BREAKER_ENABLED=False)
+    def test_disabled_breaker_always_permits(self):
+        host = "upstream"
+        for _ in range(5):
+            circuit_breaker.record(CircuitPermit(host=host), success=False, latency=0)
+
+        self.assertIsNotNone(circuit_breaker.acquire(host))
+
+
+@override_settings(
+    CONCURRENCY_LIMIT_INITIAL=4,
+    CONCURRENCY_LIMIT_MIN=1,
+    CONCURRENCY_LIMIT_MAX=8,
+    CIRCUIT_BREAKER_SLOW_CALL=1,
+)
+class AdaptiveConcurrencyLimiterTest(TestCase):
+    def test_rejects_over_limit(self):
+        limiter = AdaptiveConcurrencyLimiter("upstream")
+        for _ in range(4):
+            self.assertTrue(limiter.try_acquire())
+
+        self.assertFalse(limiter.try_acquire())
+        self.assertFalse(limiter.acquire(timeout=0.05))
+
+    def _freeze_clock(self):
+        self.clock = 1000.0
+        patcher = patch('travel_recommender.services.concurrency_limiter.time.monotonic', side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _advance(self, seconds):
+        self.clock += seconds
+
+    def test_failure_halves_and_success_grows_limit(self):
+        self._freeze_clock()
+        limiter = AdaptiveConcurrencyLimiter("upstream")
+
+        limiter.try_acquire()
+        limiter.release(success=False, latency=0.1)
+        self.assertEqual(limiter.limit, 2)
+
+        self._advance(10)
+        limiter.try_acquire()
+        limiter.release(success=True, latency=5)
+        self.assertEqual(limiter.limit, 1)
+
+        for _ in range(3):
+            limiter.try_acquire()
+            limiter.release(success=True, latency=0.1)
+        self.assertGreater(limiter.limit, 2)
+
+    def test_limit_stays_within_bounds(self):
+        self._freeze_clock()
+        limiter = AdaptiveConcurrencyLimiter("upstream")
+        for _ in range(200):
+            limiter.try_acquire()
+            limiter.release(success=True, latency=0.1)
+        self.assertEqual(limiter.limit, 8)
+
+        for _ in range(10):
+            self._advance(1)
+            limiter.try_acquire()
+            limiter.release(success=False, latency=0.1)
+        self.assertEqual(limiter.limit, 1)
+
+    def test_burst_of_failures_halves_once(self):
+        self._freeze_clock()
+        limiter = AdaptiveConcurrencyLimiter("upstream")
+        for _ in range(4):
+            limiter.try_acquire()
+
+        self._advance(0.5)
+        for _ in range(4):
+            limiter.release(success=False, latency=0.5)
+        self.assertEqual(limiter.limit, 2)
+
+        # A call sent after the decrease failing again is new evidence
+        limiter.try_acquire()
+        self._advance(0.2)
+        limiter.release(success=False, latency=0.2)
+        self.assertEqual(limiter.limit, 1)
@@ -0,0 +1,54 @@
+import time
+
+from django.test import TestCase
+
+from travel_recommender.services.concurrent_calls import run_concurrently
+
+
+class RunConcurrentlyTest(TestCase):
+    def test_calls_run_in_parallel(self):
+        started = time.monotonic()
+
+        results = run_concurrently(
+            {
+                "a": lambda: time.sleep(0.2) or "a",
+                "b": lambda: time.sleep(0.2) or "b",
+            },
+            timeout=1,
+        )
+
+        self.assertEqual(results, {"a": "a", "b": "b"})
+        self.assertLess(time.monotonic() - started, 0.35)
+
+    def test_deadline_returns_partial_results(self):
+        results = run_concurrently(
+            {
+                "fast": lambda: "fast",
+                "slow": lambda: time.sleep(0.5) or "slow",
+            },
+            timeout=0.1,
+        )
+
+        self.assertEqual(results, {"fast": "fast", "slow": None})
+
+    def test_exception_is_reported_as_none(self):
+        def boom():
+            raise ValueError("boom")
+
+        results = run_concurrently({"ok": lambda: 1, "boom": boom}, timeout=1)
+
+        self.assertEqual(results, {"ok": 1, "boom": None})
+
+    def test_nested_calls_share_the_outer_deadline(self):
+        inner_durations = []
+
+        def inner():
+            started = time.monotonic()
+            run_concurrently({"slow": lambda: time.sleep(0.5) or "slow"}, timeout=5)
+            inner_durations.append(time.monotonic() - started)
+
+        run_concurrently({"outer": inner}, timeout=0.2)
+        time.sleep(0.2)
+
+        self.assertEqual(len(inner_durations), 1)
+        self.assertLess(inner_durations[0], 0.35)
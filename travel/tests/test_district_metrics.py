@@ -0,0 +1,87 @@
+from datetime import date
+
+from django.test import TestCase
+
+from travel.services.district_metrics import DistrictMetrics
+
+
+class DistrictMetricsTest(TestCase):
+    def setUp(self):
+        self.forecast = {
+            "hourly": {
+                "time": ["2024-01-01T13:00", "2024-01-01T14:00", "2024-01-02T14:00", "2024-01-03T14:00"],
+                "temperature_2m": [24.0, 25.5, None, 27.25],
+            }
+        }
+        self.air_quality = {
+            "hourly": {
+                "time": ["2024-01-01T14:00", "2024-01-02T14:00", "2024-01-03T14:00"],
+                "pm2_5": [50.0, 55.5, 60.0],
+            }
+        }
+
+    def test_from_payloads_keeps_daily_2pm_samples(self):
+        record = DistrictMetrics.from_payloads(self.forecast, self.air_quality, fetched_at=100.0)
+
+        self.assertEqual(record.start_date, date(2024, 1, 1))
+        self.assertEqual(record.temperatures, (25.5, None, 27.25))
+        self.assertEqual(record.pm25, (50.0, 55.5, 60.0))
+        self.assertEqual(record.temperature_on(date(2024, 1, 3)), 27.25)
+        self.assertIsNone(record.temperature_on(date(2024, 1, 2)))
+        self.assertIsNone(record.pm25_on(date(2024, 1, 4)))
+
+    def test_pack_round_trip(self):
+        record = DistrictMetrics.from_payloads(self.forecast, self.air_quality, fetched_at=1700000000.5)
+
+        packed = record.pack()
+
+        self.assertIsInstance(packed, bytes)
+        self.assertEqual(DistrictMetrics.unpack(packed), record)
+
+    def test_unknown_version_is_rejected(self):
+        packed = DistrictMetrics.from_payloads(self.forecast, self.air_quality, fetched_at=0).pack()
+
+        self.assertIsNone(DistrictMetrics.unpack(b"\x09" + packed[1:]))
+
+    def test_pm10_is_carried_and_packed(self):
+        air_quality = {"hourly": {**self.air_quality["hourly"], "pm10": [80.0, None, 90.0]}}
+        record = DistrictMetrics.from_payloads(self.forecast, air_quality, fetched_at=0)
+
+        self.assertEqual(record.pm10, (80.0, None, 90.0))
+        self.assertEqual(DistrictMetrics.unpack(record.pack()).pm10_on(date(2024, 1, 3)), 90.0)
+
+    def test_version_1_record_is_read_without_pm10(self):
+        import struct
+
+        header = DistrictMetrics._HEADER.pack(1, date(2024, 1, 1).toordinal(), 5.0, 2)
+        packed = header + struct.pack("<4d", 20.0, 21.0, 40.0, 41.0)
+
+        record = DistrictMetrics.unpack(packed)
+
+        self.assertEqual(record.temperatures, (20.0, 21.0))
+        self.assertEqual(record.pm25, (40.0, 41.0))
+        self.assertEqual(record.pm10, (None, None))
+
+    def test_averages_skip_missing_samples(self):
+        record = DistrictMetrics.from_payloads(self.forecast, self.air_quality, fetched_at=0)
+
+        self.assertEqual(record.average_temperature(), (25.5 + 27.25) / 2)
+        self.assertEqual(record.average_pm25(), (50.0 + 55.5 + 60.0) / 3)
+
+    def test_no_samples(self):
+        self.assertIsNone(DistrictMetrics.from_payloads(None, {"hourly": {}}, fetched_at=0))
+
+    def test_batch_matches_single_records(self):
+        shifted_air = {"hourly": {"time": ["2023-12-31T14:00", "2024-01-01T14:00"], "pm2_5": [40.0, None]}}
+        payloads = [
+            (self.forecast, self.air_quality, 1.0),
+            (self.forecast, shifted_air, 2.0),
+            (None, None, 3.0),
+        ]
+
+        records = DistrictMetrics.from_payloads_batch(payloads)
+
+        self.assertEqual(records, [DistrictMetrics.from_payloads(*payload) for payload in payloads])
+        self.assertEqual(records[1].start_date, date(2023, 12, 31))
+        self.assertEqual(records[1].temperatures, (None, 25.5, None, 27.25))
+        self.assertEqual(records[1].pm25, (40.0, None, None, None))
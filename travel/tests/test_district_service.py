@@ -1,6 +1,8 @@
+import time
+
 from django.test import TestCase
 from django.core.cache import cache
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 from rest_framework import status
 
 from travel.services.district_service import DistrictService
@@ -123,4 +125,100 @@ class DistrictServiceTest(TestCase):
         districts = service.get_all_districts()
 
         self.assertEqual(len(districts), 0)
-        mock_cache.set.assert_not_called()
\ No newline at end of file
+        mock_cache.set.assert_not_called()
+
+    @patch('travel.services.district_service.background_refresher')
+    @patch('travel.services.district_service.ExternalApiService')
+    def test_stale_districts_served_and_refreshed(self, mock_api_service, mock_refresher):
+        indexed = {self.service._normalize_name(d["name"]): d for d in self.mock_districts_data}
+        cache.set(DistrictService.CACHE_KEY, {
+            "districts": indexed,
+            "fetched_at": time.time() - self.service.cache_ttl - 60,
+        })
+
+        service = DistrictService()
+        districts = service.get_all_districts()
+
+        self.assertEqual(len(districts), len(self.mock_districts_data))
+        mock_api_service.return_value.handle_get.assert_not_called()
+        mock_refresher.schedule.assert_called_once_with(DistrictService.CACHE_KEY, ANY)
+
+    @patch('travel.services.district_service.ExternalApiService')
+    def test_revalidation_not_modified_only_extends_ttl(self, mock_api_service):
+        indexed = {self.service._normalize_name(d["name"]): d for d in self.mock_districts_data}
+        previous = {
+            "districts": indexed,
+            "fetched_at": time.time() - 3600,
+            "etag": 'W/"abc"',
+            "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+
+        mock_response = MagicMock()
+        mock_response.status_code = status.HTTP_304_NOT_MODIFIED
+        mock_response.data = None
+        mock_api_service.return_value.handle_get.return_value = mock_response
+
+        service = DistrictService()
+        districts = service._fetch_and_cache_districts(previous=previous)
+
+        self.assertEqual(districts, indexed)
+        mock_api_service.return_value.handle_get.assert_called_once_with(
+            url=service.base_url,
+            headers={"If-None-Match": 'W/"abc"', "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+
+        cached = cache.get(DistrictService.CACHE_KEY)
+        self.assertEqual(cached["etag"], 'W/"abc"')
+        self.assertGreater(cached["fetched_at"], previous["fetched_at"])
+
+    @patch('travel.services.district_service.ExternalApiService')
+    def test_full_fetch_stores_validators(self, mock_api_service):
+        mock_response = MagicMock()
+        mock_response.status_code = status.HTTP_200_OK
+        mock_response.data = {"districts": self.mock_districts_data}
+        mock_response.headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+        mock_api_service.return_value.handle_get.return_value = mock_response
+
+        DistrictService().get_all_districts()
+
+        cached = cache.get(DistrictService.CACHE_KEY)
+        self.assertEqual(cached["etag"], '"v1"')
+        self.assertEqual(cached["last_modified"], "Wed, 01 Jan 2025 00:00:00 GMT")
+        self.assertEqual(len(cached["districts"]), len(self.mock_districts_data))
+
+    @patch('travel.services.district_service.ExternalApiService')
+    def test_index_is_served_from_process_memory_until_refreshed(self, mock_api_service):
+        mock_response = MagicMock()
+        mock_response.status_code = status.HTTP_200_OK
+        mock_response.data = {"districts": self.mock_districts_data}
+        mock_response.headers = {}
+        mock_api_service.return_value.handle_get.return_value = mock_response
+
+        service = DistrictService()
+        service.get_all_districts()
+        # The first read after a write loads the new generation into process memory
+        service.get_all_districts()
+
+        with patch('travel.services.district_service.cache') as mock_cache:
+            self.assertEqual(service.get_district_by_name("Dhaka")["id"], "1")
+            mock_cache.get.assert_not_called()
+
+        mock_response.data = {"districts": [{"id": "9", "name": "Dhaka", "lat": 1, "long": 2}]}
+        service.refresh()
+
+        self.assertEqual(DistrictService().get_district_by_name("Dhaka")["id"], "9")
+
+    @patch('travel.services.district_service.ExternalApiService')
+    def test_nearest_district_uses_stored_spatial_index(self, mock_api_service):
+        mock_response = MagicMock()
+        mock_response.status_code = status.HTTP_200_OK
+        mock_response.data = {"districts": self.mock_districts_data}
+        mock_response.headers = {}
+        mock_api_service.return_value.handle_get.return_value = mock_response
+
+        service = DistrictService()
+        service.get_all_districts()
+
+        self.assertIn("spatial", cache.get(DistrictService.CACHE_KEY))
+        self.assertEqual(service.get_nearest_district(23.78, 90.40, radius_km=10)["name"], "Dhaka")
+        self.assertIsNone(service.get_nearest_district(23.30, 90.40, radius_km=10))
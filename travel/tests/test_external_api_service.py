@@ -0,0 +1,41 @@
+from django.test import TestCase
+from rest_framework import status
+
+from travel.tests.stub_http_server import StubHTTPServer
+from travel_recommender.services.external_api_request_response import ExternalApiService
+
+
+class ExternalApiServiceTest(TestCase):
+    def setUp(self):
+        self.api_service = ExternalApiService()
+
+    def _districts_route(self, query, headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, None, {"ETag": '"v1"'}
+        return 200, {"districts": []}, {"ETag": '"v1"'}
+
+    def test_response_headers_are_exposed(self):
+        with StubHTTPServer({"/districts": self._districts_route}) as server:
+            response = self.api_service.handle_get(url=f"{server.base_url}/districts")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.headers.get("etag"), '"v1"')
+
+    def test_not_modified_is_not_an_error(self):
+        with StubHTTPServer({"/districts": self._districts_route}) as server:
+            response = self.api_service.handle_get(
+                url=f"{server.base_url}/districts",
+                headers={"If-None-Match": '"v1"'},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIsNone(response.data)
+        self.assertIsNone(response.error)
+        self.assertIsNone(response.actual_error)
+
+    def test_server_error_is_reported(self):
+        with StubHTTPServer({"/boom": lambda query, headers: (500, {"error": "boom"})}) as server:
+            response = self.api_service.handle_get(url=f"{server.base_url}/boom")
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.error, {"error": "boom"})
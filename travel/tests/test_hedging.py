@@ -0,0 +1,158 @@
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from travel.tests.stub_http_server import StubHTTPServer
+from travel_recommender.services.concurrency_limiter import concurrency_limiters
+from travel_recommender.services.external_api_request_response import ExternalApiService
+from travel_recommender.services.latency_tracker import LatencyTracker, latency_tracker
+from travel_recommender.services.retry_budget import RetryBudget, retry_budget
+
+
+class SlowFirstRoute:
+    """Route whose first response takes ``first_delay``; later ones are immediate."""
+
+    def __init__(self, first_delay: float):
+        self.first_delay = first_delay
+        self.calls = 0
+
+    def __call__(self, query, headers):
+        self.calls += 1
+        if self.calls == 1:
+            time.sleep(self.first_delay)
+            return 200, {"attempt": "primary"}
+        return 200, {"attempt": "hedge"}
+
+
+class FailingFirstRoute:
+    def __init__(self, failures: int, status_code: int = 503):
+        self.failures = failures
+        self.status_code = status_code
+        self.calls = 0
+
+    def __call__(self, query, headers):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return self.status_code, {"error": "busy"}
+        return 200, {"ok": True}
+
+
+class ExternalApiHedgingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        concurrency_limiters.reset()
+        latency_tracker.reset()
+        retry_budget.reset()
+        self.api_service = ExternalApiService()
+
+    def _prime_latencies(self, base_url, latency=0.01, count=20):
+        host = base_url.split("/")[2]
+        for _ in range(count):
+            latency_tracker.record(host, latency)
+
+    @override_settings(HTTP_HEDGING_ENABLED=True, HTTP_HEDGE_MIN_SAMPLES=20, HTTP_HEDGE_MIN_DELAY=0.05)
+    def test_slow_request_is_hedged(self):
+        with StubHTTPServer({"/forecast": SlowFirstRoute(first_delay=1.5)}) as server:
+            self._prime_latencies(server.base_url)
+
+            started = time.monotonic()
+            response = self.api_service.handle_get(url=f"{server.base_url}/forecast")
+            elapsed = time.monotonic() - started
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data, {"attempt": "hedge"})
+            self.assertLess(elapsed, 1.0)
+            self.assertEqual(server.request_count, 2)
+
+    @override_settings(HTTP_HEDGING_ENABLED=True, HTTP_HEDGE_MIN_SAMPLES=20, HTTP_HEDGE_MIN_DELAY=0.05)
+    def test_async_slow_request_is_hedged(self):
+        with StubHTTPServer({"/forecast": SlowFirstRoute(first_delay=1.5)}) as server:
+            self._prime_latencies(server.base_url)
+
+            started = time.monotonic()
+            response = async_to_sync(self.api_service.async_handle_get)(url=f"{server.base_url}/forecast")
+            elapsed = time.monotonic() - started
+
+            self.assertEqual(response.data, {"attempt": "hedge"})
+            self.assertLess(elapsed, 1.0)
+
+    @override_settings(HTTP_HEDGING_ENABLED=True, HTTP_HEDGE_MIN_SAMPLES=20)
+    def test_no_hedge_without_enough_samples(self):
+        with StubHTTPServer({"/forecast": SlowFirstRoute(first_delay=0.3)}) as server:
+            response = self.api_service.handle_get(url=f"{server.base_url}/forecast")
+
+            self.assertEqual(response.data, {"attempt": "primary"})
+            self.assertEqual(server.request_count, 1)
+
+    @override_settings(HTTP_HEDGING_ENABLED=True, HTTP_HEDGE_MIN_SAMPLES=20, RETRY_BUDGET_MAX_TOKENS=0)
+    def test_no_hedge_when_budget_is_exhausted(self):
+        with StubHTTPServer({"/forecast": SlowFirstRoute(first_delay=0.3)}) as server:
+            self._prime_latencies(server.base_url)
+
+            response = self.api_service.handle_get(url=f"{server.base_url}/forecast")
+
+            self.assertEqual(response.data, {"attempt": "primary"})
+            self.assertEqual(server.request_count, 1)
+
+    @override_settings(HTTP_MAX_RETRIES=2, HTTP_RETRY_BACKOFF_BASE=0.01)
+    def test_transient_failure_is_retried(self):
+        with StubHTTPServer({"/forecast": FailingFirstRoute(failures=1)}) as server:
+            response = self.api_service.handle_get(url=f"{server.base_url}/forecast")
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(server.request_count, 2)
+
+    @override_settings(HTTP_MAX_RETRIES=2, HTTP_RETRY_BACKOFF_BASE=0.01)
+    def test_client_error_is_not_retried(self):
+        with StubHTTPServer({"/forecast": FailingFirstRoute(failures=1, status_code=400)}) as server:
+            response = self.api_service.handle_get(url=f"{server.base_url}/forecast")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(server.request_count, 1)
+
+    @override_settings(HTTP_MAX_RETRIES=3, HTTP_RETRY_BACKOFF_BASE=0.001, RETRY_BUDGET_MAX_TOKENS=2, RETRY_BUDGET_RATIO=0.1)
+    def test_retries_stop_when_budget_is_spent(self):
+        with StubHTTPServer({"/forecast": FailingFirstRoute(failures=100)}) as server:
+            for _ in range(3):
+                self.api_service.handle_get(url=f"{server.base_url}/forecast")
+
+            # 3 first attempts plus the 2 retries the budget could pay for
+            self.assertEqual(server.request_count, 5)
+
+
+@override_settings(RETRY_BUDGET_MAX_TOKENS=10, RETRY_BUDGET_RATIO=0.1)
+class RetryBudgetTest(TestCase):
+    def test_budget_refills_by_ratio(self):
+        budget = RetryBudget()
+        for _ in range(10):
+            self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+        for _ in range(10):
+            budget.deposit()
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+
+class LatencyTrackerTest(TestCase):
+    def test_percentiles(self):
+        tracker = LatencyTracker()
+        for latency in range(1, 101):
+            tracker.record("upstream", latency / 100)
+
+        self.assertEqual(tracker.percentile("upstream", 50), 0.5)
+        self.assertEqual(tracker.percentile("upstream", 95), 0.95)
+        self.assertIsNone(tracker.percentile("upstream", 95, min_samples=200))
+        self.assertIsNone(tracker.percentile("other", 95))
+
+    def test_window_keeps_recent_samples(self):
+        tracker = LatencyTracker()
+        for _ in range(tracker.WINDOW_SIZE):
+            tracker.record("upstream", 5.0)
+        for _ in range(tracker.WINDOW_SIZE):
+            tracker.record("upstream", 0.1)
+
+        self.assertEqual(tracker.percentile("upstream", 99), 0.1)
@@ -0,0 +1,82 @@
+import math
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from travel.services.hourly_samples import HourlyAxis, daily_means, daily_samples
+
+TIMES = ["2024-01-01T13:00", "2024-01-01T14:00", "2024-01-02T13:00", "2024-01-02T14:00", "2024-01-03T14:00"]
+
+
+class HourlySamplesTest(TestCase):
+    def test_axis_offsets(self):
+        axis = HourlyAxis(TIMES)
+        day_offsets, columns = axis.columns_at(14)
+
+        self.assertEqual(axis.first_day, date(2024, 1, 1))
+        self.assertEqual(axis.days, 3)
+        self.assertEqual(day_offsets.tolist(), [0, 1, 2])
+        self.assertEqual(columns.tolist(), [1, 3, 4])
+
+    def test_empty_and_malformed_axes_are_empty(self):
+        for times in ([], ["2024-01-01T14:00", "not a time"], [None, "2024-01-01T14:00"]):
+            axis = HourlyAxis(times)
+            day_offsets, columns = axis.columns_at(14)
+
+            self.assertIsNone(axis.first_day)
+            self.assertEqual(axis.days, 0)
+            self.assertEqual(columns.tolist(), [])
+
+    def test_series_with_malformed_times_are_skipped(self):
+        results = daily_samples([
+            (["2024-01-01T14:00", "2024-01-0X"], [20.0, 21.0]),
+            (TIMES, [1.0, 20.0, 2.0, 21.0, 22.0]),
+        ])
+        means = daily_means([(["garbage"], [20.0]), (TIMES, [1.0, 20.0, 2.0, 21.0, 22.0])])
+
+        self.assertEqual(results[0][0], None)
+        self.assertEqual(len(results[0][1]), 0)
+        self.assertEqual(results[1][1].tolist(), [20.0, 21.0, 22.0])
+        self.assertEqual(means, [None, 21.0])
+
+    def test_samples_per_day_with_none_as_nan(self):
+        first_day, samples = daily_samples([(TIMES, [1.0, 20.0, 2.0, None, 22.0])])[0]
+
+        self.assertEqual(first_day, date(2024, 1, 1))
+        self.assertEqual(samples[0], 20.0)
+        self.assertTrue(math.isnan(samples[1]))
+        self.assertEqual(samples[2], 22.0)
+
+    def test_series_on_different_axes_and_short_values(self):
+        other_times = ["2024-02-01T14:00", "2024-02-02T14:00"]
+
+        results = daily_samples([
+            (TIMES, [0.0, 20.0, 0.0, 21.0]),
+            (other_times, [30.0, 31.0]),
+            (None, None),
+        ])
+
+        self.assertEqual(results[0][1][:2].tolist(), [20.0, 21.0])
+        self.assertTrue(math.isnan(results[0][1][2]))
+        self.assertEqual(results[1], (date(2024, 2, 1), results[1][1]))
+        self.assertEqual(results[1][1].tolist(), [30.0, 31.0])
+        self.assertEqual(results[2][0], None)
+        self.assertEqual(len(results[2][1]), 0)
+
+    def test_daily_means(self):
+        means = daily_means([
+            (TIMES, [100.0, 20.0, 100.0, None, 22.0]),
+            (TIMES, [100.0, None, 100.0, None, None]),
+            ([], []),
+        ])
+
+        self.assertEqual(means, [21.0, None, None])
+
+    def test_benchmark_command_runs(self):
+        out = StringIO()
+
+        call_command("benchmark_hourly_extraction", locations="8", repeat=1, stdout=out)
+
+        self.assertIn("speedup", out.getvalue())
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from travel.tests.stub_http_server import StubHTTPServer
+from travel_recommender.services.external_api_request_response import ExternalApiService
+from travel_recommender.services.http_session import http_session_pool
+
+
+class HttpSessionPoolTest(TestCase):
+    def setUp(self):
+        http_session_pool.reset()
+        self.api_service = ExternalApiService()
+
+    def tearDown(self):
+        http_session_pool.reset()
+
+    def test_connections_are_reused(self):
+        with StubHTTPServer({"/ping": lambda query, headers: (200, {"ok": True})}) as server:
+            for _ in range(5):
+                response = self.api_service.handle_get(url=f"{server.base_url}/ping")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = http_session_pool.get_stats()
+        host_stats = next(iter(stats.values()))
+
+        self.assertEqual(host_stats["requests"], 5)
+        self.assertEqual(host_stats["new_connections"], 1)
+        self.assertEqual(host_stats["reused_connections"], 4)
+
+    @override_settings(HTTP_POOL_MAXSIZE=4)
+    def test_pool_is_shared_across_threads(self):
+        with StubHTTPServer({"/ping": lambda query, headers: (200, {"ok": True})}, delay=0.05) as server:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                responses = list(executor.map(
+                    lambda _: self.api_service.handle_get(url=f"{server.base_url}/ping"),
+                    range(16),
+                ))
+
+        self.assertTrue(all(r.status_code == status.HTTP_200_OK for r in responses))
+
+        host_stats = next(iter(http_session_pool.get_stats().values()))
+        self.assertEqual(host_stats["requests"], 16)
+        self.assertLessEqual(host_stats["new_connections"], 4)
+
+    @override_settings(REQUEST_TIMEOUT=0.1)
+    def test_read_timeout_is_enforced(self):
+        with StubHTTPServer({"/slow": lambda query, headers: (200, {"ok": True})}, delay=0.5) as server:
+            response = self.api_service.handle_get(url=f"{server.base_url}/slow")
+
+        self.assertEqual(response.status_code, status.HTTP_504_GATEWAY_TIMEOUT)
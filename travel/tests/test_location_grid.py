@@ -0,0 +1,27 @@
+from django.test import TestCase
+
+from travel.services.location_grid import GridCell
+
+
+class GridCellTest(TestCase):
+    def test_nearby_coordinates_share_a_cell(self):
+        first = GridCell.snap(23.8103, 90.4125, 0.1)
+        second = GridCell.snap(23.7851, 90.3702, 0.1)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first.name, "cell:23.8000,90.4000")
+
+    def test_snapped_values_have_no_float_noise(self):
+        cell = GridCell.snap(0.30000001, 0.7, 0.1)
+
+        self.assertEqual((cell.lat, cell.lon), (0.3, 0.7))
+
+    def test_longitude_wraps_and_latitude_is_clamped(self):
+        cell = GridCell.snap(89.99, 179.98, 0.1)
+
+        self.assertEqual((cell.lat, cell.lon), (90.0, -180.0))
+
+    def test_zero_resolution_keeps_exact_coordinates(self):
+        cell = GridCell.snap(23.8103, 90.4125, 0)
+
+        self.assertEqual(cell.as_district(), {"name": "cell:23.8103,90.4125", "lat": 23.8103, "long": 90.4125})
@@ -0,0 +1,99 @@
+import random
+import time
+from datetime import date
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from travel.services.district_metrics import DistrictMetrics
+from travel.services.ranking_engine import RankingEngine, RankingQuery, WEIGHTED
+from travel.services.weather_matrix import DistrictWeatherMatrix
+
+
+def matrix_of(readings, version=1):
+    """``readings`` maps a district to (temperatures, pm25) per day from 2024-01-01."""
+    records = {
+        name: DistrictMetrics(start_date=date(2024, 1, 1), temperatures=temps, pm25=pm25, fetched_at=time.time())
+        for name, (temps, pm25) in readings.items()
+    }
+    return DistrictWeatherMatrix.build(records, version)
+
+
+class RankingEngineTest(TestCase):
+    def setUp(self):
+        self.engine = RankingEngine()
+        self.matrix = matrix_of({
+            "Dhaka": ((30.0, 32.0), (120.0, 100.0)),
+            "Sylhet": ((20.0, 22.0), (40.0, 60.0)),
+            "Khulna": ((25.0, 19.0), (30.0, 30.0)),
+            "Bandarban": ((21.0, 21.0), (10.0, 10.0)),
+        })
+
+    def names(self, results):
+        return [r["district"] for r in results]
+
+    def test_lexicographic_top_k(self):
+        results = self.engine.rank(self.matrix, RankingQuery(), limit=2)
+
+        self.assertEqual(self.names(results), ["Bandarban", "Sylhet"])
+        self.assertEqual(results[0], {"district": "Bandarban", "avg_temp": 21.0, "avg_pm25": 10.0})
+
+    def test_top_k_matches_full_sort(self):
+        rng = random.Random(7)
+        readings = {
+            f"D{i}": (tuple(rng.choice([20.0, 21.0, 22.0]) for _ in range(3)), tuple(rng.uniform(5, 90) for _ in range(3)))
+            for i in range(64)
+        }
+        matrix = matrix_of(readings)
+
+        full = sorted(
+            (
+                {"district": name, "avg_temp": round(sum(t) / 3, 2), "avg_pm25": round(sum(p) / 3, 2)}
+                for name, (t, p) in readings.items()
+            ),
+            key=lambda x: (x["avg_temp"], x["avg_pm25"]),
+        )
+
+        for limit in (1, 5, 17, 64):
+            self.assertEqual(
+                [(r["avg_temp"], r["avg_pm25"]) for r in self.engine.rank(matrix, RankingQuery(), limit)],
+                [(r["avg_temp"], r["avg_pm25"]) for r in full[:limit]],
+            )
+
+    def test_weighted_score(self):
+        query = RankingQuery(order=WEIGHTED, temp_weight=0.0, pm25_weight=1.0)
+
+        results = self.engine.rank(self.matrix, query, limit=4)
+
+        self.assertEqual(self.names(results), ["Bandarban", "Khulna", "Sylhet", "Dhaka"])
+        self.assertEqual(results[1]["score"], 30.0)
+
+    def test_thresholds(self):
+        results = self.engine.rank(self.matrix, RankingQuery(max_pm25=50.0, max_temp=22.0), limit=10)
+
+        self.assertEqual(self.names(results), ["Bandarban"])
+
+    def test_date_window(self):
+        query = RankingQuery(start_date=date(2024, 1, 2), end_date=date(2024, 1, 2))
+
+        results = self.engine.rank(self.matrix, query, limit=1)
+
+        self.assertEqual(results, [{"district": "Khulna", "avg_temp": 19.0, "avg_pm25": 30.0}])
+
+    def test_results_are_memoized_per_version(self):
+        with patch.object(RankingEngine, "_select", wraps=RankingEngine._select) as mock_select:
+            first = self.engine.rank(self.matrix, RankingQuery(max_pm25=50.0), limit=3)
+            second = self.engine.rank(self.matrix, RankingQuery(max_pm25=50.0), limit=3)
+            self.assertIs(first, second)
+            self.assertEqual(mock_select.call_count, 1)
+
+            self.engine.rank(self.matrix, RankingQuery(max_pm25=50.0), limit=2)
+            self.assertEqual(mock_select.call_count, 2)
+
+            newer = matrix_of({"Dhaka": ((30.0,), (20.0,))}, version=2)
+            self.assertEqual(self.names(self.engine.rank(newer, RankingQuery(max_pm25=50.0), limit=3)), ["Dhaka"])
+            self.assertEqual(mock_select.call_count, 3)
+
+    def test_query_from_options_ignores_unset(self):
+        self.assertTrue(RankingQuery.from_options({"order": "lexicographic", "max_pm25": None}).is_default)
+        self.assertEqual(RankingQuery.from_options({"max_pm25": 35.0}).max_pm25, 35.0)
@@ -64,4 +64,64 @@ class TravelRecommendationAPIViewTest(TestCase):
 
         response = self.client.get(self.url, data)
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BatchRecommendationAPIViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('recommend_batch')
+        self.start_date = date.today() + timedelta(days=1)
+
+    @patch('travel.views.batch_recommend_view.RecommendService')
+    def test_batch_recommend_success(self, mock_service):
+        mock_service.return_value.recommend_batch.return_value = {"count": 0, "results": []}
+
+        response = self.client.get(self.url, {
+            "current_lat": 23.8103,
+            "current_lon": 90.4125,
+            "destinations": "all",
+            "start_date": self.start_date.isoformat(),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("freshness", response.data)
+        mock_service.return_value.recommend_batch.assert_called_once_with(
+            current_lat=23.8103,
+            current_lon=90.4125,
+            destination_names=None,
+            start_date=self.start_date,
+            end_date=self.start_date,
+        )
+
+    def test_batch_recommend_missing_destinations(self):
+        response = self.client.get(self.url, {
+            "current_lat": 23.8103,
+            "current_lon": 90.4125,
+            "start_date": self.start_date.isoformat(),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BestTravelDayAPIViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('recommend_best_day')
+
+    @patch('travel.views.best_travel_day_view.RecommendService')
+    def test_best_travel_day_success(self, mock_service):
+        mock_service.return_value.best_travel_day.return_value = {"destination": "Sylhet", "best_day": None, "days": []}
+
+        response = self.client.get(self.url, {"current_lat": 23.8103, "current_lon": 90.4125, "destination_name": "Sylhet"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("freshness", response.data)
+        mock_service.return_value.best_travel_day.assert_called_once_with(
+            current_lat=23.8103, current_lon=90.4125, destination_name="Sylhet"
+        )
+
+    def test_best_travel_day_missing_destination(self):
+        response = self.client.get(self.url, {"current_lat": 23.8103, "current_lon": 90.4125})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
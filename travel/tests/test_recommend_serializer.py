@@ -1,7 +1,7 @@
 from django.test import TestCase
 from datetime import date, timedelta
 
-from travel.serializers.recommend_serializer import RecommendSerializer
+from travel.serializers.recommend_serializer import BatchRecommendSerializer, RecommendSerializer
 
 
 class RecommendSerializerTest(TestCase):
@@ -61,4 +61,40 @@ class RecommendSerializerTest(TestCase):
         data["destination_name"] = "  Sylhet  "
         serializer = RecommendSerializer(data=data)
         self.assertTrue(serializer.is_valid())
-        self.assertEqual(serializer.validated_data["destination_name"], "Sylhet")
\ No newline at end of file
+        self.assertEqual(serializer.validated_data["destination_name"], "Sylhet")
+
+
+class BatchRecommendSerializerTest(TestCase):
+    def setUp(self):
+        self.valid_data = {
+            "current_lat": 23.8103,
+            "current_lon": 90.4125,
+            "destinations": "Sylhet, Bandarban,Sylhet",
+            "start_date": (date.today() + timedelta(days=1)).isoformat(),
+        }
+
+    def test_destination_list_is_parsed(self):
+        serializer = BatchRecommendSerializer(data=self.valid_data)
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data["destinations"], ["Sylhet", "Bandarban"])
+        self.assertEqual(serializer.validated_data["end_date"], serializer.validated_data["start_date"])
+
+    def test_all_destinations(self):
+        serializer = BatchRecommendSerializer(data={**self.valid_data, "destinations": "all"})
+        self.assertTrue(serializer.is_valid())
+        self.assertIsNone(serializer.validated_data["destinations"])
+
+    def test_too_many_destinations(self):
+        names = ",".join(f"D{i}" for i in range(BatchRecommendSerializer.MAX_DESTINATIONS + 1))
+        serializer = BatchRecommendSerializer(data={**self.valid_data, "destinations": names})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("destinations", serializer.errors)
+
+    def test_date_range(self):
+        serializer = BatchRecommendSerializer(data={**self.valid_data, "end_date": date.today().isoformat()})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("end_date", serializer.errors)
+
+        end_date = date.today() + timedelta(days=10)
+        serializer = BatchRecommendSerializer(data={**self.valid_data, "end_date": end_date.isoformat()})
+        self.assertFalse(serializer.is_valid())
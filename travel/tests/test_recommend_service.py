@@ -1,15 +1,27 @@
-from django.test import TestCase
+import time
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from unittest.mock import patch, MagicMock
 from datetime import date, timedelta
 
+from travel.services.district_metrics import DistrictMetrics
 from travel.services.recommend_service import RecommendService
+from travel.services.weather_matrix import district_weather_matrix
+from travel.services.weather_projection import MIDDAY_PROJECTION
+from travel_recommender.services.freshness import track_freshness
 
 
 class RecommendServiceTest(TestCase):
     def setUp(self):
+        cache.clear()
+        district_weather_matrix.reset()
         self.service = RecommendService()
         self.travel_date = date.today() + timedelta(days=3)
 
+    def tearDown(self):
+        cache.clear()
+
     def test_get_value_at_2pm_on_date_found(self):
         times = ["2024-01-15T10:00", "2024-01-15T14:00", "2024-01-15T18:00"]
         values = [20.0, 25.0, 22.0]
@@ -54,6 +66,7 @@ class RecommendServiceTest(TestCase):
         }
 
         mock_weather_instance = MagicMock()
+        mock_weather_instance.get_district_metrics.return_value = None
         mock_weather_instance.get_weather_for_district.return_value = mock_weather
 
         mock_weather_service.return_value = mock_weather_instance
@@ -68,9 +81,61 @@ class RecommendServiceTest(TestCase):
         self.assertEqual(metrics["pm25"], 50.0)
 
         mock_weather_instance.get_weather_for_district.assert_called_once_with(
-            district={"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+            district={"name": "Dhaka", "lat": 23.8103, "long": 90.4125},
+            projection=MIDDAY_PROJECTION.for_day(self.travel_date)
         )
 
+    @patch('travel.services.recommend_service.WeatherService')
+    def test_fetch_metrics_for_date_uses_metric_record(self, mock_weather_service):
+        mock_weather_instance = mock_weather_service.return_value
+        mock_weather_instance.get_district_metrics.return_value = DistrictMetrics(
+            start_date=self.travel_date,
+            temperatures=(24.96,),
+            pm25=(50.04,),
+            fetched_at=0,
+        )
+
+        metrics = RecommendService()._fetch_metrics_for_date("Dhaka", 23.8103, 90.4125, self.travel_date)
+
+        self.assertEqual(metrics, {"temp": 25.0, "pm25": 50.0})
+        mock_weather_instance.get_weather_for_district.assert_not_called()
+
+    @override_settings(CURRENT_LOCATION_GRID_RESOLUTION=0.1)
+    @patch.object(RecommendService, '_fetch_metrics_for_date')
+    def test_current_location_is_snapped_to_grid_cell(self, mock_fetch_metrics):
+        mock_fetch_metrics.return_value = {"temp": 25.0, "pm25": 50.0}
+        destination = {"name": "Sylhet", "lat": "24.8949", "long": "91.8687"}
+        service = RecommendService()
+
+        service._fetch_location_metrics(23.8103, 90.4125, destination, self.travel_date)
+        service._fetch_location_metrics(23.7851, 90.3702, destination, self.travel_date)
+
+        current_calls = [c for c in mock_fetch_metrics.call_args_list if c.args[0] != "Sylhet"]
+        self.assertEqual(len(current_calls), 2)
+        for call in current_calls:
+            self.assertEqual(call.args, ("cell:23.8000,90.4000", 23.8, 90.4, self.travel_date))
+
+    @override_settings(CURRENT_LOCATION_NEAREST_DISTRICT=True, NEAREST_DISTRICT_RADIUS_KM=10)
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_current_location_resolves_to_nearest_district(self, mock_district_service):
+        mock_district_service.return_value.get_nearest_district.return_value = {
+            "name": "Dhaka", "lat": "23.7115253", "long": "90.4111451"
+        }
+
+        current = RecommendService()._resolve_current_location(23.75, 90.39)
+
+        self.assertEqual(current["name"], "Dhaka")
+        mock_district_service.return_value.get_nearest_district.assert_called_once_with(23.75, 90.39, 10)
+
+    @override_settings(CURRENT_LOCATION_NEAREST_DISTRICT=True, CURRENT_LOCATION_GRID_RESOLUTION=0.1)
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_current_location_outside_radius_falls_back_to_grid_cell(self, mock_district_service):
+        mock_district_service.return_value.get_nearest_district.return_value = None
+
+        current = RecommendService()._resolve_current_location(21.01, 89.02)
+
+        self.assertEqual(current["name"], "cell:21.0000,89.0000")
+
     @patch.object(RecommendService, '_fetch_metrics_for_date')
     @patch('travel.services.recommend_service.DistrictService')
     def test_recommend_cooler_and_cleaner(self, mock_district_service, mock_fetch_metrics):
@@ -132,4 +197,209 @@ class RecommendServiceTest(TestCase):
         )
 
         self.assertEqual(result["recommendation"], "Not Recommended")
-        self.assertIn("not found", result["reason"])
\ No newline at end of file
+        self.assertIn("not found", result["reason"])
+
+    @override_settings(CONCURRENT_UPSTREAM_FETCH=True)
+    @patch.object(RecommendService, '_fetch_metrics_for_date')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_recommend_concurrent_fetch(self, mock_district_service, mock_fetch_metrics):
+        mock_district_service.return_value.get_district_by_name.return_value = {
+            "name": "Sylhet",
+            "lat": 24.8949,
+            "long": 91.8687
+        }
+
+        def fetch_side_effect(name, lat, lon, travel_date):
+            if name.startswith("cell:"):
+                return {"temp": 30.0, "pm25": 120.0}
+            return {"temp": 22.0, "pm25": 40.0}
+
+        mock_fetch_metrics.side_effect = fetch_side_effect
+
+        result = RecommendService().recommend(
+            current_lat=23.8103,
+            current_lon=90.4125,
+            destination_name="Sylhet",
+            travel_date=self.travel_date
+        )
+
+        self.assertEqual(result["recommendation"], "Recommended")
+        self.assertEqual(mock_fetch_metrics.call_count, 2)
+
+    @override_settings(CONCURRENT_UPSTREAM_FETCH=True)
+    @patch.object(RecommendService, '_fetch_metrics_for_date')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_recommend_concurrent_fetch_destination_unavailable(self, mock_district_service, mock_fetch_metrics):
+        mock_district_service.return_value.get_district_by_name.return_value = {
+            "name": "Sylhet",
+            "lat": 24.8949,
+            "long": 91.8687
+        }
+
+        def fetch_side_effect(name, lat, lon, travel_date):
+            if name.startswith("cell:"):
+                return {"temp": 30.0, "pm25": 120.0}
+            return None
+
+        mock_fetch_metrics.side_effect = fetch_side_effect
+
+        result = RecommendService().recommend(
+            current_lat=23.8103,
+            current_lon=90.4125,
+            destination_name="Sylhet",
+            travel_date=self.travel_date
+        )
+
+        self.assertEqual(result["recommendation"], "Not Recommended")
+        self.assertIn("unavailable for Sylhet", result["reason"])
+
+    def _batch_service(self, mock_district_service, mock_weather_service):
+        start = date(2024, 1, 1)
+        districts = {
+            "Sylhet": {"name": "Sylhet", "lat": 24.9, "long": 91.9},
+            "Bandarban": {"name": "Bandarban", "lat": 22.2, "long": 92.2},
+        }
+        mock_district_service.return_value.get_district_by_name.side_effect = lambda name: districts.get(name)
+        mock_district_service.return_value.get_all_districts.return_value = list(districts.values())
+
+        mock_weather_service.return_value.cache_ttl = 3600
+        mock_weather_service.return_value.get_district_metrics.return_value = DistrictMetrics(
+            start_date=start, temperatures=(30.0, 30.0), pm25=(100.0, 100.0), fetched_at=0
+        )
+        mock_weather_service.return_value.batch_get_metrics.return_value = [
+            {
+                "district_name": "Sylhet",
+                "metrics": DistrictMetrics(start_date=start, temperatures=(25.0, 20.0), pm25=(90.0, 40.0), fetched_at=0),
+            },
+            {
+                "district_name": "Bandarban",
+                "metrics": DistrictMetrics(start_date=start, temperatures=(32.0, 33.0), pm25=(30.0, 110.0), fetched_at=0),
+            },
+        ]
+        return RecommendService()
+
+    @patch('travel.services.recommend_service.WeatherService')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_recommend_batch_sorts_verdicts_by_benefit(self, mock_district_service, mock_weather_service):
+        service = self._batch_service(mock_district_service, mock_weather_service)
+
+        names = ["Sylhet", "Bandarban", "Atlantis"]
+        with track_freshness() as freshness:
+            result = service.recommend_batch(23.8, 90.4, names, date(2024, 1, 1), date(2024, 1, 2))
+
+        self.assertEqual(
+            [(r["destination"], r["travel_date"], r["recommendation"]) for r in result["results"]],
+            [
+                ("Bandarban", "2024-01-01", "Recommended"),
+                ("Sylhet", "2024-01-02", "Recommended"),
+                ("Sylhet", "2024-01-01", "Recommended"),
+                ("Bandarban", "2024-01-02", "Not Recommended"),
+            ],
+        )
+        self.assertEqual(result["results"][1]["temp_diff"], -10.0)
+        self.assertEqual(result["results"][1]["pm25_diff"], -60.0)
+        self.assertEqual(result["current_location"]["2024-01-02"], {"temperature": 30.0, "pm25": 100.0})
+        self.assertEqual(result["not_found"], ["Atlantis"])
+        self.assertEqual(result["count"], 4)
+        # The destination rows were fetched at the epoch, far past the soft TTL
+        self.assertTrue(freshness.stale)
+
+        # One origin read and one batch read, however many destinations and days
+        mock_weather_service.return_value.get_district_metrics.assert_called_once()
+        mock_weather_service.return_value.batch_get_metrics.assert_called_once()
+        mock_weather_service.return_value.get_weather_for_district.assert_not_called()
+
+    @patch('travel.services.recommend_service.WeatherService')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_recommend_batch_origin_unavailable(self, mock_district_service, mock_weather_service):
+        service = self._batch_service(mock_district_service, mock_weather_service)
+        mock_weather_service.return_value.get_district_metrics.return_value = None
+        mock_weather_service.return_value.get_weather_for_district.return_value = None
+
+        result = service.recommend_batch(23.8, 90.4, None, date(2024, 1, 1), date(2024, 1, 1))
+
+        self.assertEqual(result["results"], [])
+        self.assertEqual(result["unavailable"], ["Sylhet", "Bandarban"])
+        self.assertIn("reason", result)
+        mock_weather_service.return_value.batch_get_metrics.assert_not_called()
+
+    @patch('travel.services.recommend_service.WeatherService')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_best_travel_day_is_computed_once_per_pair(self, mock_district_service, mock_weather_service):
+        start = date.today()
+        mock_district_service.return_value.get_district_by_name.return_value = {"name": "Sylhet", "lat": 24.9, "long": 91.9}
+        mock_weather_service.return_value.cache_ttl = 3600
+        mock_weather_service.return_value.get_district_metrics.side_effect = lambda district: DistrictMetrics(
+            start_date=start,
+            temperatures=(30.0, 30.0, 30.0) if district["name"].startswith("cell:") else (32.0, 25.0, 22.0),
+            pm25=(100.0, 100.0, 100.0) if district["name"].startswith("cell:") else (110.0, 50.0, 60.0),
+            fetched_at=time.time(),
+        )
+
+        service = RecommendService()
+        result = service.best_travel_day(23.8, 90.4, "Sylhet")
+
+        self.assertEqual(len(result["days"]), 3)
+        self.assertEqual(result["best_day"]["travel_date"], (start + timedelta(days=1)).isoformat())
+        self.assertEqual(result["best_day"]["pm25_diff"], -50.0)
+        self.assertEqual(result["days"][0]["recommendation"], "Not Recommended")
+
+        # Asking again for the same pair reads the stored days
+        again = RecommendService().best_travel_day(23.8, 90.4, "Sylhet")
+
+        self.assertEqual(again, result)
+        self.assertEqual(mock_weather_service.return_value.get_district_metrics.call_count, 2)
+        mock_weather_service.return_value.get_weather_for_district.assert_not_called()
+
+    @patch('travel.services.recommend_service.WeatherService')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_recommend_after_best_travel_day_reads_the_stored_days(self, mock_district_service, mock_weather_service):
+        start = date.today()
+        mock_district_service.return_value.get_district_by_name.return_value = {"name": "Sylhet", "lat": 24.9, "long": 91.9}
+        mock_weather_service.return_value.cache_ttl = 3600
+        mock_weather_service.return_value.get_district_metrics.side_effect = lambda district: DistrictMetrics(
+            start_date=start,
+            temperatures=(30.0, 30.0, 30.0) if district["name"].startswith("cell:") else (32.0, 25.0, 22.0),
+            pm25=(100.0, 100.0, 100.0) if district["name"].startswith("cell:") else (110.0, 50.0, 60.0),
+            fetched_at=time.time(),
+        )
+
+        RecommendService().best_travel_day(23.8, 90.4, "Sylhet")
+        with patch.object(RecommendService, '_fetch_location_metrics') as mock_fetch_metrics:
+            follow_up = RecommendService().recommend(23.8, 90.4, "Sylhet", start + timedelta(days=2))
+
+        self.assertEqual(follow_up["destination"], {"name": "Sylhet", "temperature": 22.0, "pm25": 60.0})
+        self.assertEqual(follow_up["current_location"], {"temperature": 30.0, "pm25": 100.0})
+        self.assertEqual(follow_up["recommendation"], "Recommended")
+        mock_fetch_metrics.assert_not_called()
+        self.assertEqual(mock_weather_service.return_value.get_district_metrics.call_count, 2)
+        mock_weather_service.return_value.read_metrics.assert_not_called()
+        mock_weather_service.return_value.get_weather_for_district.assert_not_called()
+
+    @patch('travel.services.recommend_service.WeatherService')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_best_travel_day_without_common_days_is_not_cached(self, mock_district_service, mock_weather_service):
+        mock_district_service.return_value.get_district_by_name.return_value = {"name": "Sylhet", "lat": 24.9, "long": 91.9}
+        mock_weather_service.return_value.cache_ttl = 3600
+        # Both records end before today, so no day can be compared
+        mock_weather_service.return_value.get_district_metrics.return_value = DistrictMetrics(
+            start_date=date.today() - timedelta(days=3), temperatures=(30.0,), pm25=(100.0,), fetched_at=time.time()
+        )
+
+        started = time.monotonic()
+        first = RecommendService().best_travel_day(23.8, 90.4, "Sylhet")
+        second = RecommendService().best_travel_day(23.8, 90.4, "Sylhet")
+
+        self.assertIn("unavailable", first["reason"])
+        self.assertEqual(second, first)
+        self.assertEqual(mock_weather_service.return_value.get_district_metrics.call_count, 4)
+        self.assertLess(time.monotonic() - started, 1)
+
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_best_travel_day_destination_not_found(self, mock_district_service):
+        mock_district_service.return_value.get_district_by_name.return_value = None
+
+        result = RecommendService().best_travel_day(23.8, 90.4, "Atlantis")
+
+        self.assertEqual(result["recommendation"], "Not Recommended")
+        self.assertIn("not found", result["reason"])
@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from travel_recommender.services.single_flight import SingleFlight
+
+
+class SingleFlightTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.single_flight = SingleFlight()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_concurrent_callers_share_one_load(self):
+        load = MagicMock(side_effect=lambda: time.sleep(0.2) or {"value": 1})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: self.single_flight.fetch("key", load=load, read_cached=lambda: None),
+                range(8),
+            ))
+
+        load.assert_called_once()
+        self.assertTrue(all(result == {"value": 1} for result in results))
+
+    def test_lease_is_released_after_load(self):
+        self.single_flight.fetch("key", load=lambda: "value", read_cached=lambda: None)
+
+        self.assertIsNone(cache.get("lease:key"))
+
+    def test_leader_exception_propagates_to_followers(self):
+        def failing_load():
+            time.sleep(0.1)
+            raise ValueError("upstream down")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.single_flight.fetch, "key", load=failing_load, read_cached=lambda: None)
+                for _ in range(2)
+            ]
+
+        for future in futures:
+            self.assertIsInstance(future.exception(), ValueError)
+
+    @override_settings(SINGLE_FLIGHT_WAIT=2)
+    def test_waits_for_other_process_holding_lease(self):
+        cache.add("lease:key", "other-worker", timeout=30)
+        threading.Timer(0.2, lambda: cache.set("key", "from-other-worker")).start()
+        load = MagicMock(return_value="own-fetch")
+
+        result = self.single_flight.fetch("key", load=load, read_cached=lambda: cache.get("key"))
+
+        self.assertEqual(result, "from-other-worker")
+        load.assert_not_called()
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0.2)
+    def test_fetches_itself_when_lease_holder_is_too_slow(self):
+        cache.add("lease:key", "other-worker", timeout=30)
+        load = MagicMock(return_value="own-fetch")
+
+        result = self.single_flight.fetch("key", load=load, read_cached=lambda: None)
+
+        self.assertEqual(result, "own-fetch")
+        load.assert_called_once()
+        self.assertEqual(cache.get("lease:key"), "other-worker")
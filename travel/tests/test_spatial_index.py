@@ -0,0 +1,40 @@
+from django.test import TestCase
+
+from travel.services.spatial_index import DistrictSpatialIndex, haversine_km
+
+DISTRICTS = {
+    "dhaka": {"name": "Dhaka", "lat": "23.7115253", "long": "90.4111451"},
+    "narayanganj": {"name": "Narayanganj", "lat": "23.63366", "long": "90.496482"},
+    "sylhet": {"name": "Sylhet", "lat": "24.8949", "long": "91.8687"},
+    "broken": {"name": "Broken", "lat": "", "long": None},
+}
+
+
+class DistrictSpatialIndexTest(TestCase):
+    def setUp(self):
+        self.index = DistrictSpatialIndex.build(DISTRICTS)
+
+    def test_haversine_distance(self):
+        # Dhaka to Sylhet is roughly 200 km as the crow flies
+        self.assertAlmostEqual(haversine_km(23.7115, 90.4111, 24.8949, 91.8687), 196.5, delta=2)
+        self.assertEqual(haversine_km(23.7, 90.4, 23.7, 90.4), 0)
+
+    def test_nearest_within_radius(self):
+        district, distance = self.index.nearest(23.65, 90.48, radius_km=10)
+
+        self.assertEqual(district["name"], "Narayanganj")
+        self.assertLess(distance, 3)
+
+    def test_outside_radius_is_none(self):
+        self.assertIsNone(self.index.nearest(23.20, 90.40, radius_km=10))
+
+    def test_search_crosses_bucket_boundaries(self):
+        # 23.49 falls in the 0.5° bucket below every indexed district
+        district, _ = self.index.nearest(23.49, 90.41, radius_km=30)
+
+        self.assertEqual(district["name"], "Narayanganj")
+
+    def test_districts_without_coordinates_are_skipped(self):
+        indexed = {name for names in self.index.buckets.values() for name in names}
+
+        self.assertNotIn("broken", indexed)
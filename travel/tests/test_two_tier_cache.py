@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from travel_recommender.services.two_tier_cache import TwoTierCache
+
+
+@override_settings(LOCAL_CACHE_TTL=60, LOCAL_CACHE_MAX_ENTRIES=2)
+class TwoTierCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tier = TwoTierCache()
+
+    def tearDown(self):
+        cache.clear()
+
+    def _loader(self, value):
+        load = MagicMock(return_value=value)
+        return load
+
+    def test_current_generation_is_served_locally(self):
+        self.tier.invalidate("districts")
+        load = self._loader({"dhaka": {}})
+
+        first = self.tier.get("districts", load)
+        second = self.tier.get("districts", load)
+
+        self.assertIs(first, second)
+        load.assert_called_once()
+
+    def test_invalidate_reaches_other_processes(self):
+        other_process = TwoTierCache()
+        self.tier.invalidate("districts")
+        other_process.get("districts", self._loader("v1"))
+
+        self.tier.invalidate("districts")
+        load = self._loader("v2")
+
+        self.assertEqual(other_process.get("districts", load), "v2")
+        load.assert_called_once()
+
+    def test_keys_without_generation_are_not_kept(self):
+        load = self._loader("value")
+
+        self.tier.get("districts", load)
+        self.tier.get("districts", load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_cache_flush_drops_local_copies(self):
+        self.tier.invalidate("districts")
+        self.tier.get("districts", self._loader("old"))
+
+        cache.clear()
+
+        self.assertEqual(self.tier.get("districts", self._loader("new")), "new")
+
+    @override_settings(LOCAL_CACHE_TTL=0)
+    def test_local_ttl_expires_copies(self):
+        self.tier.invalidate("districts")
+        load = self._loader("value")
+
+        self.tier.get("districts", load)
+        self.tier.get("districts", load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_least_recently_used_is_evicted(self):
+        for key in ("a", "b", "c"):
+            self.tier.invalidate(key)
+            self.tier.get(key, self._loader(key))
+
+        load = self._loader("a")
+        self.tier.get("a", load)
+        load.assert_called_once()
+
+        load = self._loader("c")
+        self.tier.get("c", load)
+        load.assert_not_called()
@@ -0,0 +1,75 @@
+import time
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from travel.services.district_metrics import DistrictMetrics
+from travel.services.weather_service import WeatherService, WEATHER_GENERATION_KEY
+from travel.tests.weather_fixtures import weather_entry
+
+DHAKA = {"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+SYLHET = {"name": "Sylhet", "lat": 24.8949, "long": 91.8687}
+
+
+def write_live(district_name, temperature, fetched_at=None):
+    record = DistrictMetrics(date(2024, 1, 1), (temperature,), (50.0,), time.time() if fetched_at is None else fetched_at)
+    cache.set(WeatherService.METRICS_KEY_TEMPLATE.format(district_name=district_name), record.pack())
+
+
+@override_settings(WEATHER_GENERATION_MIN_COMPLETENESS=1.0)
+class WeatherGenerationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def _temperatures(self, service):
+        return {r["district_name"]: r["metrics"].temperatures[0] for r in service.batch_get_metrics([DHAKA, SYLHET])}
+
+    def test_readers_see_the_published_generation_only(self):
+        generation = WeatherService().publish_generation(
+            [weather_entry("Dhaka", 25.0), weather_entry("Sylhet", 20.0)], expected=2
+        )
+
+        # A refresh overwriting live records one by one does not leak into the published set
+        write_live("Dhaka", 35.0)
+
+        self.assertEqual(cache.get(WEATHER_GENERATION_KEY), generation)
+        self.assertEqual(self._temperatures(WeatherService()), {"Dhaka": 25.0, "Sylhet": 20.0})
+
+    def test_pointer_is_resolved_once_per_service(self):
+        WeatherService().publish_generation([weather_entry("Dhaka", 25.0), weather_entry("Sylhet", 20.0)], expected=2)
+        request_service = WeatherService()
+        request_service.current_generation()
+
+        WeatherService().publish_generation([weather_entry("Dhaka", 30.0), weather_entry("Sylhet", 22.0)], expected=2)
+
+        self.assertEqual(self._temperatures(request_service), {"Dhaka": 25.0, "Sylhet": 20.0})
+        self.assertEqual(self._temperatures(WeatherService()), {"Dhaka": 30.0, "Sylhet": 22.0})
+
+    def test_incomplete_refresh_keeps_previous_generation(self):
+        first = WeatherService().publish_generation(
+            [weather_entry("Dhaka", 25.0), weather_entry("Sylhet", 20.0)], expected=2
+        )
+
+        second = WeatherService().publish_generation([weather_entry("Dhaka", 30.0)], expected=2)
+
+        self.assertIsNone(second)
+        self.assertEqual(cache.get(WEATHER_GENERATION_KEY), first)
+
+    @override_settings(WEATHER_GENERATION_MIN_COMPLETENESS=0.5)
+    def test_district_missing_from_generation_uses_live_record(self):
+        WeatherService().publish_generation([weather_entry("Dhaka", 25.0)], expected=2)
+        write_live("Sylhet", 21.0)
+
+        self.assertEqual(self._temperatures(WeatherService()), {"Dhaka": 25.0, "Sylhet": 21.0})
+
+    def test_stale_generation_record_yields_to_newer_live_record(self):
+        service = WeatherService()
+        stale = time.time() - service.cache_ttl - 60
+        service.publish_generation([weather_entry("Dhaka", 25.0, fetched_at=stale), weather_entry("Sylhet", 20.0)], expected=2)
+        write_live("Dhaka", 27.0)
+
+        self.assertEqual(WeatherService().get_district_metrics(district=DHAKA).temperatures, (27.0,))
@@ -0,0 +1,121 @@
+import time
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+
+from travel.services.district_metrics import DistrictMetrics
+from travel.services.recommend_service import RecommendService
+from travel.services.weather_matrix import DistrictWeatherMatrix, district_weather_matrix
+from travel.services.weather_service import WEATHER_DATA_VERSION_KEY
+from travel_recommender.services.freshness import track_freshness
+
+
+def record(start, temperatures, pm25, pm10=(), fetched_at=None):
+    return DistrictMetrics(
+        start_date=start,
+        temperatures=temperatures,
+        pm25=pm25,
+        pm10=pm10,
+        fetched_at=time.time() if fetched_at is None else fetched_at,
+    )
+
+
+class DistrictWeatherMatrixTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        district_weather_matrix.reset()
+        self.records = {
+            "Dhaka": record(date(2024, 1, 1), (30.0, 31.0, None), (100.0, 110.0, 120.0), (150.0, 160.0, 170.0)),
+            "Sylhet": record(date(2024, 1, 2), (20.0, 22.0), (30.0, 40.0)),
+        }
+
+    def tearDown(self):
+        cache.clear()
+        district_weather_matrix.reset()
+
+    def test_records_are_aligned_on_one_day_axis(self):
+        matrix = DistrictWeatherMatrix.build(self.records, version=1)
+
+        self.assertEqual(matrix.values.shape, (2, 3, 3))
+        self.assertEqual(matrix.start_date, date(2024, 1, 1))
+        self.assertEqual(matrix.value("Dhaka", date(2024, 1, 2), matrix.PM10), 160.0)
+        self.assertEqual(matrix.value("Sylhet", date(2024, 1, 3), matrix.TEMPERATURE), 22.0)
+        self.assertIsNone(matrix.value("Sylhet", date(2024, 1, 1), matrix.TEMPERATURE))
+        self.assertIsNone(matrix.value("Sylhet", date(2024, 1, 2), matrix.PM10))
+        self.assertIsNone(matrix.value("Khulna", date(2024, 1, 2), matrix.TEMPERATURE))
+        self.assertIsNone(matrix.value("Dhaka", date(2024, 1, 9), matrix.TEMPERATURE))
+
+    def test_averages_skip_missing_samples(self):
+        matrix = DistrictWeatherMatrix.build(self.records, version=1)
+
+        averages = matrix.averages()
+        dhaka = averages[matrix.rows["Dhaka"]]
+        self.assertEqual((dhaka[matrix.TEMPERATURE], dhaka[matrix.PM25]), (30.5, 110.0))
+
+        window = matrix.averages(date(2024, 1, 1), date(2024, 1, 1))
+        self.assertEqual(window[matrix.rows["Dhaka"], matrix.TEMPERATURE], 30.0)
+        self.assertTrue(all(value != value for value in window[matrix.rows["Sylhet"]]))
+
+    def test_matrix_is_read_only(self):
+        matrix = DistrictWeatherMatrix.build(self.records, version=1)
+
+        with self.assertRaises(ValueError):
+            matrix.values[0, 0, 0] = 1.0
+
+    def test_unchanged_rows_are_reused(self):
+        previous = DistrictWeatherMatrix.build(self.records, version=1)
+
+        updated = {**self.records, "Sylhet": record(date(2024, 1, 2), (25.0, 26.0), (30.0, 40.0))}
+        with patch("travel.services.weather_matrix.logger") as mock_logger:
+            matrix = DistrictWeatherMatrix.build(updated, version=2, previous=previous)
+
+        mock_logger.info.assert_called_once_with("weather_matrix_built", districts=2, days=3, reused_rows=1)
+        self.assertEqual(matrix.value("Dhaka", date(2024, 1, 2), matrix.PM25), 110.0)
+        self.assertEqual(matrix.value("Sylhet", date(2024, 1, 2), matrix.TEMPERATURE), 25.0)
+
+    def test_shared_matrix_follows_the_weather_version(self):
+        loads = []
+
+        def load():
+            loads.append(1)
+            return self.records
+
+        first = district_weather_matrix.get(1.0, load)
+        self.assertIs(district_weather_matrix.get(1.0, load), first)
+        self.assertIsNot(district_weather_matrix.get(2.0, load), first)
+        self.assertEqual(len(loads), 2)
+
+        self.assertIsNone(district_weather_matrix.get(None, load))
+        self.assertEqual(len(loads), 2)
+
+    @override_settings(LOCAL_CACHE_TTL=0)
+    def test_shared_matrix_expires_with_the_local_ttl(self):
+        district_weather_matrix.update(1.0, self.records)
+        time.sleep(0.01)
+
+        self.assertIsNone(district_weather_matrix.current(1.0))
+
+    @patch('travel.services.recommend_service.WeatherService')
+    @patch('travel.services.recommend_service.DistrictService')
+    def test_recommend_reads_the_matrix_once_per_request(self, mock_district_service, mock_weather_service):
+        cache.set(WEATHER_DATA_VERSION_KEY, 1.0)
+        mock_district_service.return_value.get_all_districts.return_value = [{"name": "Dhaka"}, {"name": "Sylhet"}]
+        mock_weather_service.return_value.read_metrics.return_value = self.records
+        mock_weather_service.return_value.cache_ttl = 3600
+
+        self.records["Sylhet"] = record(date(2024, 1, 2), (20.0, 22.0), (30.0, 40.0), fetched_at=time.time() - 600)
+
+        service = RecommendService()
+        with track_freshness() as freshness:
+            dhaka = service._fetch_metrics_for_date("Dhaka", 23.8, 90.4, date(2024, 1, 2))
+            sylhet = service._fetch_metrics_for_date("Sylhet", 24.9, 91.9, date(2024, 1, 2))
+
+        self.assertEqual(dhaka, {"temp": 31.0, "pm25": 110.0})
+        self.assertEqual(sylhet, {"temp": 20.0, "pm25": 30.0})
+        self.assertGreaterEqual(freshness.data_age_seconds, 600)
+        self.assertFalse(freshness.stale)
+        mock_weather_service.return_value.read_metrics.assert_called_once()
+        mock_weather_service.return_value.get_district_metrics.assert_not_called()
+        mock_weather_service.return_value.get_weather_for_district.assert_not_called()
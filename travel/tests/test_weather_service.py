@@ -1,9 +1,14 @@
-from django.test import TestCase
+import time
+
+from django.test import TestCase, override_settings
 from django.core.cache import cache
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
+from asgiref.sync import async_to_sync
 from rest_framework import status
 
+from travel.services.weather_projection import FULL_PROJECTION, MIDDAY_PROJECTION
 from travel.services.weather_service import WeatherService
+from travel.tests.stub_http_server import StubHTTPServer
 
 
 class WeatherServiceTest(TestCase):
@@ -76,12 +81,13 @@ class WeatherServiceTest(TestCase):
 
         self.assertEqual(weather1, weather2)
 
-    @patch.object(WeatherService, 'get_weather_for_district')
-    def test_batch_get_weather(self, mock_get_weather):
-        mock_get_weather.return_value = {
-            "district_name": "Dhaka",
+    @patch.object(WeatherService, '_fetch_weather')
+    def test_batch_get_weather(self, mock_fetch_weather):
+        mock_fetch_weather.side_effect = lambda name, lat, lon, projection: {
+            "district_name": name,
             "forecast": self.mock_forecast,
-            "air_quality": self.mock_air_quality
+            "air_quality": self.mock_air_quality,
+            "fetched_at": time.time(),
         }
 
         districts = [
@@ -92,4 +98,419 @@ class WeatherServiceTest(TestCase):
         results = self.service.batch_get_weather(districts)
 
         self.assertEqual(len(results), 2)
-        self.assertEqual(mock_get_weather.call_count, 2)
\ No newline at end of file
+        self.assertEqual(mock_fetch_weather.call_count, 2)
+        self.assertIsNotNone(cache.get("weather:Chittagong"))
+
+    @patch('travel.services.weather_service.ThreadPoolExecutor')
+    @patch.object(WeatherService, '_fetch_weather')
+    def test_warm_batch_is_one_round_trip(self, mock_fetch_weather, mock_executor):
+        districts = [{"name": f"District{i}", "lat": 23.0, "long": 90.0} for i in range(64)]
+        cache.set_many({
+            f"weather:District{i}": {
+                "district_name": f"District{i}",
+                "forecast": self.mock_forecast,
+                "air_quality": self.mock_air_quality,
+                "fetched_at": time.time(),
+            }
+            for i in range(64)
+        })
+
+        with patch('travel.services.weather_service.cache', wraps=cache) as mock_cache:
+            results = self.service.batch_get_weather(districts)
+
+        self.assertEqual(len(results), 64)
+        mock_cache.get_many.assert_called_once()
+        mock_cache.get.assert_not_called()
+        mock_cache.set_many.assert_not_called()
+        mock_executor.assert_not_called()
+        mock_fetch_weather.assert_not_called()
+
+    @patch.object(WeatherService, '_fetch_weather')
+    def test_refresh_stale_refetches_and_writes_once(self, mock_fetch_weather):
+        mock_fetch_weather.side_effect = lambda name, lat, lon, projection: {
+            "district_name": name,
+            "forecast": self.mock_forecast,
+            "air_quality": self.mock_air_quality,
+            "fetched_at": time.time(),
+        }
+        cache.set("weather:Dhaka", {
+            "district_name": "Dhaka",
+            "forecast": self.mock_forecast,
+            "air_quality": self.mock_air_quality,
+            "fetched_at": time.time() - self.service.cache_ttl - 60,
+        })
+        districts = [
+            {"name": "Dhaka", "lat": 23.8103, "long": 90.4125},
+            {"name": "Sylhet", "lat": 24.8949, "long": 91.8687},
+        ]
+
+        with patch('travel.services.weather_service.cache', wraps=cache) as mock_cache:
+            results = self.service.batch_get_weather(districts, refresh_stale=True)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(mock_fetch_weather.call_count, 2)
+        mock_cache.set_many.assert_called_once()
+        self.assertFalse(self.service._is_stale(cache.get("weather:Dhaka")["fetched_at"]))
+
+    def _multi_location_response(self, params):
+        count = len(str(params["latitude"]).split(","))
+        payload = self.mock_forecast if params["hourly"] == WeatherService.FORECAST_HOURLY else self.mock_air_quality
+
+        mock_response = MagicMock()
+        mock_response.status_code = status.HTTP_200_OK
+        mock_response.data = [payload] * count if count > 1 else payload
+        return mock_response
+
+    @override_settings(WEATHER_BATCH_SIZE=2)
+    def test_batch_get_weather_multi_location(self):
+        service = WeatherService()
+        service.api_service = MagicMock()
+        service.api_service.handle_get.side_effect = lambda url, params: self._multi_location_response(params)
+
+        districts = [
+            {"name": "Dhaka", "lat": 23.8103, "long": 90.4125},
+            {"name": "Chittagong", "lat": 22.3569, "long": 91.7832},
+            {"name": "Sylhet", "lat": 24.8949, "long": 91.8687},
+        ]
+
+        results = service.batch_get_weather(districts)
+
+        self.assertEqual(len(results), 3)
+        # 2 chunks x (forecast + air quality)
+        self.assertEqual(service.api_service.handle_get.call_count, 4)
+        self.assertEqual(cache.get("weather:Sylhet")["forecast"], self.mock_forecast)
+
+        service.api_service.handle_get.reset_mock()
+        service.batch_get_weather(districts)
+        service.api_service.handle_get.assert_not_called()
+
+    @override_settings(WEATHER_BATCH_SIZE=10)
+    def test_batch_get_weather_multi_location_length_mismatch(self):
+        service = WeatherService()
+        service.api_service = MagicMock()
+
+        mock_response = MagicMock()
+        mock_response.status_code = status.HTTP_200_OK
+        mock_response.data = [self.mock_forecast]
+        service.api_service.handle_get.return_value = mock_response
+
+        results = service.batch_get_weather([
+            {"name": "Dhaka", "lat": 23.8103, "long": 90.4125},
+            {"name": "Chittagong", "lat": 22.3569, "long": 91.7832},
+        ])
+
+        self.assertEqual(results, [])
+        self.assertIsNone(cache.get("weather:Dhaka"))
+
+    def _stub_routes(self):
+        return {
+            "/forecast": lambda query, headers: (200, self.mock_forecast),
+            "/air-quality": lambda query, headers: (200, self.mock_air_quality),
+        }
+
+    def test_async_batch_get_weather_against_stub_server(self):
+        districts = [{"name": f"District{i}", "lat": 23.0 + i / 10, "long": 90.0} for i in range(6)]
+
+        with StubHTTPServer(self._stub_routes(), delay=0.05) as server:
+            with override_settings(OPEN_METEO_BASE_URL=server.base_url, OPEN_METEO_AIR_QUALITY_BASE_URL=server.base_url):
+                service = WeatherService()
+                results = async_to_sync(service.async_batch_get_weather)(districts, max_concurrency=2)
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(server.request_count, 12)
+        # 2 districts in flight, each fetching forecast and air quality together
+        self.assertLessEqual(server.max_in_flight, 4)
+        cached = cache.get("weather:District0")
+        self.assertEqual(cached["forecast"], self.mock_forecast)
+        self.assertEqual(cached["air_quality"], self.mock_air_quality)
+
+    def test_async_get_weather_for_district_partial_and_cached(self):
+        routes = {
+            "/forecast": lambda query, headers: (200, self.mock_forecast),
+            "/air-quality": lambda query, headers: (500, {"error": "boom"}),
+        }
+        district = {"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+
+        with StubHTTPServer(routes) as server:
+            with override_settings(OPEN_METEO_BASE_URL=server.base_url, OPEN_METEO_AIR_QUALITY_BASE_URL=server.base_url):
+                service = WeatherService()
+                weather = async_to_sync(service.async_get_weather_for_district)(district=district)
+                sync_weather = service.get_weather_for_district(district=district)
+
+        self.assertEqual(weather["forecast"], self.mock_forecast)
+        self.assertIsNone(weather["air_quality"])
+        self.assertEqual(weather, sync_weather)
+        self.assertEqual(server.request_count, 2)
+
+    @override_settings(WEATHER_ASYNC_FETCH=True)
+    @patch.object(WeatherService, '_async_fetch_weather')
+    def test_batch_get_weather_uses_async_path(self, mock_get_weather):
+        mock_get_weather.return_value = {
+            "district_name": "Dhaka",
+            "forecast": self.mock_forecast,
+            "air_quality": None,
+            "fetched_at": time.time(),
+        }
+
+        results = WeatherService().batch_get_weather([{"name": "Dhaka", "lat": 23.8103, "long": 90.4125}])
+
+        self.assertEqual(len(results), 1)
+        mock_get_weather.assert_called_once()
+
+    @override_settings(CONCURRENT_UPSTREAM_FETCH=True, UPSTREAM_DEADLINE=0.2)
+    @patch.object(WeatherService, 'get_forecast')
+    @patch.object(WeatherService, 'get_air_quality')
+    def test_get_weather_for_district_concurrent_partial(self, mock_air, mock_forecast):
+        mock_forecast.return_value = self.mock_forecast
+        mock_air.side_effect = lambda **kwargs: time.sleep(0.5) or self.mock_air_quality
+
+        weather = WeatherService().get_weather_for_district(
+            district={"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+        )
+
+        self.assertEqual(weather["forecast"], self.mock_forecast)
+        self.assertIsNone(weather["air_quality"])
+
+    @override_settings(
+        CONCURRENT_UPSTREAM_FETCH=True,
+        UPSTREAM_DEADLINE=0.2,
+        WEATHER_PARTIAL_CACHE_TTL=60,
+        WEATHER_SNAPSHOTS_ENABLED=True
+    )
+    @patch('travel.services.weather_service.weather_snapshots')
+    @patch('travel.services.weather_service.cache')
+    @patch.object(WeatherService, 'get_forecast')
+    @patch.object(WeatherService, 'get_air_quality')
+    def test_deadline_cut_entry_is_cached_briefly_without_snapshot(
+            self,
+            mock_air,
+            mock_forecast,
+            mock_cache,
+            mock_snapshots
+    ):
+        mock_cache.get.return_value = None
+        mock_cache.get_many.return_value = {}
+        mock_snapshots.load.return_value = {}
+        mock_forecast.return_value = self.mock_forecast
+        mock_air.side_effect = lambda **kwargs: time.sleep(0.5) or self.mock_air_quality
+
+        WeatherService().get_weather_for_district(district={"name": "Dhaka", "lat": 23.8103, "long": 90.4125})
+
+        stored = mock_cache.set_many.call_args
+        self.assertEqual(list(stored.args[0]), ["weather:Dhaka"])
+        self.assertEqual(stored.kwargs["timeout"], 60)
+        mock_snapshots.record.assert_not_called()
+
+    @patch.object(WeatherService, 'get_forecast')
+    @patch.object(WeatherService, 'get_air_quality')
+    def test_get_weather_for_district_coalesces_concurrent_misses(self, mock_air, mock_forecast):
+        from concurrent.futures import ThreadPoolExecutor
+
+        mock_forecast.side_effect = lambda **kwargs: time.sleep(0.2) or self.mock_forecast
+        mock_air.return_value = self.mock_air_quality
+        district = {"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(
+                lambda _: self.service.get_weather_for_district(district=district),
+                range(5),
+            ))
+
+        mock_forecast.assert_called_once()
+        self.assertTrue(all(result == results[0] for result in results))
+
+    @patch('travel.services.weather_service.background_refresher')
+    @patch.object(WeatherService, 'get_forecast')
+    def test_stale_entry_is_served_and_refreshed_in_background(self, mock_forecast, mock_refresher):
+        from travel_recommender.services.freshness import track_freshness
+
+        cache.set("weather:Dhaka", {
+            "district_name": "Dhaka",
+            "forecast": self.mock_forecast,
+            "air_quality": self.mock_air_quality,
+            "fetched_at": time.time() - self.service.cache_ttl - 60,
+        })
+
+        with track_freshness() as freshness:
+            weather = self.service.get_weather_for_district(
+                district={"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+            )
+
+        self.assertEqual(weather["forecast"], self.mock_forecast)
+        mock_forecast.assert_not_called()
+        mock_refresher.schedule.assert_called_once_with("weather:Dhaka", ANY)
+        self.assertTrue(freshness.stale)
+        self.assertGreaterEqual(freshness.data_age_seconds, self.service.cache_ttl + 60)
+
+    @patch('travel.services.weather_service.background_refresher')
+    def test_fresh_entry_is_not_refreshed(self, mock_refresher):
+        cache.set("weather:Dhaka", {
+            "district_name": "Dhaka",
+            "forecast": self.mock_forecast,
+            "air_quality": self.mock_air_quality,
+            "fetched_at": time.time(),
+        })
+
+        self.service.get_weather_for_district(district={"name": "Dhaka", "lat": 23.8103, "long": 90.4125})
+
+        mock_refresher.schedule.assert_not_called()
+
+    def test_midday_projection_requests_less_and_caches_separately(self):
+        full_day = {
+            "hourly": {
+                "time": ["2024-01-01T13:00", "2024-01-01T14:00", "2024-01-01T15:00"],
+                "temperature_2m": [24.0, 25.5, 25.0],
+            }
+        }
+        queries = []
+
+        def forecast_route(query, headers):
+            queries.append(query)
+            return 200, full_day
+
+        routes = {
+            "/forecast": forecast_route,
+            "/air-quality": lambda query, headers: (200, self.mock_air_quality),
+        }
+        district = {"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+
+        with StubHTTPServer(routes) as server:
+            with override_settings(OPEN_METEO_BASE_URL=server.base_url, OPEN_METEO_AIR_QUALITY_BASE_URL=server.base_url):
+                weather = WeatherService().get_weather_for_district(district=district, projection=MIDDAY_PROJECTION)
+
+        self.assertEqual(weather["forecast"]["hourly"], {"time": ["2024-01-01T14:00"], "temperature_2m": [25.5]})
+        self.assertIsNone(cache.get("weather:Dhaka"))
+        self.assertIsNotNone(cache.get("weather:Dhaka" + MIDDAY_PROJECTION.cache_suffix))
+
+    def test_day_projection_uses_hour_window(self):
+        from datetime import date
+
+        projection = MIDDAY_PROJECTION.for_day(date(2024, 1, 2))
+        params = self.service._build_params(lat=1, lon=2, hourly=projection.air_quality_hourly, projection=projection)
+
+        self.assertEqual(params["hourly"], "pm2_5,pm10")
+        self.assertEqual(params["start_hour"], "2024-01-02T14:00")
+        self.assertEqual(params["end_hour"], "2024-01-02T14:00")
+        self.assertNotIn("forecast_days", params)
+
+        full_params = self.service._build_params(lat=1, lon=2, hourly=FULL_PROJECTION.air_quality_hourly)
+        self.assertEqual(full_params["hourly"], "pm2_5,pm10")
+        self.assertEqual(full_params["forecast_days"], WeatherService.FORECAST_DAYS)
+
+    @patch.object(WeatherService, 'get_forecast')
+    @patch.object(WeatherService, 'get_air_quality')
+    def test_narrow_projection_is_served_from_wider_entry(self, mock_air, mock_forecast):
+        from datetime import date
+
+        cache.set("weather:Dhaka" + MIDDAY_PROJECTION.cache_suffix, {
+            "district_name": "Dhaka",
+            "forecast": self.mock_forecast,
+            "air_quality": self.mock_air_quality,
+            "fetched_at": time.time(),
+        })
+
+        weather = self.service.get_weather_for_district(
+            district={"name": "Dhaka", "lat": 23.8103, "long": 90.4125},
+            projection=MIDDAY_PROJECTION.for_day(date(2024, 1, 2)),
+        )
+
+        self.assertEqual(weather["forecast"], self.mock_forecast)
+        mock_forecast.assert_not_called()
+        mock_air.assert_not_called()
+
+    def test_projection_cover_rules(self):
+        from datetime import date
+
+        day = MIDDAY_PROJECTION.for_day(date(2024, 1, 2))
+
+        self.assertTrue(FULL_PROJECTION.covers(MIDDAY_PROJECTION))
+        self.assertTrue(MIDDAY_PROJECTION.covers(day))
+        self.assertFalse(MIDDAY_PROJECTION.covers(FULL_PROJECTION))
+        self.assertFalse(day.covers(MIDDAY_PROJECTION))
+
+    def test_metric_record_is_written_and_read_in_bulk(self):
+        routes = {
+            "/forecast": lambda query, headers: (200, self.mock_forecast),
+            "/air-quality": lambda query, headers: (200, self.mock_air_quality),
+        }
+        districts = [{"name": "Dhaka", "lat": 23.8103, "long": 90.4125}]
+
+        with StubHTTPServer(routes) as server:
+            with override_settings(OPEN_METEO_BASE_URL=server.base_url, OPEN_METEO_AIR_QUALITY_BASE_URL=server.base_url):
+                service = WeatherService()
+                first = service.batch_get_metrics(districts)
+                second = service.batch_get_metrics(districts)
+
+        self.assertIn("forecast", first[0])
+        self.assertEqual(server.request_count, 2)
+
+        record = second[0]["metrics"]
+        self.assertEqual(record.temperatures, (25.5, 26.0))
+        self.assertEqual(record.pm25, (50.0, 55.0))
+
+        packed = cache.get("metrics:Dhaka")
+        raw = cache.get("weather:Dhaka" + MIDDAY_PROJECTION.cache_suffix)
+        self.assertIsInstance(packed, bytes)
+        self.assertLess(len(packed), 200)
+        self.assertIsNotNone(raw)
+
+    def test_day_projection_does_not_write_metric_record(self):
+        from datetime import date
+
+        routes = {
+            "/forecast": lambda query, headers: (200, self.mock_forecast),
+            "/air-quality": lambda query, headers: (200, self.mock_air_quality),
+        }
+        district = {"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+
+        with StubHTTPServer(routes) as server:
+            with override_settings(OPEN_METEO_BASE_URL=server.base_url, OPEN_METEO_AIR_QUALITY_BASE_URL=server.base_url):
+                service = WeatherService()
+                service.get_weather_for_district(district=district, projection=MIDDAY_PROJECTION.for_day(date(2024, 1, 2)))
+
+                self.assertIsNone(service.get_district_metrics(district=district))
+
+    def test_whole_window_write_bumps_weather_version(self):
+        from datetime import date
+        from travel.services.weather_service import WEATHER_DATA_VERSION_KEY
+
+        data = {
+            "district_name": "Dhaka",
+            "forecast": self.mock_forecast,
+            "air_quality": self.mock_air_quality,
+            "fetched_at": 1.0,
+        }
+
+        self.service._store_many(MIDDAY_PROJECTION.for_day(date(2024, 1, 1)), [data])
+        self.assertIsNone(cache.get(WEATHER_DATA_VERSION_KEY))
+
+        self.service._store_many(MIDDAY_PROJECTION, [data])
+        self.assertIsNotNone(cache.get(WEATHER_DATA_VERSION_KEY))
+
+    def test_single_district_write_keeps_weather_version(self):
+        from travel.services.weather_service import WEATHER_DATA_VERSION_KEY
+
+        data = {
+            "district_name": "Dhaka",
+            "forecast": self.mock_forecast,
+            "air_quality": self.mock_air_quality,
+            "fetched_at": 1.0,
+        }
+
+        # e.g. a background refresh of one stale district
+        self.service._store("Dhaka", MIDDAY_PROJECTION, data)
+
+        self.assertIsNone(cache.get(WEATHER_DATA_VERSION_KEY))
+        self.assertIsNotNone(self.service.get_district_metrics(district={"name": "Dhaka", "lat": 23.8, "long": 90.4}))
+
+    def test_grid_cell_write_keeps_weather_version(self):
+        from travel.services.location_grid import GridCell
+        from travel.services.weather_service import WEATHER_DATA_VERSION_KEY
+
+        cell = GridCell.snap(23.81, 90.41, 0.1).name
+        data = {"district_name": cell, "forecast": self.mock_forecast, "air_quality": self.mock_air_quality, "fetched_at": 1.0}
+
+        self.service._store_many(MIDDAY_PROJECTION, [data])
+
+        self.assertIsNone(cache.get(WEATHER_DATA_VERSION_KEY))
+        self.assertIsNotNone(self.service.get_district_metrics(district={"name": cell, "lat": 23.8, "long": 90.4}))
@@ -0,0 +1,80 @@
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from travel.models import WeatherSnapshot
+from travel.services.weather_projection import FULL_PROJECTION, MIDDAY_PROJECTION
+from travel.services.weather_service import WeatherService
+from travel.tests.weather_fixtures import weather_entry
+
+DHAKA = {"name": "Dhaka", "lat": 23.8103, "long": 90.4125}
+SYLHET = {"name": "Sylhet", "lat": 24.8949, "long": 91.8687}
+
+
+@override_settings(WEATHER_SNAPSHOTS_ENABLED=True, WEATHER_SNAPSHOT_MAX_AGE=3600)
+class WeatherSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_fetch_is_recorded_and_rehydrates_after_cache_loss(self):
+        service = WeatherService()
+        with patch.object(WeatherService, '_fetch_weather', return_value=weather_entry("Dhaka")):
+            fetched = service.get_weather_for_district(district=DHAKA)
+
+        self.assertTrue(WeatherSnapshot.objects.filter(cache_key="weather:Dhaka").exists())
+
+        cache.clear()
+        with patch.object(WeatherService, '_fetch_weather') as mock_fetch:
+            restored = service.get_weather_for_district(district=DHAKA)
+
+        mock_fetch.assert_not_called()
+        self.assertEqual(restored, fetched)
+        self.assertIsNotNone(cache.get("weather:Dhaka"))
+        # The derived metric record is rebuilt from the snapshot too
+        self.assertIsNotNone(service.get_district_metrics(district=DHAKA))
+
+    def test_batch_rehydrates_misses_and_fetches_the_rest(self):
+        WeatherSnapshot.objects.create(
+            cache_key="weather:Dhaka", district_name="Dhaka", payload=weather_entry("Dhaka"), fetched_at=time.time()
+        )
+
+        with patch.object(WeatherService, '_fetch_weather', side_effect=lambda name, *args: weather_entry(name)) as mock_fetch:
+            results = WeatherService().batch_get_weather([DHAKA, SYLHET], projection=MIDDAY_PROJECTION)
+
+        self.assertEqual(sorted(r["district_name"] for r in results), ["Dhaka", "Sylhet"])
+        self.assertEqual([c.args[0] for c in mock_fetch.call_args_list], ["Sylhet"])
+
+    def test_snapshots_older_than_max_age_are_ignored(self):
+        old = time.time() - 7200
+        WeatherSnapshot.objects.create(
+            cache_key="weather:Dhaka", district_name="Dhaka", payload=weather_entry("Dhaka", fetched_at=old), fetched_at=old
+        )
+
+        with patch.object(WeatherService, '_fetch_weather', return_value=weather_entry("Dhaka")) as mock_fetch:
+            WeatherService().get_weather_for_district(district=DHAKA, projection=FULL_PROJECTION)
+
+        mock_fetch.assert_called_once()
+
+    def test_load_command_restores_and_skips_cached_keys(self):
+        for district in (DHAKA, SYLHET):
+            WeatherSnapshot.objects.create(
+                cache_key=f"weather:{district['name']}",
+                district_name=district["name"],
+                payload=weather_entry(district["name"]),
+                fetched_at=time.time(),
+            )
+        cache.set("weather:Sylhet", weather_entry("Sylhet"))
+
+        out = StringIO()
+        call_command("load_weather_snapshots", stdout=out)
+
+        self.assertIn("restored=1, skipped=1", out.getvalue())
+        self.assertEqual(cache.get("weather:Dhaka")["district_name"], "Dhaka")
+        self.assertIsNotNone(cache.get("metrics:Dhaka"))
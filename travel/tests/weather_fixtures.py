@@ -0,0 +1,17 @@
+import time
+
+
+def weather_entry(district_name, temperature=25.5, *, fetched_at=None):
+    """
+    A cached weather entry for ``district_name`` with one 14:00 sample of
+    every metric, fetched now unless ``fetched_at`` is given.
+
+    Not a drop-in ``_fetch_weather`` side effect: wrap it so the
+    coordinates aren't taken for ``temperature``.
+    """
+    return {
+        "district_name": district_name,
+        "forecast": {"hourly": {"time": ["2024-01-01T14:00"], "temperature_2m": [temperature]}},
+        "air_quality": {"hourly": {"time": ["2024-01-01T14:00"], "pm2_5": [50.0], "pm10": [80.0]}},
+        "fetched_at": time.time() if fetched_at is None else fetched_at,
+    }
@@ -1,10 +1,14 @@
 from django.urls import path
 
+from travel.views.batch_recommend_view import BatchRecommendationAPIView
 from travel.views.best_districts_view import BestDistrictsAPIView
+from travel.views.best_travel_day_view import BestTravelDayAPIView
 from travel.views.recommend_view import TravelRecommendationAPIView
 
 
 urlpatterns = [
     path("best-districts/", BestDistrictsAPIView.as_view(), name=BestDistrictsAPIView.api_name),
     path("recommend/", TravelRecommendationAPIView.as_view(), name=TravelRecommendationAPIView.api_name),
+    path("recommend/batch/", BatchRecommendationAPIView.as_view(), name=BatchRecommendationAPIView.api_name),
+    path("recommend/best-day/", BestTravelDayAPIView.as_view(), name=BestTravelDayAPIView.api_name),
 ]
@@ -0,0 +1,33 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from structlog import get_logger
+
+from travel.serializers.recommend_serializer import BatchRecommendSerializer
+from travel.services.recommend_service import RecommendService
+from travel_recommender.services.freshness import track_freshness
+
+logger = get_logger(__name__)
+
+
+class BatchRecommendationAPIView(APIView):
+    api_name = "recommend_batch"
+
+    def get(self, request):
+        serializer = BatchRecommendSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        validated_data = serializer.validated_data
+
+        logger.info("batch_recommendation_request_received", data=validated_data)
+
+        service = RecommendService()
+        with track_freshness() as freshness:
+            result = service.recommend_batch(
+                current_lat=validated_data["current_lat"],
+                current_lon=validated_data["current_lon"],
+                destination_names=validated_data["destinations"],
+                start_date=validated_data["start_date"],
+                end_date=validated_data["end_date"],
+            )
+
+        return Response({**result, "freshness": freshness.as_dict()}, status=status.HTTP_200_OK)
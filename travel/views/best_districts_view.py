@@ -5,6 +5,7 @@ from structlog import get_logger
 
 from travel.serializers.best_districts_serializer import BestDistrictsSerializer
 from travel.services.best_districts_service import BestDistrictsService
+from travel_recommender.services.freshness import track_freshness
 
 logger = get_logger(__name__)
 
@@ -21,15 +22,18 @@ class BestDistrictsAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        limit = serializer.validated_data["limit"]
+        options = dict(serializer.validated_data)
+        limit = options.pop("limit")
 
         service = BestDistrictsService()
-        result = service.get_best_districts(limit=limit)
+        with track_freshness() as freshness:
+            result = service.get_best_districts(limit=limit, **options)
 
         return Response(
             {
                 "count": len(result),
-                "results": result
+                "results": result,
+                "freshness": freshness.as_dict()
             },
             status=status.HTTP_200_OK
         )
\ No newline at end of file
@@ -0,0 +1,27 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from structlog import get_logger
+
+from travel.serializers.recommend_serializer import BestTravelDaySerializer
+from travel.services.recommend_service import RecommendService
+from travel_recommender.services.freshness import track_freshness
+
+logger = get_logger(__name__)
+
+
+class BestTravelDayAPIView(APIView):
+    api_name = "recommend_best_day"
+
+    def get(self, request):
+        serializer = BestTravelDaySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        validated_data = serializer.validated_data
+
+        logger.info("best_travel_day_request_received", data=validated_data)
+
+        service = RecommendService()
+        with track_freshness() as freshness:
+            result = service.best_travel_day(**validated_data)
+
+        return Response({**result, "freshness": freshness.as_dict()}, status=status.HTTP_200_OK)
@@ -5,6 +5,7 @@ from structlog import get_logger
 
 from travel.serializers.recommend_serializer import RecommendSerializer
 from travel.services.recommend_service import RecommendService
+from travel_recommender.services.freshness import track_freshness
 
 logger = get_logger(__name__)
 
@@ -20,6 +21,7 @@ class TravelRecommendationAPIView(APIView):
         logger.info("recommendation_request_received", data=validated_data)
 
         service = RecommendService()
-        result = service.recommend(**validated_data)
+        with track_freshness() as freshness:
+            result = service.recommend(**validated_data)
 
-        return Response(result, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response({**result, "freshness": freshness.as_dict()}, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 from rest_framework import status
 
 
@@ -9,4 +9,5 @@ class ExtAPIResponseProperty:
         self.status_code: int = status.HTTP_200_OK
         self.actual_error: Optional[str] = None
         self.actual_status_code: Optional[int] = None
-        self.response: Any = None
\ No newline at end of file
+        self.response: Any = None
+        self.headers: Mapping[str, str] = {}
\ No newline at end of file
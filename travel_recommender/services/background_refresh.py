@@ -0,0 +1,66 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Refreshes stale cache entries off the request path.
+
+    At most one refresh runs per key: a pending set deduplicates within the
+    process and a Redis lease (``cache.add``) deduplicates across workers.
+    """
+
+    LEASE_KEY_TEMPLATE = "refresh:{key}"
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cache-refresh")
+            self._pid = pid
+            self._pending = set()
+        return self._executor
+
+    def schedule(self, key: str, refresh: Callable[[], Any]) -> bool:
+        with self._lock:
+            executor = self._get_executor()
+            if key in self._pending:
+                return False
+
+            lease_key = self.LEASE_KEY_TEMPLATE.format(key=key)
+            if not cache.add(lease_key, os.getpid(), timeout=settings.SINGLE_FLIGHT_LEASE_TTL):
+                logger.info("background_refresh_already_running", key=key)
+                return False
+
+            self._pending.add(key)
+
+        logger.info("background_refresh_scheduled", key=key)
+        executor.submit(self._run, key, lease_key, refresh)
+        return True
+
+    def _run(self, key: str, lease_key: str, refresh: Callable[[], Any]):
+        try:
+            refresh()
+        except Exception as e:
+            logger.error("background_refresh_failed", key=key, error=str(e))
+        finally:
+            cache.delete(lease_key)
+            with self._lock:
+                self._pending.discard(key)
+
+
+background_refresher = BackgroundRefresher()
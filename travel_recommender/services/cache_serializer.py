@@ -0,0 +1,139 @@
+import json
+import pickle
+import zlib
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django_redis.serializers.base import BaseSerializer
+from structlog import get_logger
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is in requirements.txt
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = get_logger(__name__)
+
+
+class PayloadCodec:
+    """
+    Self-describing binary encoding for cached values.
+
+    Every value starts with a 3-byte header: format version, serializer id and
+    compression id. Readers decode whatever the header says, not what they are
+    configured to write, so workers on different settings (or a rolling
+    deploy) can read each other's entries. Values written before this format
+    existed are plain pickles and are still read.
+
+    Values the configured serializer cannot represent (bytes under JSON,
+    arbitrary objects) fall back to pickle. Both JSON and msgpack return
+    tuples as lists.
+    """
+
+    FORMAT_VERSION = 1
+    SERIALIZERS = {"pickle": 0, "json": 1, "msgpack": 2}
+    COMPRESSIONS = {"none": 0, "zlib": 1, "lz4": 2}
+    # Level 1 keeps most of the size win at a fraction of the default level's CPU
+    ZLIB_LEVEL = 1
+    # Every pickle protocol >= 2 stream starts with the PROTO opcode
+    PICKLE_PROTO = 0x80
+
+    def __init__(self, serializer: str = "msgpack", compression: str = "none", compress_min_bytes: int = 1024):
+        if serializer not in self.SERIALIZERS:
+            raise ImproperlyConfigured(f"Unknown cache serializer '{serializer}'")
+        if compression not in self.COMPRESSIONS:
+            raise ImproperlyConfigured(f"Unknown cache compression '{compression}'")
+        if serializer == "msgpack" and msgpack is None:
+            raise ImproperlyConfigured("CACHE_SERIALIZER=msgpack requires the msgpack package")
+        if compression == "lz4" and lz4_frame is None:
+            raise ImproperlyConfigured("CACHE_COMPRESSION=lz4 requires the lz4 package")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+
+    @staticmethod
+    def _dumps(serializer: str, value: Any) -> bytes:
+        if serializer == "msgpack":
+            return msgpack.packb(value, use_bin_type=True)
+        if serializer == "json":
+            return json.dumps(value, separators=(",", ":"), allow_nan=True).encode()
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads(serializer_id: int, body: bytes) -> Any:
+        if serializer_id == PayloadCodec.SERIALIZERS["msgpack"]:
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        if serializer_id == PayloadCodec.SERIALIZERS["json"]:
+            return json.loads(body)
+        return pickle.loads(body)
+
+    def _compress(self, body: bytes) -> tuple[int, bytes]:
+        if self.compression == "none" or len(body) < self.compress_min_bytes:
+            return self.COMPRESSIONS["none"], body
+        if self.compression == "lz4":
+            return self.COMPRESSIONS["lz4"], lz4_frame.compress(body)
+        return self.COMPRESSIONS["zlib"], zlib.compress(body, self.ZLIB_LEVEL)
+
+    @classmethod
+    def _decompress(cls, compression_id: int, body: bytes) -> bytes:
+        if compression_id == cls.COMPRESSIONS["zlib"]:
+            return zlib.decompress(body)
+        if compression_id == cls.COMPRESSIONS["lz4"]:
+            if lz4_frame is None:
+                raise ValueError("entry is lz4-compressed but lz4 is not installed")
+            return lz4_frame.decompress(body)
+        return body
+
+    def encode(self, value: Any) -> bytes:
+        serializer = self.serializer
+        try:
+            body = self._dumps(serializer, value)
+        except (TypeError, ValueError):
+            serializer = "pickle"
+            body = self._dumps(serializer, value)
+
+        compression_id, body = self._compress(body)
+        return bytes((self.FORMAT_VERSION, self.SERIALIZERS[serializer], compression_id)) + body
+
+    def decode(self, data: bytes) -> Optional[Any]:
+        """Decode an entry; returns None (a cache miss) for formats this worker cannot read."""
+        if not data:
+            return None
+
+        if data[0] == self.PICKLE_PROTO:
+            return pickle.loads(data)
+
+        if data[0] != self.FORMAT_VERSION or len(data) < 3:
+            logger.warning("cache_entry_unknown_format", version=data[0])
+            return None
+
+        try:
+            return self._loads(data[1], self._decompress(data[2], data[3:]))
+        except Exception as e:
+            logger.warning("cache_entry_decode_failed", serializer_id=data[1], compression_id=data[2], error=str(e))
+            return None
+
+
+class PayloadSerializer(BaseSerializer):
+    """django-redis serializer backed by ``PayloadCodec`` and the CACHE_* settings."""
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.codec = PayloadCodec(
+            serializer=settings.CACHE_SERIALIZER,
+            compression=settings.CACHE_COMPRESSION,
+            compress_min_bytes=settings.CACHE_COMPRESS_MIN_BYTES,
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        return self.codec.encode(value)
+
+    def loads(self, value: bytes) -> Any:
+        return self.codec.decode(value)
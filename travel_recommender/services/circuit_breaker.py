@@ -0,0 +1,114 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CircuitPermit:
+    host: str
+    is_probe: bool = False
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker whose state lives in Redis, so every worker
+    process backs off from a failing upstream together.
+
+    closed:    requests flow; failures (5xx, transport errors, calls slower than
+               CIRCUIT_BREAKER_SLOW_CALL) are counted in a rolling window.
+    open:      after CIRCUIT_BREAKER_FAILURE_THRESHOLD failures, requests fail
+               fast until CIRCUIT_BREAKER_OPEN_DURATION has passed.
+    half-open: one worker wins a probe lease and tries a real request; success
+               closes the circuit, failure opens it again.
+
+    Redis errors never block traffic: the breaker then behaves as closed.
+    """
+
+    STATE_KEY_TEMPLATE = "circuit:{host}:state"
+    FAILURES_KEY_TEMPLATE = "circuit:{host}:failures"
+    PROBE_KEY_TEMPLATE = "circuit:{host}:probe"
+
+    def acquire(self, host: str) -> Optional[CircuitPermit]:
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return CircuitPermit(host=host)
+
+        try:
+            state = cache.get(self.STATE_KEY_TEMPLATE.format(host=host))
+            if state is None:
+                return CircuitPermit(host=host)
+
+            if time.time() < state["open_until"]:
+                return None
+
+            if cache.add(self.PROBE_KEY_TEMPLATE.format(host=host), 1, timeout=settings.CIRCUIT_BREAKER_OPEN_DURATION):
+                logger.info("circuit_half_open_probe", host=host)
+                return CircuitPermit(host=host, is_probe=True)
+
+            return None
+        except Exception as e:
+            logger.error("circuit_breaker_unavailable", host=host, error=str(e))
+            return CircuitPermit(host=host)
+
+    def record(self, permit: CircuitPermit, *, success: bool, latency: float):
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return
+
+        host = permit.host
+        failed = not success or latency > settings.CIRCUIT_BREAKER_SLOW_CALL
+
+        try:
+            if permit.is_probe:
+                cache.delete(self.PROBE_KEY_TEMPLATE.format(host=host))
+                if failed:
+                    self._open(host)
+                else:
+                    cache.delete_many([
+                        self.STATE_KEY_TEMPLATE.format(host=host),
+                        self.FAILURES_KEY_TEMPLATE.format(host=host),
+                    ])
+                    logger.info("circuit_closed", host=host)
+                return
+
+            if not failed:
+                return
+
+            failures_key = self.FAILURES_KEY_TEMPLATE.format(host=host)
+            cache.add(failures_key, 0, timeout=settings.CIRCUIT_BREAKER_WINDOW)
+            failures = cache.incr(failures_key)
+
+            if failures >= settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+                self._open(host)
+                cache.delete(failures_key)
+        except Exception as e:
+            logger.error("circuit_breaker_unavailable", host=host, error=str(e))
+
+    def abandon(self, permit: CircuitPermit):
+        # A probe that never reached the upstream must not hold the half-open slot
+        if permit.is_probe:
+            cache.delete(self.PROBE_KEY_TEMPLATE.format(host=permit.host))
+
+    def _open(self, host: str):
+        open_duration = settings.CIRCUIT_BREAKER_OPEN_DURATION
+        cache.set(
+            self.STATE_KEY_TEMPLATE.format(host=host),
+            {"open_until": time.time() + open_duration},
+            # Outlive open_until so the next caller sees the half-open state
+            timeout=open_duration * 10,
+        )
+        logger.warning("circuit_opened", host=host, open_seconds=open_duration)
+
+    def reset(self, host: str):
+        cache.delete_many([
+            self.STATE_KEY_TEMPLATE.format(host=host),
+            self.FAILURES_KEY_TEMPLATE.format(host=host),
+            self.PROBE_KEY_TEMPLATE.format(host=host),
+        ])
+
+
+circuit_breaker = CircuitBreaker()
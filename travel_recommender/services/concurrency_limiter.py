@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on in-flight requests to one upstream host.
+
+    Every healthy response grows the limit by ``1 / limit`` (about +1 per
+    round of requests); a failure or a call slower than the breaker's slow-call
+    threshold halves it, at most once per round trip: only calls sent after
+    the last decrease can trigger the next one, so a burst of failures from
+    requests that were already in flight halves it once. Callers over the
+    limit wait up to CONCURRENCY_LIMIT_QUEUE_TIMEOUT for a slot and are shed
+    otherwise.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.limit = float(settings.CONCURRENCY_LIMIT_INITIAL)
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("concurrency_limit_rejected", host=self.host, limit=int(self.limit))
+                    return False
+                self._condition.wait(remaining)
+
+            self.in_flight += 1
+            return True
+
+    def release(self, *, success: bool, latency: float):
+        with self._condition:
+            self.in_flight -= 1
+
+            if success and latency <= settings.CIRCUIT_BREAKER_SLOW_CALL:
+                self.limit = min(self.limit + 1 / self.limit, settings.CONCURRENCY_LIMIT_MAX)
+            else:
+                now = time.monotonic()
+                if now - latency >= self._last_decrease:
+                    self.limit = max(self.limit / 2, settings.CONCURRENCY_LIMIT_MIN)
+                    self._last_decrease = now
+                    logger.info("concurrency_limit_decreased", host=self.host, limit=int(self.limit))
+
+            self._condition.notify_all()
+
+    def abandon(self):
+        # Free the slot of a call that was cancelled, without judging the upstream
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class ConcurrencyLimiterRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+    def get(self, host: str) -> AdaptiveConcurrencyLimiter:
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = AdaptiveConcurrencyLimiter(host)
+            return limiter
+
+    def reset(self):
+        with self._lock:
+            self._limiters = {}
+
+
+concurrency_limiters = ConcurrencyLimiterRegistry()
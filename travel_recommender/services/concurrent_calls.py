@@ -0,0 +1,57 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("upstream_deadline", default=None)
+
+
+def _run_with_deadline(deadline: float, call: Callable[[], Any]) -> Any:
+    _deadline.set(deadline)
+    return call()
+
+
+def run_concurrently(calls: Dict[str, Callable[[], Any]], timeout: float) -> Dict[str, Any]:
+    """
+    Run independent calls in parallel and join them against one deadline.
+
+    Nested ``run_concurrently`` calls made from inside a call inherit the
+    outer deadline, so a whole request shares a single time budget. Calls
+    that raise or miss the deadline are reported as ``None``. A late call
+    keeps running in the background but its result is discarded: only what
+    it writes to a cache itself (e.g. a nested weather fetch) survives, so
+    a caller that caches the joined results caches the ``None`` too.
+
+    Returns:
+        {name: result or None} for every entry in ``calls``
+    """
+    deadline = time.monotonic() + timeout
+    inherited = _deadline.get()
+    if inherited is not None:
+        deadline = min(deadline, inherited)
+
+    executor = ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="upstream")
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, _run_with_deadline, deadline, call)
+        for name, call in calls.items()
+    }
+
+    done, _ = wait(futures.values(), timeout=max(deadline - time.monotonic(), 0))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for name, future in futures.items():
+        if future not in done:
+            logger.warning("concurrent_call_deadline_exceeded", call=name, timeout=timeout)
+            results[name] = None
+        elif future.exception() is not None:
+            logger.error("concurrent_call_failed", call=name, error=str(future.exception()))
+            results[name] = None
+        else:
+            results[name] = future.result()
+
+    return results
@@ -1,15 +1,55 @@
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+import httpx
 import requests
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+from urllib.parse import urlparse
 from django.conf import settings
+from rest_framework import status
 from structlog import get_logger
 
 from travel_recommender.properties import ExtAPIResponseProperty
+from travel_recommender.services.circuit_breaker import circuit_breaker, CircuitPermit
+from travel_recommender.services.concurrency_limiter import AdaptiveConcurrencyLimiter, concurrency_limiters
+from travel_recommender.services.http_session import http_session_pool
+from travel_recommender.services.latency_tracker import latency_tracker
+from travel_recommender.services.retry_budget import retry_budget
 from travel_recommender.utils import parse_json_or_string
 
 logger = get_logger(__name__)
 
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_pid: Optional[int] = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    """The process's pool for hedged attempts; a forked worker builds its own."""
+    global _hedge_executor, _hedge_executor_pid
+
+    with _hedge_executor_lock:
+        pid = os.getpid()
+        if _hedge_executor is None or _hedge_executor_pid != pid:
+            # A primary and its hedge for every pooled connection
+            _hedge_executor = ThreadPoolExecutor(max_workers=2 * settings.HTTP_POOL_MAXSIZE, thread_name_prefix="hedge")
+            _hedge_executor_pid = pid
+        return _hedge_executor
+
 
 class ExternalApiService:
+    RETRYABLE_STATUS_CODES = frozenset({
+        status.HTTP_429_TOO_MANY_REQUESTS,
+        status.HTTP_502_BAD_GATEWAY,
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        status.HTTP_504_GATEWAY_TIMEOUT,
+    })
+
     def __init__(self):
         self.default_headers = {
             "User-Agent": "TravelRecommender/1.0"
@@ -34,7 +74,9 @@ class ExternalApiService:
         response_obj = self.__make_request(
             method="GET",
             url=url,
-            response_method=lambda: requests.get(url, params=params, headers=headers),
+            response_method=lambda: http_session_pool.get_session().get(
+                url, params=params, headers=headers, timeout=http_session_pool.get_timeout()
+            ),
             success_code=success_code,
             additional_info=additional_info,
             request_headers=headers,
@@ -49,6 +91,68 @@ class ExternalApiService:
         )
         return response_obj
 
+    @staticmethod
+    def build_async_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.REQUEST_TIMEOUT, connect=settings.REQUEST_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_MAXSIZE * settings.HTTP_POOL_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_MAXSIZE,
+            ),
+        )
+
+    async def async_handle_get(
+            self,
+            url: str,
+            headers: Optional[Dict] = None,
+            success_code: int = 200,
+            params: Dict = None,
+            additional_info: Dict = None,
+            client: Optional[httpx.AsyncClient] = None
+    ) -> ExtAPIResponseProperty:
+        """
+        Async counterpart of ``handle_get`` with identical response semantics.
+
+        Pass a shared ``client`` to reuse one connection pool across many calls
+        on the same event loop; otherwise a short-lived client is used.
+        """
+        if client is None:
+            async with self.build_async_client() as own_client:
+                return await self.async_handle_get(
+                    url,
+                    headers=headers,
+                    success_code=success_code,
+                    params=params,
+                    additional_info=additional_info,
+                    client=own_client,
+                )
+
+        headers = self.update_request_headers(headers)
+        logger.info(
+            "external_api_request_start",
+            method="GET",
+            url=url,
+            headers=headers,
+            params=params,
+            additional_info=additional_info,
+            is_async=True,
+        )
+        response_obj = await self.__async_make_request(
+            method="GET",
+            url=url,
+            response_method=lambda: client.get(url, params=params, headers=headers),
+            success_code=success_code,
+        )
+        logger.info(
+            "external_api_request_end",
+            url=url,
+            status_code=response_obj.status_code,
+            actual_status_code=response_obj.actual_status_code,
+            error=response_obj.error,
+            is_async=True,
+        )
+        return response_obj
+
     def __make_request(
             self,
             method: str,
@@ -60,16 +164,148 @@ class ExternalApiService:
             request_data: Optional[Any] = None,
             is_file: bool = False
     ) -> ExtAPIResponseProperty:
-        response_obj = self.__handle_request(
+        """
+        Send the request, hedging slow attempts and retrying transient failures
+        with jittered backoff while the shared retry budget allows it.
+        """
+        host = urlparse(url).netloc
+        attempt = partial(
+            self.__handle_request,
             method=method,
             url=url,
             response_method=response_method,
             success_code=success_code,
             is_file=is_file
         )
+        retry_budget.deposit()
+
+        response_obj = self.__hedged(host, url, attempt)
+        for retry in range(settings.HTTP_MAX_RETRIES):
+            delay = self.__retry_delay(retry, response_obj, url)
+            if delay is None:
+                break
+            time.sleep(delay)
+            response_obj = self.__hedged(host, url, attempt)
+
+        return response_obj
+
+    async def __async_make_request(
+            self,
+            method: str,
+            url: str,
+            response_method: Callable[[], Awaitable],
+            success_code: int,
+            is_file: bool = False
+    ) -> ExtAPIResponseProperty:
+        host = urlparse(url).netloc
+        attempt = partial(
+            self.__async_handle_request,
+            method=method,
+            url=url,
+            response_method=response_method,
+            success_code=success_code,
+            is_file=is_file
+        )
+        retry_budget.deposit()
+
+        response_obj = await self.__async_hedged(host, url, attempt)
+        for retry in range(settings.HTTP_MAX_RETRIES):
+            delay = self.__retry_delay(retry, response_obj, url)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            response_obj = await self.__async_hedged(host, url, attempt)
+
+        return response_obj
+
+    def __hedged(self, host: str, url: str, attempt: Callable[[], ExtAPIResponseProperty]) -> ExtAPIResponseProperty:
+        hedge_delay = self.__hedge_delay(host)
+        if hedge_delay is None:
+            return attempt()
+
+        # The losing attempt cannot be interrupted; it finishes in the background
+        executor = _get_hedge_executor()
+        primary = executor.submit(contextvars.copy_context().run, attempt)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done or not retry_budget.try_withdraw():
+            return primary.result()
+
+        logger.info("external_api_hedged", url=url, hedge_delay=hedge_delay)
+        pending = {primary, executor.submit(contextvars.copy_context().run, attempt)}
+
+        response_obj = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                response_obj = future.result()
+                if not self.__is_retryable(response_obj):
+                    return response_obj
+        return response_obj
+
+    async def __async_hedged(self, host: str, url: str, attempt: Callable[[], Awaitable]) -> ExtAPIResponseProperty:
+        hedge_delay = self.__hedge_delay(host)
+        if hedge_delay is None:
+            return await attempt()
+
+        primary = asyncio.ensure_future(attempt())
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done or not retry_budget.try_withdraw():
+            return await primary
+
+        logger.info("external_api_hedged", url=url, hedge_delay=hedge_delay, is_async=True)
+        pending = {primary, asyncio.ensure_future(attempt())}
 
+        response_obj = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                response_obj = task.result()
+                if not self.__is_retryable(response_obj):
+                    for loser in pending:
+                        loser.cancel()
+                    return response_obj
         return response_obj
 
+    @staticmethod
+    def __hedge_delay(host: str) -> Optional[float]:
+        if not settings.HTTP_HEDGING_ENABLED:
+            return None
+
+        observed = latency_tracker.percentile(
+            host,
+            settings.HTTP_HEDGE_PERCENTILE,
+            min_samples=settings.HTTP_HEDGE_MIN_SAMPLES,
+        )
+        if observed is None:
+            return None
+        return max(observed, settings.HTTP_HEDGE_MIN_DELAY)
+
+    def __retry_delay(self, retry: int, response_obj: ExtAPIResponseProperty, url: str) -> Optional[float]:
+        if not self.__is_retryable(response_obj):
+            return None
+
+        if not retry_budget.try_withdraw():
+            logger.warning("external_api_retry_budget_exhausted", url=url, status_code=response_obj.status_code)
+            return None
+
+        # Full jitter keeps retries from many workers from arriving in lockstep
+        delay = random.uniform(0, min(settings.HTTP_RETRY_BACKOFF_MAX, settings.HTTP_RETRY_BACKOFF_BASE * 2 ** retry))
+        logger.info(
+            "external_api_retry",
+            url=url,
+            retry=retry + 1,
+            delay=round(delay, 3),
+            status_code=response_obj.status_code
+        )
+        return delay
+
+    @classmethod
+    def __is_retryable(cls, response_obj: ExtAPIResponseProperty) -> bool:
+        # A 503 without a response is our own breaker or limiter shedding load; retrying defeats it
+        if response_obj.response is None and response_obj.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            return False
+        return response_obj.status_code in cls.RETRYABLE_STATUS_CODES
+
     def __handle_request(
             self,
             method: str,
@@ -80,30 +316,15 @@ class ExternalApiService:
     ) -> ExtAPIResponseProperty:
         response_obj = ExtAPIResponseProperty()
         response_obj.status_code = success_code
+
+        permit, limiter, rejection = self.__admit(urlparse(url).netloc)
+        if rejection is not None:
+            return self.__reject(response_obj, rejection, url, method)
+
+        started = time.monotonic()
         try:
             response = response_method()
-            response_obj.response = response
-            response_obj.actual_status_code = response.status_code
-            response_obj.status_code = response.status_code
-
-            if response.status_code == success_code:
-                response_obj.data = parse_json_or_string(response.text) if not is_file else "<File>"
-                logger.info(
-                    "external_api_success",
-                    method=method,
-                    url=url,
-                    status_code=response.status_code
-                )
-            else:
-                response_obj.error = parse_json_or_string(response.text)
-                response_obj.actual_error = response.text
-                logger.warning(
-                    "external_api_failed",
-                    method=method,
-                    url=url,
-                    status_code=response.status_code,
-                    error=response_obj.error
-                )
+            self.__populate_response(response_obj, response, method, url, success_code, is_file)
 
         except requests.exceptions.Timeout as e:
             self.__handle_exception(response_obj, e, 504, url, method)
@@ -111,9 +332,166 @@ class ExternalApiService:
             self.__handle_exception(response_obj, e, 502, url, method)
         except Exception as e:
             self.__handle_exception(response_obj, e, 502, url, method)
+        finally:
+            self.__record_outcome(permit, limiter, response_obj, time.monotonic() - started)
 
         return response_obj
 
+    async def __async_handle_request(
+            self,
+            method: str,
+            url: str,
+            response_method: Callable[[], Awaitable],
+            success_code: int,
+            is_file: bool
+    ) -> ExtAPIResponseProperty:
+        response_obj = ExtAPIResponseProperty()
+        response_obj.status_code = success_code
+
+        admission = asyncio.ensure_future(self.__async_admit(urlparse(url).netloc))
+        try:
+            permit, limiter, rejection = await asyncio.shield(admission)
+        except asyncio.CancelledError:
+            # Admission may still succeed after the caller is gone; give back whatever it wins
+            admission.add_done_callback(self.__release_late_admission)
+            raise
+        if rejection is not None:
+            return self.__reject(response_obj, rejection, url, method)
+
+        started = time.monotonic()
+        try:
+            response = await response_method()
+            self.__populate_response(response_obj, response, method, url, success_code, is_file)
+
+        except asyncio.CancelledError:
+            # A hedge that lost the race says nothing about the upstream's health
+            limiter.abandon()
+            self.__abandon_in_background(permit)
+            raise
+        except httpx.TimeoutException as e:
+            self.__handle_exception(response_obj, e, 504, url, method)
+        except httpx.HTTPError as e:
+            self.__handle_exception(response_obj, e, 502, url, method)
+        except Exception as e:
+            self.__handle_exception(response_obj, e, 502, url, method)
+
+        latency = time.monotonic() - started
+        if settings.CIRCUIT_BREAKER_ENABLED:
+            await asyncio.to_thread(self.__record_outcome, permit, limiter, response_obj, latency)
+        else:
+            self.__record_outcome(permit, limiter, response_obj, latency)
+        return response_obj
+
+    @staticmethod
+    def __admit(host: str) -> Tuple[Optional[CircuitPermit], Optional[AdaptiveConcurrencyLimiter], Optional[str]]:
+        """
+        Take a circuit breaker permit and a concurrency slot for ``host``.
+
+        Returns:
+            (permit, limiter, None) once both are held, or (None, None, reason)
+            when the request must be shed
+        """
+        permit = circuit_breaker.acquire(host)
+        if permit is None:
+            return None, None, f"Circuit open for {host}"
+
+        limiter = concurrency_limiters.get(host)
+        if not limiter.acquire(timeout=settings.CONCURRENCY_LIMIT_QUEUE_TIMEOUT):
+            circuit_breaker.abandon(permit)
+            return None, None, f"Concurrency limit reached for {host}"
+
+        return permit, limiter, None
+
+    async def __async_admit(self, host: str):
+        limiter = concurrency_limiters.get(host)
+        if not settings.CIRCUIT_BREAKER_ENABLED and limiter.try_acquire():
+            return circuit_breaker.acquire(host), limiter, None
+
+        # The breaker's Redis round trips and the wait for a slot must not block the event loop
+        return await asyncio.to_thread(self.__admit, host)
+
+    @classmethod
+    def __release_late_admission(cls, admission: asyncio.Future):
+        if admission.cancelled() or admission.exception() is not None:
+            return
+
+        permit, limiter, rejection = admission.result()
+        if rejection is None:
+            limiter.abandon()
+            cls.__abandon_in_background(permit)
+
+    @staticmethod
+    def __abandon_in_background(permit: CircuitPermit):
+        # A cancelled task cannot await the cleanup, so hand it to the default executor
+        if permit.is_probe:
+            asyncio.get_running_loop().run_in_executor(None, circuit_breaker.abandon, permit)
+
+    @staticmethod
+    def __record_outcome(permit, limiter, response_obj: ExtAPIResponseProperty, latency: float):
+        # 5xx, transport errors and 429 mean the upstream needs relief; other 4xx are our own fault
+        success = response_obj.status_code < 500 and response_obj.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+        if response_obj.response is not None:
+            latency_tracker.record(permit.host, latency)
+        limiter.release(success=success, latency=latency)
+        circuit_breaker.record(permit, success=success, latency=latency)
+
+    @staticmethod
+    def __reject(response_obj: ExtAPIResponseProperty, reason: str, url: str, method: str) -> ExtAPIResponseProperty:
+        response_obj.error = reason
+        response_obj.actual_error = reason
+        response_obj.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        response_obj.actual_status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+        logger.warning(
+            "external_api_rejected",
+            method=method,
+            url=url,
+            status_code=response_obj.status_code,
+            error=reason
+        )
+        return response_obj
+
+    @staticmethod
+    def __populate_response(
+            response_obj: ExtAPIResponseProperty,
+            response: Any,
+            method: str,
+            url: str,
+            success_code: int,
+            is_file: bool
+    ):
+        response_obj.response = response
+        response_obj.actual_status_code = response.status_code
+        response_obj.status_code = response.status_code
+        response_obj.headers = response.headers
+
+        if response.status_code == status.HTTP_304_NOT_MODIFIED:
+            # Answer to a conditional request: the caller's copy is still valid, there is no body
+            logger.info(
+                "external_api_not_modified",
+                method=method,
+                url=url,
+                status_code=response.status_code
+            )
+        elif response.status_code == success_code:
+            response_obj.data = parse_json_or_string(response.text) if not is_file else "<File>"
+            logger.info(
+                "external_api_success",
+                method=method,
+                url=url,
+                status_code=response.status_code
+            )
+        else:
+            response_obj.error = parse_json_or_string(response.text)
+            response_obj.actual_error = response.text
+            logger.warning(
+                "external_api_failed",
+                method=method,
+                url=url,
+                status_code=response.status_code,
+                error=response_obj.error
+            )
+
     @staticmethod
     def __handle_exception(response_obj: ExtAPIResponseProperty, error: Exception, status_code: int, url: str = "", method: str = ""):
         response_text = str(error)
@@ -0,0 +1,47 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+
+class FreshnessTracker:
+    """Collects the age of every cached dataset a request reads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.data_age_seconds: Optional[int] = None
+        self.stale = False
+
+    def record(self, fetched_at: float, soft_ttl: int):
+        age = max(int(time.time() - fetched_at), 0)
+
+        with self._lock:
+            if self.data_age_seconds is None or age > self.data_age_seconds:
+                self.data_age_seconds = age
+            self.stale = self.stale or age > soft_ttl
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "data_age_seconds": self.data_age_seconds,
+            "stale": self.stale,
+        }
+
+
+_current_tracker: ContextVar[Optional[FreshnessTracker]] = ContextVar("freshness_tracker", default=None)
+
+
+@contextmanager
+def track_freshness() -> Iterator[FreshnessTracker]:
+    tracker = FreshnessTracker()
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+
+
+def record_freshness(fetched_at: Optional[float], soft_ttl: int):
+    tracker = _current_tracker.get()
+    if tracker is not None and fetched_at is not None:
+        tracker.record(fetched_at, soft_ttl)
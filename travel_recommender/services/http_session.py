@@ -0,0 +1,103 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+class HttpSessionPool:
+    """
+    Process-wide keep-alive connection pool for outbound HTTP calls.
+
+    A single ``HTTPAdapter`` (whose urllib3 pools are thread-safe) is shared by
+    every thread, while each thread gets its own ``requests.Session`` mounted on
+    it so session-level state is never shared. The pool is rebuilt after a fork
+    so gunicorn and Celery prefork children never inherit the parent's sockets.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._adapter = None
+        self._pid = None
+
+    def _get_adapter(self) -> HTTPAdapter:
+        pid = os.getpid()
+        if self._adapter is not None and self._pid == pid:
+            return self._adapter
+
+        with self._lock:
+            if self._adapter is None or self._pid != pid:
+                self._adapter = HTTPAdapter(
+                    pool_connections=settings.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+                )
+                self._pid = pid
+                self._local = threading.local()
+                logger.info(
+                    "http_session_pool_created",
+                    pid=pid,
+                    pool_connections=settings.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+                )
+
+        return self._adapter
+
+    def get_session(self) -> requests.Session:
+        adapter = self._get_adapter()
+
+        session = getattr(self._local, "session", None)
+        if session is None or session.get_adapter("https://") is not adapter:
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+
+        return session
+
+    @staticmethod
+    def get_timeout() -> Tuple[float, float]:
+        return settings.REQUEST_CONNECT_TIMEOUT, settings.REQUEST_TIMEOUT
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Connection reuse counters per host, aggregated over the live pools.
+
+        Returns:
+            {"host:port": {"requests": int, "new_connections": int, "reused_connections": int}}
+        """
+        if self._adapter is None or self._pid != os.getpid():
+            return {}
+
+        stats = {}
+        pools = self._adapter.poolmanager.pools
+
+        with pools.lock:
+            pool_list = list(pools._container.values())
+
+        for pool in pool_list:
+            host_stats = stats.setdefault(
+                f"{pool.host}:{pool.port}",
+                {"requests": 0, "new_connections": 0, "reused_connections": 0},
+            )
+            host_stats["requests"] += pool.num_requests
+            host_stats["new_connections"] += pool.num_connections
+            host_stats["reused_connections"] += max(pool.num_requests - pool.num_connections, 0)
+
+        return stats
+
+    def reset(self):
+        with self._lock:
+            if self._adapter is not None:
+                self._adapter.close()
+            self._adapter = None
+            self._pid = None
+            self._local = threading.local()
+
+
+http_session_pool = HttpSessionPool()
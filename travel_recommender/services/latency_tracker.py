@@ -0,0 +1,63 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+class LatencyTracker:
+    """
+    In-process rolling window of response latencies per upstream host.
+
+    Only the most recent ``WINDOW_SIZE`` samples are kept, so percentiles
+    follow the upstream as it speeds up or slows down.
+    """
+
+    WINDOW_SIZE = 200
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, host: str, latency: float):
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.WINDOW_SIZE)
+            samples.append(latency)
+
+    def percentile(self, host: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Nearest-rank percentile of the recent latencies for ``host``, or None
+        while fewer than ``min_samples`` responses have been seen.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(host, ()))
+
+        if not samples or len(samples) < min_samples:
+            return None
+
+        rank = max(int(round(percentile / 100 * len(samples))) - 1, 0)
+        return samples[min(rank, len(samples) - 1)]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            hosts = list(self._samples)
+
+        return {
+            host: {
+                "p50": self.percentile(host, 50),
+                "p95": self.percentile(host, 95),
+                "p99": self.percentile(host, 99),
+            }
+            for host in hosts
+        }
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+
+
+latency_tracker = LatencyTracker()
@@ -0,0 +1,48 @@
+import threading
+from typing import Optional
+
+from django.conf import settings
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+class RetryBudget:
+    """
+    Process-wide token bucket shared by retries and hedged requests.
+
+    Every first attempt deposits ``RETRY_BUDGET_RATIO`` tokens and every extra
+    attempt spends a whole one, so extra upstream load stays around that
+    ratio of normal traffic. During an outage the bucket drains and requests
+    fail once instead of multiplying. The bucket starts full and is capped at
+    ``RETRY_BUDGET_MAX_TOKENS`` so a quiet period cannot bank a retry storm.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: Optional[float] = None
+
+    def _current(self) -> float:
+        if self._tokens is None:
+            self._tokens = float(settings.RETRY_BUDGET_MAX_TOKENS)
+        return self._tokens
+
+    def deposit(self):
+        with self._lock:
+            # Rounded so that 1 / ratio deposits add up to exactly one token
+            tokens = round(self._current() + settings.RETRY_BUDGET_RATIO, 6)
+            self._tokens = min(tokens, settings.RETRY_BUDGET_MAX_TOKENS)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            if self._current() < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def reset(self):
+        with self._lock:
+            self._tokens = None
+
+
+retry_budget = RetryBudget()
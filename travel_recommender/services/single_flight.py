@@ -0,0 +1,87 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent cache fills for the same key.
+
+    Within a process, the first caller for a key becomes the leader and every
+    other thread waits on the leader's future. Across processes, the leader
+    also takes a short Redis lease (``cache.add``); workers that lose the
+    lease poll the cache for the leader's result and only fetch themselves
+    if nothing shows up within ``SINGLE_FLIGHT_WAIT``.
+    """
+
+    LEASE_KEY_TEMPLATE = "lease:{key}"
+    POLL_INTERVAL = 0.1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    def fetch(self, key: str, load: Callable[[], Any], read_cached: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not is_leader:
+            logger.info("single_flight_joined", key=key)
+            return future.result()
+
+        try:
+            result = self._fetch_with_lease(key, load, read_cached)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _fetch_with_lease(self, key: str, load: Callable[[], Any], read_cached: Callable[[], Any]) -> Any:
+        lease_key = self.LEASE_KEY_TEMPLATE.format(key=key)
+        token = uuid.uuid4().hex
+
+        if not cache.add(lease_key, token, timeout=settings.SINGLE_FLIGHT_LEASE_TTL):
+            logger.info("single_flight_lease_busy", key=key)
+
+            cached = self._wait_for_leader(read_cached)
+            if cached is not None:
+                return cached
+
+            logger.warning("single_flight_leader_timeout", key=key)
+            return load()
+
+        try:
+            return load()
+        finally:
+            # The lease TTL outlives any upstream timeout, so this never drops another worker's lease
+            cache.delete(lease_key)
+
+    def _wait_for_leader(self, read_cached: Callable[[], Any]) -> Any:
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            cached = read_cached()
+            if cached is not None:
+                return cached
+
+        return None
+
+
+single_flight = SingleFlight()
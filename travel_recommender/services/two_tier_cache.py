@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _LocalEntry:
+    value: Any
+    generation: int
+    expires_at: float
+
+
+class TwoTierCache:
+    """
+    Bounded per-process LRU tier in front of Redis for small, hot, read-mostly keys.
+
+    Each key has a generation counter in Redis. A local copy is only served
+    while its generation still matches, so a writer calling ``invalidate``
+    reaches every worker on its next read; the local TTL bounds how long a
+    copy can live even if no one bumps. Checking a generation is one GET of
+    a small integer, which is far cheaper than unpickling the value itself.
+
+    Keys without a generation (never written through ``invalidate``, or wiped
+    by a cache flush) are not kept locally. Cached values are shared between
+    threads and must be treated as read-only.
+    """
+
+    GENERATION_KEY_TEMPLATE = "generation:{key}"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _LocalEntry]" = OrderedDict()
+
+    def _generation_key(self, key: str) -> str:
+        return self.GENERATION_KEY_TEMPLATE.format(key=key)
+
+    def get(self, key: str, load: Callable[[], Any]) -> Any:
+        """
+        Return the local copy of ``key`` if it is current, else ``load()`` it
+        from the shared tier and remember it.
+        """
+        generation = cache.get(self._generation_key(key))
+
+        if generation is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.generation == generation and entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry.value
+
+        value = load()
+
+        if value is not None and generation is not None:
+            self._remember(key, value, generation)
+
+        return value
+
+    def _remember(self, key: str, value: Any, generation: int):
+        with self._lock:
+            self._entries[key] = _LocalEntry(
+                value=value,
+                generation=generation,
+                expires_at=time.monotonic() + settings.LOCAL_CACHE_TTL,
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > settings.LOCAL_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> Optional[int]:
+        """Bump the generation of ``key`` so every process drops its local copy."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+        generation_key = self._generation_key(key)
+        try:
+            cache.add(generation_key, 0, timeout=None)
+            generation = cache.incr(generation_key)
+        except Exception as e:
+            # Local copies still expire after LOCAL_CACHE_TTL
+            logger.error("two_tier_cache_invalidate_failed", key=key, error=str(e))
+            return None
+
+        logger.info("two_tier_cache_invalidated", key=key, generation=generation)
+        return generation
+
+    def reset(self):
+        with self._lock:
+            self._entries = OrderedDict()
+
+
+two_tier_cache = TwoTierCache()
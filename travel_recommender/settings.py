@@ -153,6 +153,7 @@ CACHES = {
         'LOCATION': get_env_or_raise("REDIS_URL"),
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SERIALIZER': 'travel_recommender.services.cache_serializer.PayloadSerializer',
             'SOCKET_CONNECT_TIMEOUT': 5,
             'SOCKET_TIMEOUT': 5,
             'CONNECTION_POOL_KWARGS': {
@@ -165,10 +166,20 @@ CACHES = {
     }
 }
 
+# Encoding of cached values: msgpack or json, with zlib/lz4/none compression above a size threshold.
+# Uncompressed by default: zlib roughly doubles decode time on every read for a smaller Redis footprint
+CACHE_SERIALIZER = os.getenv('CACHE_SERIALIZER', 'msgpack')
+CACHE_COMPRESSION = os.getenv('CACHE_COMPRESSION', 'none')
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv('CACHE_COMPRESS_MIN_BYTES', '1024'))
+
 CACHE_TTL = int(get_env_or_raise("CACHE_TTL_IN_SECONDS"))
 DISTRICTS_CACHE_TTL=int(get_env_or_raise('DISTRICTS_CACHE_TTL_IN_SECONDS'))
 WEATHER_CACHE_TTL=int(get_env_or_raise('WEATHER_CACHE_TTL_IN_SECONDS'))
 
+# Extra time past the TTL during which a stale entry is still served while it refreshes in the background
+DISTRICTS_CACHE_STALE_TTL = int(os.getenv('DISTRICTS_CACHE_STALE_TTL_IN_SECONDS', '86400'))
+WEATHER_CACHE_STALE_TTL = int(os.getenv('WEATHER_CACHE_STALE_TTL_IN_SECONDS', '3600'))
+
 # ---------------------------------------------------------------------
 # External APIs
 # ---------------------------------------------------------------------
@@ -177,6 +188,77 @@ OPEN_METEO_BASE_URL = get_env_or_raise('OPEN_METEO_BASE_URL')
 OPEN_METEO_AIR_QUALITY_BASE_URL=get_env_or_raise('OPEN_METEO_AIR_QUALITY_BASE_URL')
 DISTRICTS_JSON_URL = get_env_or_raise('DISTRICTS_JSON_URL')
 REQUEST_TIMEOUT = int(get_env_or_raise('REQUEST_TIMEOUT_IN_SECONDS'))
+REQUEST_CONNECT_TIMEOUT = float(os.getenv('REQUEST_CONNECT_TIMEOUT_IN_SECONDS', '3'))
+
+# Keep-alive pool shared by all outbound requests (hosts kept / connections per host)
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '16'))
+
+# Districts per multi-location Open-Meteo call in batch_get_weather (0 = one call per district)
+WEATHER_BATCH_SIZE = int(os.getenv('WEATHER_BATCH_SIZE', '0'))
+
+# Fetch batch weather on one asyncio event loop instead of the thread pool
+WEATHER_ASYNC_FETCH = str_to_bool(os.getenv('WEATHER_ASYNC_FETCH', 'False'))
+WEATHER_ASYNC_CONCURRENCY = int(os.getenv('WEATHER_ASYNC_CONCURRENCY', '16'))
+
+# Run independent upstream calls of one request in parallel, joined on a shared deadline
+CONCURRENT_UPSTREAM_FETCH = str_to_bool(os.getenv('CONCURRENT_UPSTREAM_FETCH', 'False'))
+UPSTREAM_DEADLINE = float(os.getenv('UPSTREAM_DEADLINE_IN_SECONDS', str(REQUEST_TIMEOUT)))
+# Results cut short by a failing upstream (a weather entry missing a half, an empty ranking) are cached this briefly
+WEATHER_PARTIAL_CACHE_TTL = int(os.getenv('WEATHER_PARTIAL_CACHE_TTL_IN_SECONDS', '60'))
+
+# Cross-process cache-fill coalescing: lease lifetime and how long other workers wait on it
+SINGLE_FLIGHT_LEASE_TTL = int(os.getenv('SINGLE_FLIGHT_LEASE_TTL_IN_SECONDS', str(max(REQUEST_TIMEOUT * 3, 30))))
+SINGLE_FLIGHT_WAIT = float(os.getenv('SINGLE_FLIGHT_WAIT_IN_SECONDS', '5'))
+
+# Current-location weather is fetched and cached per grid cell of this size in degrees (0 = exact coordinates)
+CURRENT_LOCATION_GRID_RESOLUTION = float(os.getenv('CURRENT_LOCATION_GRID_RESOLUTION', '0.1'))
+
+# Use the cached weather of the nearest district within this radius (km) for the current location
+CURRENT_LOCATION_NEAREST_DISTRICT = str_to_bool(os.getenv('CURRENT_LOCATION_NEAREST_DISTRICT', 'False'))
+NEAREST_DISTRICT_RADIUS_KM = float(os.getenv('NEAREST_DISTRICT_RADIUS_KM', '10'))
+
+# Record every weather fetch in the database and refill Redis misses from snapshots no older than the max age
+WEATHER_SNAPSHOTS_ENABLED = str_to_bool(os.getenv('WEATHER_SNAPSHOTS_ENABLED', 'False'))
+WEATHER_SNAPSHOT_MAX_AGE = int(os.getenv(
+    'WEATHER_SNAPSHOT_MAX_AGE_IN_SECONDS',
+    str(WEATHER_CACHE_TTL + WEATHER_CACHE_STALE_TTL)
+))
+
+# Share of districts a refresh must produce before its weather generation replaces the published one
+WEATHER_GENERATION_MIN_COMPLETENESS = float(os.getenv('WEATHER_GENERATION_MIN_COMPLETENESS', '0.9'))
+
+# Per-process memory tier in front of Redis for small hot keys (e.g. the district index)
+LOCAL_CACHE_TTL = int(os.getenv('LOCAL_CACHE_TTL_IN_SECONDS', '60'))
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv('LOCAL_CACHE_MAX_ENTRIES', '128'))
+
+# Per-host circuit breaker, shared by all workers through Redis
+CIRCUIT_BREAKER_ENABLED = str_to_bool(os.getenv('CIRCUIT_BREAKER_ENABLED', 'False'))
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+CIRCUIT_BREAKER_WINDOW = int(os.getenv('CIRCUIT_BREAKER_WINDOW_IN_SECONDS', '30'))
+CIRCUIT_BREAKER_OPEN_DURATION = int(os.getenv('CIRCUIT_BREAKER_OPEN_DURATION_IN_SECONDS', '30'))
+CIRCUIT_BREAKER_SLOW_CALL = float(os.getenv('CIRCUIT_BREAKER_SLOW_CALL_IN_SECONDS', str(REQUEST_TIMEOUT / 2)))
+
+# Adaptive (AIMD) limit on in-flight requests per upstream host, per process
+CONCURRENCY_LIMIT_INITIAL = int(os.getenv('CONCURRENCY_LIMIT_INITIAL', '16'))
+CONCURRENCY_LIMIT_MIN = int(os.getenv('CONCURRENCY_LIMIT_MIN', '2'))
+CONCURRENCY_LIMIT_MAX = int(os.getenv('CONCURRENCY_LIMIT_MAX', '64'))
+CONCURRENCY_LIMIT_QUEUE_TIMEOUT = float(os.getenv('CONCURRENCY_LIMIT_QUEUE_TIMEOUT_IN_SECONDS', '2'))
+
+# Hedged requests: duplicate a GET still pending after this percentile of the host's recent latencies
+HTTP_HEDGING_ENABLED = str_to_bool(os.getenv('HTTP_HEDGING_ENABLED', 'False'))
+HTTP_HEDGE_PERCENTILE = float(os.getenv('HTTP_HEDGE_PERCENTILE', '95'))
+HTTP_HEDGE_MIN_SAMPLES = int(os.getenv('HTTP_HEDGE_MIN_SAMPLES', '20'))
+HTTP_HEDGE_MIN_DELAY = float(os.getenv('HTTP_HEDGE_MIN_DELAY_IN_SECONDS', '0.05'))
+
+# Retries of transient failures (429/502/503/504) with jittered exponential backoff
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '0'))
+HTTP_RETRY_BACKOFF_BASE = float(os.getenv('HTTP_RETRY_BACKOFF_BASE_IN_SECONDS', '0.1'))
+HTTP_RETRY_BACKOFF_MAX = float(os.getenv('HTTP_RETRY_BACKOFF_MAX_IN_SECONDS', '1'))
+
+# Retries and hedges together may add at most this share of extra upstream load
+RETRY_BUDGET_RATIO = float(os.getenv('RETRY_BUDGET_RATIO', '0.1'))
+RETRY_BUDGET_MAX_TOKENS = int(os.getenv('RETRY_BUDGET_MAX_TOKENS', '10'))
 
 # ---------------------------------------------------------------------
 # Logging
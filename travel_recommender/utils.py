@@ -50,4 +50,8 @@ def multi_urljoin(*parts) -> str:
         parts[0].strip("/") + "/",
         "/".join(quote_plus(part.strip("/"), safe="/") for part in parts[1:])
     )
-    return url
\ No newline at end of file
+    return url
+
+
+def chunked(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), size)]